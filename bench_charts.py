@@ -0,0 +1,68 @@
+"""
+Benchmark the Plotly and Vega-Lite (Arrow) chart backends
+Builds and serializes the weekly chart and the long-range history chart for
+7- to 365-day views the way st.plotly_chart and st.vega_lite_chart do, and
+prints payload size and time per render for each backend
+Run with: python bench_charts.py
+"""
+
+import json
+import time
+
+import numpy as np
+import plotly.io as pio
+from streamlit import dataframe_util
+
+from waterbuddy.charts import history_figure, history_frame, history_spec, weekly_figure, weekly_frame, weekly_spec
+from waterbuddy.timeseries import IntakePyramid
+
+PRIMARY, SECONDARY = '#70D6FF', '#1E9BC7'
+GOAL = 2000
+RANGES = (7, 30, 91, 182, 365)
+REPEATS = 50
+
+
+def plotly_payload(fig) -> int:
+    return len(pio.to_json(fig, validate=False))
+
+
+def vega_payload(frame, spec) -> int:
+    return len(dataframe_util.convert_anything_to_arrow_bytes(frame)) + len(json.dumps(spec))
+
+
+def timed(render) -> tuple:
+    """Payload size of one render and mean seconds per render"""
+    size = render()
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        render()
+    return size, (time.perf_counter() - start) / REPEATS
+
+
+def main():
+    rng = np.random.default_rng(7)
+    end_day = 20000
+    days = np.arange(end_day - 730, end_day + 1)
+    pyramid = IntakePyramid.from_days(days, rng.integers(800, 3200, len(days)))
+    weekly_data = [{'day': day, 'intake': int(ml), 'goal': GOAL}
+                   for day, ml in zip(['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'], rng.integers(800, 3200, 7))]
+
+    cases = [('weekly', 7, lambda: weekly_figure(weekly_data, PRIMARY, SECONDARY),
+              lambda: (weekly_frame(weekly_data), weekly_spec(PRIMARY, SECONDARY)))]
+    for span in RANGES:
+        series = pyramid.series(end_day - span + 1, end_day)
+        cases.append((
+            f"history ({series['level']})", span,
+            lambda series=series: history_figure(series, GOAL, PRIMARY, SECONDARY),
+            lambda series=series: (history_frame(series), history_spec(series['level'], GOAL, PRIMARY, SECONDARY)),
+        ))
+
+    print(f"{'chart':<18}{'days':>6}{'plotly bytes':>14}{'vega bytes':>12}{'plotly ms':>11}{'vega ms':>9}")
+    for name, span, plotly_chart, vega_chart in cases:
+        plotly_size, plotly_time = timed(lambda: plotly_payload(plotly_chart()))
+        vega_size, vega_time = timed(lambda: vega_payload(*vega_chart()))
+        print(f"{name:<18}{span:>6}{plotly_size:>14,}{vega_size:>12,}{plotly_time * 1000:>11.2f}{vega_time * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
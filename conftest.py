@@ -0,0 +1,28 @@
+"""
+Shared pytest fixtures for the WaterBuddy tests
+"""
+
+import sys
+
+import pytest
+
+
+def _reset_app():
+    """Drop the app modules and Streamlit caches so the next run starts clean"""
+    import streamlit as st
+
+    for name in [name for name in sys.modules if name == 'core' or name.split('.')[0] == 'screens']:
+        del sys.modules[name]
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+
+@pytest.fixture
+def app_test(monkeypatch, tmp_path):
+    """AppTest of the app on its own data dir (`tmp_path`), with fresh app modules and resources"""
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.setenv('WATERBUDDY_DATA_DIR', str(tmp_path))
+    _reset_app()
+    yield AppTest.from_file('streamlit_app.py', default_timeout=60)
+    _reset_app()
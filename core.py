@@ -0,0 +1,959 @@
+"""
+Shared state and helpers for the WaterBuddy Streamlit app
+Constants, server-wide resources, session state, intake event consumers,
+styling and the visual components more than one screen uses. Imported
+once per process by streamlit_app.py and by each screen module
+"""
+
+import streamlit as st
+import streamlit.components.v1 as components
+from datetime import datetime, date
+from typing import List, Optional
+import copy
+import itertools
+import os
+import re
+import time
+import uuid
+from zoneinfo import available_timezones
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from waterbuddy.analytics import derived_stats, weekly_intake
+from waterbuddy.buffering import SyncedIds, parse_batch
+from waterbuddy.content import ContentCatalog
+from waterbuddy.events import (
+    DISPATCHERS,
+    INTAKE_CORRECTED,
+    INTAKE_LOGGED,
+    RECORD_CHANGED,
+    EventBus,
+    IntakeCorrection,
+    IntakeEvent,
+)
+from waterbuddy.forecast import PaceForecaster
+from waterbuddy.gauge import gauge_svg
+from waterbuddy.groups import (
+    LEGACY_DEFAULT_GROUP,
+    GroupRegistry,
+    new_group_code,
+    publish_standing,
+    read_standings,
+)
+from waterbuddy.history import HISTORY_NAMESPACE, IntakeLog
+from waterbuddy.idempotency import RecentIds, client_event_id, intake_event_id
+from waterbuddy.leaderboard import SORT_KEYS, rank_order, rank_places
+from waterbuddy.reminders import DrinkingProfile
+from waterbuddy.retention import RetentionPolicy
+from waterbuddy.rollover import USERS_NAMESPACE, RolloverJob, correct_closed_day, register_user_zone
+from waterbuddy.segments import SegmentStore
+from waterbuddy.sessions import IdleSessionManager
+from waterbuddy.snapshots import LogCompactor, durable_drink, restore_history
+from waterbuddy.storage import open_store
+from waterbuddy.timeseries import IntakePyramid
+from waterbuddy.timezones import (
+    SECONDS_PER_DAY,
+    bucket_events,
+    date_to_day,
+    day_to_date,
+    local_datetime,
+    local_seconds,
+    local_today,
+)
+
+# ============================================================================
+# DATA MODELS & CONSTANTS
+# ============================================================================
+
+AGE_GROUPS = {
+    'children': {'label': 'Kids (2-12)', 'icon': '🌈', 'min': 2, 'max': 12},
+    'teen': {'label': 'Teens (13-18)', 'icon': '🧑‍🎓', 'min': 13, 'max': 18},
+    'adult': {'label': 'Adults (19-64)', 'icon': '👨‍💼', 'min': 19, 'max': 64},
+    'senior': {'label': 'Seniors (65+)', 'icon': '👴', 'min': 65, 'max': 120}
+}
+
+BADGES = {
+    'first-glass': {'emoji': '🌟', 'title': 'First Splash', 'description': 'Logged your first glass!'},
+    'daily-goal': {'emoji': '🎯', 'title': 'Daily Champion', 'description': 'Reached daily goal!'},
+    'week-streak': {'emoji': '🔥', 'title': 'Week Warrior', 'description': '7 day streak!'},
+    'month-streak': {'emoji': '🏆', 'title': 'Monthly Master', 'description': '30 day streak!'},
+    'hydration-hero': {'emoji': '💪', 'title': 'Hydration Hero', 'description': '100 glasses logged!'},
+    'early-bird': {'emoji': '🌅', 'title': 'Early Bird', 'description': 'Morning hydration!'},
+    'night-owl': {'emoji': '🦉', 'title': 'Night Owl', 'description': 'Evening hydration!'},
+    'consistent': {'emoji': '⚡', 'title': 'Consistency King', 'description': '10 days in a row!'},
+    'overachiever': {'emoji': '🚀', 'title': 'Overachiever', 'description': '150% of goal!'},
+}
+
+COLORS = {
+    'aqua_primary': '#70D6FF',
+    'deep_teal': '#1E9BC7',
+    'soft_coral': '#FFB3A7',
+    'pale_sand': '#FFF7EE',
+    'dark_slate': '#123743',
+}
+
+AGE_THEME_COLORS = {
+    'children': {'primary': '#FF6B9D', 'secondary': '#FFE66D', 'accent': '#4ECDC4'},
+    'teen': {'primary': '#7C3AED', 'secondary': '#F59E0B', 'accent': '#EF4444'},
+    'adult': {'primary': '#70D6FF', 'secondary': '#1E9BC7', 'accent': '#FFB3A7'},
+    'senior': {'primary': '#1E9BC7', 'secondary': '#FFB3A7', 'accent': '#70D6FF'}
+}
+
+WATER_SIZES = [
+    {'amount': 250, 'label': 'Glass', 'icon': '🥛'},
+    {'amount': 330, 'label': 'Can', 'icon': '🥤'},
+    {'amount': 500, 'label': 'Bottle', 'icon': '🍶'},
+    {'amount': 750, 'label': 'Large Bottle', 'icon': '🚰'}
+]
+
+MASCOT_EXPRESSIONS = {
+    'neutral': '😐',
+    'smile': '😊',
+    'cheer': '🎉',
+    'excited': '😄',
+    'sleepy': '😴',
+    'wave': '👋'
+}
+
+# Server settings (override with environment variables)
+DATA_DIR = os.environ.get('WATERBUDDY_DATA_DIR', '.waterbuddy_data')
+
+STORE_URL = os.environ.get('WATERBUDDY_STORE_URL', '')
+
+SEGMENT_DIR = os.environ.get('WATERBUDDY_SEGMENT_DIR', os.path.join(DATA_DIR, 'segments'))
+
+GROUP_SYNC_SECONDS = float(os.environ.get('WATERBUDDY_GROUP_SYNC_SECONDS', '30'))
+
+LEADERBOARD_PAGE_SIZE = int(os.environ.get('WATERBUDDY_LEADERBOARD_PAGE_SIZE', '25'))
+
+SESSION_IDLE_SECONDS = int(os.environ.get('WATERBUDDY_SESSION_IDLE_SECONDS', '900'))
+
+DEFAULT_TIMEZONE = os.environ.get('WATERBUDDY_DEFAULT_TIMEZONE', 'UTC')
+
+CONTENT_DIR = os.environ.get('WATERBUDDY_CONTENT_DIR', '')
+
+EVENT_DISPATCHER = os.environ.get('WATERBUDDY_EVENT_DISPATCHER', 'thread')
+
+DEDUP_WINDOW_SECONDS = float(os.environ.get('WATERBUDDY_DEDUP_WINDOW_SECONDS', '30'))
+
+SNAPSHOT_EVERY = int(os.environ.get('WATERBUDDY_SNAPSHOT_EVERY', '500'))
+
+RAW_RETENTION_DAYS = int(os.environ.get('WATERBUDDY_RAW_RETENTION_DAYS', '90'))
+
+HOURLY_RETENTION_DAYS = int(os.environ.get('WATERBUDDY_HOURLY_RETENTION_DAYS', '365'))
+
+CLIENT_SYNC_SECONDS = float(os.environ.get('WATERBUDDY_CLIENT_SYNC_SECONDS', '5'))
+
+CHART_BACKEND = os.environ.get('WATERBUDDY_CHART_BACKEND', 'plotly')
+
+LANGUAGE_NAMES = {'en': 'English', 'es': 'Español'}
+
+# Session keys persisted in the user's record for the rollover job
+USER_RECORD_KEYS = (
+    'name', 'age_group', 'daily_goal', 'join_date', 'timezone', 'locale', 'current_intake', 'today_date',
+    'streak', 'best_streak', 'badges', 'total_intake', 'total_glasses', 'last_drink',
+    'drinking_profile', 'pace_forecaster', 'family_mode', 'group_code',
+)
+
+# Record counters every open session of a user changes: a write adds its own
+# intake to the stored values instead of overwriting them with its copies
+RECORD_COUNTER_KEYS = ('current_intake', 'total_intake', 'total_glasses')
+
+# Session keys restored from the snapshot plus log tail -> key in that state
+RESTORED_STATE_KEYS = {'drinking_profile': 'profile', 'total_intake': 'total_intake', 'total_glasses': 'total_glasses'}
+
+# User ids are uuid4 hex strings; the id travels in the page URL as ?uid=
+USER_ID_PATTERN = re.compile(r'[0-9a-f]{32}')
+
+# Group dashboard intake bins (ml)
+GROUP_INTAKE_BINS = [0, 500, 1000, 1500, 2000, 2500, 3000]
+
+# Stylesheet served by Streamlit's static file serving ([server] enableStaticServing)
+STYLESHEET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'waterbuddy.css')
+
+STYLESHEET_URL = 'app/static/waterbuddy.css'
+
+# Log-water panel that buffers taps in the browser (static files, no build step)
+intake_buffer = components.declare_component(
+    'intake_buffer', path=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'components', 'intake_buffer')
+)
+
+# Keys the rollover job changes when it closes a day
+ROLLOVER_KEYS = ('current_intake', 'today_date', 'streak', 'best_streak', 'badges', 'drinking_profile')
+
+# ============================================================================
+# SERVER RESOURCES
+# ============================================================================
+
+@st.cache_resource
+def get_store():
+    """Persistent store shared by every session (and, for SQLite/Redis, every worker process)"""
+    return open_store(STORE_URL or DATA_DIR)
+
+def session_is_active(session_id: str) -> bool:
+    """Whether a browser is still connected to the session (always, without a server)"""
+    return not runtime.exists() or runtime.get_instance().is_active_session(session_id)
+
+@st.cache_resource
+def get_session_manager() -> IdleSessionManager:
+    """Idle session manager shared by every session in this process"""
+    return IdleSessionManager(get_store(), idle_seconds=SESSION_IDLE_SECONDS, is_alive=session_is_active)
+
+@st.cache_resource
+def get_event_bus() -> EventBus:
+    """Intake event bus shared by every session in this process
+
+    Consumers that touch session state or show feedback run inline in the
+    clicking session; writing the user record is deferred to the dispatcher.
+    """
+    bus = EventBus(DISPATCHERS[EVENT_DISPATCHER]())
+    for consumer in (apply_intake, award_intake_badges, refresh_weekly_data, refresh_leaderboard, save_after_intake,
+                     bump_data_version):
+        bus.subscribe(INTAKE_LOGGED, consumer)
+    for consumer in (apply_correction, adjust_corrected_badges, refresh_weekly_data, refresh_leaderboard,
+                     save_after_correction, bump_data_version):
+        bus.subscribe(INTAKE_CORRECTED, consumer)
+    store = get_store()
+    compactor = get_log_compactor()
+    bus.subscribe(RECORD_CHANGED, lambda snapshot: write_user_record(store, snapshot), deferred=True)
+    bus.subscribe(INTAKE_LOGGED, lambda event: append_history(
+        store, compactor, event, IntakeLog.row(event.timestamp, event.amount)
+    ), deferred=True)
+    bus.subscribe(INTAKE_CORRECTED, lambda event: append_correction(store, compactor, event), deferred=True)
+    groups = get_group_registry()
+    bus.subscribe(INTAKE_LOGGED, lambda event: groups.record(event.user_id, event.day, event.amount), deferred=True)
+    bus.subscribe(INTAKE_CORRECTED, lambda event: groups.record(event.user_id, event.day, event.delta), deferred=True)
+    return bus
+
+@st.cache_resource
+def get_log_compactor() -> LogCompactor:
+    """Snapshots users' intake logs once enough events pile up (shared by every session)"""
+    return LogCompactor(get_store(), SNAPSHOT_EVERY, RetentionPolicy(RAW_RETENTION_DAYS, HOURLY_RETENTION_DAYS),
+                        get_segment_store())
+
+@st.cache_resource
+def get_segment_store() -> SegmentStore:
+    """Memory-mapped history segments on this host, shared by every worker process"""
+    return SegmentStore(SEGMENT_DIR)
+
+@st.cache_resource
+def get_group_registry() -> GroupRegistry:
+    """Family/workplace group aggregates shared by every session in this process"""
+    return GroupRegistry()
+
+@st.cache_resource
+def get_data_versions() -> itertools.count:
+    """Data version numbers, unique across every session in this process"""
+    return itertools.count(1)
+
+@st.cache_resource
+def get_recent_intake_ids() -> RecentIds:
+    """Intake IDs logged recently by any session in this process"""
+    return RecentIds(DEDUP_WINDOW_SECONDS)
+
+@st.cache_resource
+def get_rollover_job() -> RolloverJob:
+    """Midnight rollover job shared by every session in this process"""
+    return RolloverJob(get_store(), before_run=get_event_bus().flush).start()
+
+@st.cache_resource
+def get_content_catalog() -> ContentCatalog:
+    """Tips and quotes, loaded once per process"""
+    return ContentCatalog.load(CONTENT_DIR)
+
+def track_session():
+    """Mark this session active and restore any fields spilled while it was idle"""
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        # ctx.session_state is a wrapper rebuilt for every script run; the
+        # manager needs the SessionState that lives as long as the session
+        get_session_manager().touch(ctx.session_id, ctx.session_state._state)
+
+# ============================================================================
+# STATE INITIALIZATION
+# ============================================================================
+
+def init_session_state():
+    """Initialize all session state variables"""
+    
+    # Returning user: any worker process can restore them from the shared store
+    if 'user_id' not in st.session_state:
+        user_id = st.query_params.get('uid', '')
+        st.session_state.user_id = user_id if USER_ID_PATTERN.fullmatch(user_id) else uuid.uuid4().hex
+        restore_user(st.session_state.user_id)
+    if st.query_params.get('uid') != st.session_state.user_id:
+        st.query_params['uid'] = st.session_state.user_id
+    
+    # User profile
+    if 'name' not in st.session_state:
+        st.session_state.name = ''
+    if 'age_group' not in st.session_state:
+        st.session_state.age_group = 'adult'
+    if 'daily_goal' not in st.session_state:
+        st.session_state.daily_goal = 2000
+    if 'join_date' not in st.session_state:
+        st.session_state.join_date = datetime.now()
+    if 'timezone' not in st.session_state:
+        st.session_state.timezone = getattr(st.context, 'timezone', None) or DEFAULT_TIMEZONE
+    if 'locale' not in st.session_state:
+        st.session_state.locale = get_browser_locale()
+    
+    # Tracking data
+    if 'current_intake' not in st.session_state:
+        st.session_state.current_intake = 0
+    if 'intake_render_id' not in st.session_state:
+        st.session_state.intake_render_id = uuid.uuid4().hex
+    if 'synced_client_taps' not in st.session_state:
+        st.session_state.synced_client_taps = SyncedIds()
+    if 'last_intake_batch' not in st.session_state:
+        st.session_state.last_intake_batch = None
+    if 'intake_history' not in st.session_state:
+        st.session_state.intake_history = IntakeLog()
+    if 'intake_pyramid' not in st.session_state:
+        st.session_state.intake_pyramid = IntakePyramid.from_log(
+            st.session_state.intake_history, st.session_state.timezone
+        )
+    if 'last_drink' not in st.session_state:
+        st.session_state.last_drink = None
+    
+    # Gamification
+    if 'streak' not in st.session_state:
+        st.session_state.streak = 0
+    if 'best_streak' not in st.session_state:
+        st.session_state.best_streak = 0
+    if 'badges' not in st.session_state:
+        st.session_state.badges = []
+    if 'total_intake' not in st.session_state:
+        st.session_state.total_intake = 0
+    if 'total_glasses' not in st.session_state:
+        st.session_state.total_glasses = 0
+    
+    # Settings
+    if 'notifications_enabled' not in st.session_state:
+        st.session_state.notifications_enabled = True
+    if 'notification_frequency' not in st.session_state:
+        st.session_state.notification_frequency = 60
+    if 'notification_tone' not in st.session_state:
+        st.session_state.notification_tone = 'gentle'
+    if 'sound_enabled' not in st.session_state:
+        st.session_state.sound_enabled = True
+    if 'high_contrast' not in st.session_state:
+        st.session_state.high_contrast = False
+    if 'family_mode' not in st.session_state:
+        st.session_state.family_mode = False
+    if 'group_code' not in st.session_state:
+        # A private group of one until the user enters a code someone shared
+        st.session_state.group_code = new_group_code()
+    
+    # UI state
+    if 'screen' not in st.session_state:
+        st.session_state.screen = 'splash' if not st.session_state.name else 'dashboard'
+    if 'show_onboarding' not in st.session_state:
+        st.session_state.show_onboarding = not st.session_state.name
+    if 'today_date' not in st.session_state:
+        st.session_state.today_date = local_today(st.session_state.timezone)
+    if 'rollover_generation' not in st.session_state:
+        st.session_state.rollover_generation = -1
+    if 'data_version' not in st.session_state:
+        bump_data_version()
+    
+    # Learned drinking times for reminders
+    if 'drinking_profile' not in st.session_state:
+        st.session_state.drinking_profile = DrinkingProfile.from_log(
+            st.session_state.intake_history, st.session_state.timezone,
+            date_to_day(st.session_state.today_date)
+        )
+    if 'pace_forecaster' not in st.session_state:
+        st.session_state.pace_forecaster = PaceForecaster.from_pyramid(
+            st.session_state.intake_pyramid, date_to_day(st.session_state.today_date)
+        )
+    
+    # Weekly data for charts
+    if 'weekly_data' not in st.session_state:
+        st.session_state.weekly_data = generate_weekly_data()
+    
+    # Leaderboard data (loaded from the group's shared standings)
+    if 'leaderboard_users' not in st.session_state:
+        st.session_state.leaderboard_users = []
+    
+    # Celebration state
+    if 'show_celebration' not in st.session_state:
+        st.session_state.show_celebration = False
+    if 'celebration_message' not in st.session_state:
+        st.session_state.celebration_message = ''
+    
+    # Reminder state
+    if 'last_reminder_time' not in st.session_state:
+        st.session_state.last_reminder_time = datetime.now()
+
+def restore_user(user_id: str):
+    """Load a returning user's saved profile and intake history"""
+    store = get_store()
+    record = store.get(USERS_NAMESPACE, user_id)
+    if not record:
+        return
+    # Re-index the user in case the zone index was written by an older version or lost
+    register_user_zone(store, user_id, record['timezone'])
+    if record.get('group_code') == LEGACY_DEFAULT_GROUP:
+        # Leave the old deployment-wide group; init_session_state picks a private code
+        publish_standing(store, LEGACY_DEFAULT_GROUP, user_id, None)
+        record = {key: value for key, value in record.items() if key != 'group_code'}
+    if 'intake_history' not in st.session_state:
+        # Latest snapshot plus the events logged since, not the whole log
+        zone_name = record['timezone']
+        state = restore_history(store, user_id, zone_name, date_to_day(local_today(zone_name)))
+        st.session_state.intake_history = state['history']
+        st.session_state.intake_pyramid = state['pyramid']
+        # Derived from the log itself, so they win over the record's copies
+        for key, state_key in RESTORED_STATE_KEYS.items():
+            if key not in st.session_state:
+                st.session_state[key] = state[state_key]
+    for key in USER_RECORD_KEYS:
+        if key in record and key not in st.session_state:
+            st.session_state[key] = record[key]
+
+def generate_weekly_data():
+    """The week ending today, from the user's daily intake totals"""
+    return weekly_intake(
+        st.session_state.intake_pyramid, date_to_day(st.session_state.today_date),
+        st.session_state.daily_goal, st.session_state.current_intake
+    )
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def get_age_specific_message(message_type: str) -> str:
+    """Get age-appropriate messages in the user's language"""
+    return get_content_catalog().message(
+        st.session_state.get('age_group', 'adult'), message_type, st.session_state.get('locale', 'en')
+    )
+
+def local_now() -> datetime:
+    """Current wall-clock time in the user's timezone"""
+    return local_datetime(time.time(), st.session_state.timezone)
+
+def get_pace_forecast() -> dict:
+    """Projected end-of-day intake and goal time (memoized by the model)"""
+    now = local_now()
+    return st.session_state.pace_forecaster.predict(
+        st.session_state.drinking_profile,
+        date_to_day(st.session_state.today_date),
+        st.session_state.current_intake,
+        st.session_state.daily_goal,
+        now.hour * 60 + now.minute
+    )
+
+def get_mascot_expression() -> str:
+    """Get mascot expression based on progress"""
+    progress = get_derived_stats()['progress_pct']
+    
+    if progress >= 100:
+        return MASCOT_EXPRESSIONS['cheer']
+    elif progress >= 75:
+        return MASCOT_EXPRESSIONS['excited']
+    elif progress >= 50:
+        return MASCOT_EXPRESSIONS['smile']
+    elif progress < 25 and local_now().hour > 18:
+        return MASCOT_EXPRESSIONS['sleepy']
+    else:
+        return MASCOT_EXPRESSIONS['neutral']
+
+def create_mascot_svg(expression: str = 'smile', size: str = 'medium'):
+    """Create animated emoji mascot (replaced SVG to fix rendering issues)"""
+    
+    age_colors = AGE_THEME_COLORS[st.session_state.age_group]
+    
+    # Use emoji-based mascot instead of SVG to avoid rendering issues
+    mascot_emojis = {
+        'neutral': '💧',
+        'smile': '😊',
+        'cheer': '🎉',
+        'excited': '🌟',
+        'sleepy': '😴',
+        'wave': '👋'
+    }
+    
+    emoji = mascot_emojis.get(expression, '💧')
+    
+    # Size mapping for emojis
+    emoji_sizes = {
+        'small': '40px',
+        'medium': '80px',
+        'large': '120px'
+    }
+    emoji_size = emoji_sizes.get(size, '80px')
+    
+    html = f"""
+    <div style="text-align: center; padding: 10px;">
+        <div style="
+            font-size: {emoji_size}; 
+            animation: float 3s ease-in-out infinite;
+            display: inline-block;
+        ">
+            {emoji}
+        </div>
+    </div>
+    """
+    
+    return html
+
+def add_water_intake(amount: int, source: str) -> bool:
+    """Publish a water intake; totals, badges and charts update via the event bus
+
+    `source` is the widget that was clicked. Together with the page render
+    the click came from it identifies the intake, so a double-tap or a
+    replayed rerun is dropped here. Returns False for such duplicates.
+    """
+    event_id = intake_event_id(st.session_state.user_id, st.session_state.intake_render_id, source, amount)
+    return publish_intake(amount, event_id, time.time())
+
+def publish_intake(amount: int, event_id: str, now: float) -> bool:
+    """Publish an intake logged at `now` unless its ID was seen recently"""
+    if not get_recent_intake_ids().add(event_id):
+        return False
+    
+    day, hour = bucket_events([int(now)], st.session_state.timezone)
+    
+    # A drink just after midnight belongs to the new day even if the job hasn't run yet
+    if day_to_date(day[0]) != st.session_state.today_date:
+        get_rollover_job().run_for_user(st.session_state.user_id)
+        st.session_state.rollover_generation = -1
+        sync_user_record()
+    
+    event = IntakeEvent(st.session_state.user_id, now, amount, int(day[0]), int(hour[0]), event_id)
+    try:
+        get_event_bus().publish(INTAKE_LOGGED, event)
+    except Exception:
+        get_recent_intake_ids().discard(event_id)
+        raise
+    return True
+
+def sync_buffered_intakes(batch) -> Optional[int]:
+    """Log a batch of taps the browser buffered, returning how many were new
+
+    The component keeps returning its last batch on every rerun, so a batch
+    is handled once. Taps are logged at their tap time, but no earlier than
+    the start of today or the latest log entry (drink or correction), as
+    the day totals and the append-only history expect. Returns None for a
+    batch already handled.
+    """
+    if not isinstance(batch, dict) or batch.get('batch') == st.session_state.last_intake_batch:
+        return None
+    st.session_state.last_intake_batch = batch.get('batch')
+    
+    now = time.time()
+    start_of_today = now - int(local_seconds([int(now)], st.session_state.timezone)[0]) % SECONDS_PER_DAY
+    # Corrections are stamped when made, so the newest raw entry can be later than any drink
+    logged_at = st.session_state.intake_history.entries()['timestamps']
+    after = max(start_of_today, float(logged_at[-1]) if len(logged_at) else 0.0)
+    synced = st.session_state.synced_client_taps
+    logged = 0
+    for tap in parse_batch(batch, now, after):
+        if tap.client_id not in synced:
+            logged += publish_intake(tap.amount, client_event_id(st.session_state.user_id, tap.client_id),
+                                     tap.timestamp)
+            synced.add([tap.client_id])
+    return logged
+
+def editable_since() -> int:
+    """UTC seconds of the oldest drink the user can still edit or undo"""
+    return get_log_compactor().policy.editable_since(date_to_day(st.session_state.today_date))
+
+def correct_water_intake(index: int, new_amount: int) -> bool:
+    """Publish an edit (or, with new_amount 0, an undo) of a logged drink
+
+    Returns False when nothing changes, e.g. for a repeated undo, and for
+    drinks old enough to be archived at any time.
+    """
+    log = st.session_state.intake_history
+    delta = new_amount - log.amount_of(index)
+    if not delta or log.timestamp_of(index) < editable_since():
+        return False
+    day, hour = bucket_events([log.timestamp_of(index)], st.session_state.timezone)
+    event = IntakeCorrection(
+        st.session_state.user_id, time.time(), index, delta, int(day[0]), int(hour[0]), new_amount == 0,
+        log.timestamp_of(index), log.logged_amount(index)
+    )
+    get_event_bus().publish(INTAKE_CORRECTED, event)
+    return True
+
+# ============================================================================
+# INTAKE EVENT CONSUMERS
+# ============================================================================
+
+def apply_intake(event: IntakeEvent):
+    """Update today's totals and the history models"""
+    st.session_state.current_intake += event.amount
+    st.session_state.total_intake += event.amount
+    st.session_state.total_glasses += 1
+    st.session_state.last_drink = local_datetime(event.timestamp, st.session_state.timezone)
+    
+    st.session_state.intake_history.append(event.timestamp, event.amount)
+    st.session_state.intake_pyramid.add(event.day, event.amount)
+    st.session_state.drinking_profile.observe(event.day, event.hour, event.amount)
+    st.session_state.pace_forecaster.observe(event.day, event.amount)
+
+def award_intake_badges(event: IntakeEvent):
+    """Check for achievements after an intake"""
+    new_intake = st.session_state.current_intake
+    old_intake = new_intake - event.amount
+    
+    # Check for first glass badge
+    if 'first-glass' not in st.session_state.badges and st.session_state.total_glasses == 1:
+        st.session_state.badges.append('first-glass')
+        st.success(f"🌟 Badge Earned: {BADGES['first-glass']['title']}!")
+    
+    # Check for daily goal achievement
+    if new_intake >= st.session_state.daily_goal and old_intake < st.session_state.daily_goal:
+        if 'daily-goal' not in st.session_state.badges:
+            st.session_state.badges.append('daily-goal')
+        st.session_state.show_celebration = True
+        st.balloons()
+        st.success(get_age_specific_message('goal_reached'))
+    
+    # Check for hydration hero (100 glasses)
+    if st.session_state.total_glasses >= 100 and 'hydration-hero' not in st.session_state.badges:
+        st.session_state.badges.append('hydration-hero')
+        st.success(f"💪 Badge Earned: {BADGES['hydration-hero']['title']}!")
+    
+    # Check for early bird (morning drink, user's local time)
+    if 5 <= event.hour < 9 and 'early-bird' not in st.session_state.badges:
+        st.session_state.badges.append('early-bird')
+        st.success(f"🌅 Badge Earned: {BADGES['early-bird']['title']}!")
+    
+    # Check for night owl (evening drink)
+    if 20 <= event.hour < 24 and 'night-owl' not in st.session_state.badges:
+        st.session_state.badges.append('night-owl')
+        st.success(f"🦉 Badge Earned: {BADGES['night-owl']['title']}!")
+    
+    # Check for overachiever
+    if new_intake >= st.session_state.daily_goal * 1.5 and 'overachiever' not in st.session_state.badges:
+        st.session_state.badges.append('overachiever')
+        st.success(f"🚀 Badge Earned: {BADGES['overachiever']['title']}!")
+
+def apply_correction(event: IntakeCorrection):
+    """Adjust totals and the history models by a correction's delta"""
+    log = st.session_state.intake_history
+    log.amend(event.index, event.delta, event.timestamp)
+    if event.day == date_to_day(st.session_state.today_date):
+        st.session_state.current_intake += event.delta
+    st.session_state.total_intake += event.delta
+    if event.removed:
+        st.session_state.total_glasses -= 1
+        latest = log.tail(1)
+        st.session_state.last_drink = (
+            local_datetime(latest[0]['timestamp'].timestamp(), st.session_state.timezone) if latest else None
+        )
+    
+    st.session_state.intake_pyramid.add(event.day, event.delta)
+    st.session_state.drinking_profile.adjust(event.day, event.hour, event.delta)
+    st.session_state.pace_forecaster.adjust(event.day, event.delta)
+
+def adjust_corrected_badges(event: IntakeCorrection):
+    """Update streaks and badges that depend on the corrected drink"""
+    if event.day < date_to_day(st.session_state.today_date):
+        streak, best_streak, badges = correct_closed_day(
+            get_store(), st.session_state.user_id, day_to_date(event.day), event.delta,
+            st.session_state.today_date, st.session_state.streak, st.session_state.best_streak,
+            st.session_state.badges, st.session_state.daily_goal
+        )
+        st.session_state.streak = streak
+        st.session_state.best_streak = best_streak
+        st.session_state.badges = badges
+    
+    # Glass-count badges follow the corrected count
+    if st.session_state.total_glasses < 1 and 'first-glass' in st.session_state.badges:
+        st.session_state.badges.remove('first-glass')
+    if st.session_state.total_glasses < 100 and 'hydration-hero' in st.session_state.badges:
+        st.session_state.badges.remove('hydration-hero')
+
+def refresh_weekly_data(event):
+    st.session_state.weekly_data = generate_weekly_data()
+
+def refresh_leaderboard(event):
+    update_leaderboard_entry()
+
+def save_after_intake(event: IntakeEvent):
+    save_user_record({'day': event.day, 'amount': event.amount, 'glasses': 1})
+
+def save_after_correction(event: IntakeCorrection):
+    save_user_record({'day': event.day, 'amount': event.delta, 'glasses': -1 if event.removed else 0})
+
+def bump_data_version(event=None):
+    """Invalidate this user's derived stats after any change to their tracking data"""
+    st.session_state.data_version = next(get_data_versions())
+
+def append_history(store, compactor: LogCompactor, event, row: tuple):
+    """Append an intake or correction to the user's durable log (deferred consumer)"""
+    length = store.log_append(HISTORY_NAMESPACE, event.user_id, [row])
+    compactor.appended(event.user_id, length, event.day)
+
+def append_correction(store, compactor: LogCompactor, event: IntakeCorrection):
+    """Append a correction that amends the drink's durable log position (deferred consumer)
+
+    Dropped if no drink there can take it, e.g. one another tab has undone.
+    """
+    ref = durable_drink(store, event.user_id, event.index, event.drink_timestamp, event.drink_amount, event.delta)
+    if ref is not None:
+        append_history(store, compactor, event, IntakeLog.row(event.timestamp, event.delta, ref))
+
+def write_user_record(store, snapshot: dict):
+    """Merge a user record snapshot into the store and group standings (deferred consumer)
+
+    Other tabs of the same user write the record too, so an existing
+    record's counters only move by the snapshot's own intake change.
+    """
+    user_id = snapshot.pop('user_id')
+    change = snapshot.pop('change')
+    previous = {}
+    
+    def apply(record):
+        record = record or {}
+        previous['group'] = record.get('group_code') if record.get('family_mode') else None
+        previous['zone'] = record.get('timezone')
+        if record.get('today_date') and record['today_date'] > snapshot['today_date']:
+            # The job closed a day after this snapshot was taken; keep its result
+            for key in ROLLOVER_KEYS:
+                snapshot.pop(key, None)
+        counted = 'total_glasses' in record
+        merged = {**record, **snapshot}
+        if counted:
+            for key in RECORD_COUNTER_KEYS:
+                merged[key] = record[key]
+            if change:
+                merged['total_intake'] += change['amount']
+                merged['total_glasses'] += change['glasses']
+                if change['day'] == date_to_day(merged['today_date']):
+                    merged['current_intake'] += change['amount']
+        return merged
+    
+    record = store.update(USERS_NAMESPACE, user_id, apply)
+    # The zone index is shared by every user: only touch it for a new user or a new zone
+    if previous['zone'] != record['timezone']:
+        register_user_zone(store, user_id, record['timezone'])
+    
+    group = record['group_code'] if record.get('family_mode') else None
+    if previous['group'] and previous['group'] != group:
+        publish_standing(store, previous['group'], user_id, None)
+    if group:
+        publish_standing(store, group, user_id, {
+            'name': record['name'],
+            'intake': record['current_intake'],
+            'streak': record['streak'],
+            'day': date_to_day(record['today_date']),
+            'goal': record['daily_goal'],
+            'age_group': record['age_group'],
+        })
+
+def save_user_record(change: Optional[dict] = None):
+    """Queue this user's profile and tracking fields for the rollover job's store
+
+    `change` is the intake that prompted the save ({'day', 'amount',
+    'glasses'}), applied to the stored counters in place of this session's.
+    """
+    if not st.session_state.name:
+        return
+    
+    # Copy now: the session keeps mutating these objects while the write is pending
+    snapshot = copy.deepcopy({key: st.session_state[key] for key in USER_RECORD_KEYS})
+    snapshot['user_id'] = st.session_state.user_id
+    snapshot['change'] = change
+    get_event_bus().publish(RECORD_CHANGED, snapshot)
+
+def sync_user_record():
+    """Load the rollover job's result if it has closed a day since the last rerun
+
+    The job's generation only moves in the worker that ran it, so a session
+    whose local day has ended also checks the store: another worker may
+    have rolled the user over.
+    """
+    job = get_rollover_job()
+    if (st.session_state.rollover_generation == job.generation
+            and local_today(st.session_state.timezone) <= st.session_state.today_date):
+        return
+    st.session_state.rollover_generation = job.generation
+    
+    record = get_store().get(USERS_NAMESPACE, st.session_state.user_id)
+    if record is None:
+        save_user_record()
+        job.wake()
+    elif record['today_date'] > st.session_state.today_date:
+        for key in ROLLOVER_KEYS:
+            st.session_state[key] = record[key]
+        st.session_state.weekly_data = generate_weekly_data()
+        update_leaderboard_entry()
+        bump_data_version()
+
+def sync_group_membership():
+    """Keep this user's group membership in line with family mode"""
+    if st.session_state.family_mode and st.session_state.name:
+        get_group_registry().join(
+            st.session_state.user_id, st.session_state.group_code, st.session_state.age_group,
+            st.session_state.daily_goal, date_to_day(st.session_state.today_date),
+            st.session_state.current_intake
+        )
+    else:
+        get_group_registry().leave(st.session_state.user_id)
+
+def update_leaderboard_entry():
+    """Copy this user's intake and streak into the loaded leaderboard"""
+    if st.session_state.family_mode:
+        for user in st.session_state.leaderboard_users:
+            if user['user_id'] == st.session_state.user_id:
+                user['intake'] = st.session_state.current_intake
+                user['streak'] = st.session_state.streak
+
+@st.cache_data(ttl=GROUP_SYNC_SECONDS, max_entries=256)
+def load_standings(group_code: str, today: int) -> tuple:
+    """A group's shared standings, its members, and their rank order and places by each sort key
+
+    Read and sorted at most once per GROUP_SYNC_SECONDS for each group and
+    day, however many members page through the leaderboard.
+    """
+    standings = read_standings(get_store(), group_code)
+    users = [
+        {
+            'user_id': user_id,
+            'name': entry['name'],
+            'intake': entry['intake'] if entry['day'] == today else 0,
+            'streak': entry['streak'],
+        }
+        for user_id, entry in standings.items()
+    ]
+    orders = {key: rank_order(users, key) for key in SORT_KEYS}
+    return standings, users, orders, {key: rank_places(users, order) for key, order in orders.items()}
+
+def load_leaderboard():
+    """Today's standings of everyone in the user's group, from every worker process
+
+    Returns the raw standings, and the rank orders and user_id -> place maps
+    of leaderboard_users.
+    """
+    standings, users, orders, places = load_standings(
+        st.session_state.group_code, date_to_day(st.session_state.today_date)
+    )
+    st.session_state.leaderboard_users = users
+    update_leaderboard_entry()
+    return standings, orders, places
+
+def get_browser_locale() -> str:
+    """Browser language ('es-ES' -> 'es') if there is content for it, else English"""
+    language = (getattr(st.context, 'locale', None) or '').split('-')[0].lower()
+    return language if language in get_content_catalog().locales else 'en'
+
+@st.cache_data
+def get_timezone_options(current: str) -> List[str]:
+    """Sorted IANA timezone names for the settings picker"""
+    return sorted(available_timezones() | {current})
+
+def get_progress_color(progress: float) -> str:
+    """Get color based on progress percentage"""
+    age_colors = AGE_THEME_COLORS[st.session_state.age_group]
+    if progress >= 100:
+        return age_colors['accent']
+    elif progress >= 75:
+        return age_colors['primary']
+    else:
+        return age_colors['secondary']
+
+# ============================================================================
+# STYLING
+# ============================================================================
+
+@st.cache_resource
+def get_stylesheet() -> str:
+    """The static stylesheet's text, read once per process"""
+    with open(STYLESHEET_PATH, encoding='utf-8') as f:
+        return f.read()
+
+def use_page_style(name: str, css: str):
+    """Emit a named <style> block unless this run already has
+
+    Streamlit drops elements a run does not emit again, so blocks are
+    de-duplicated per script run: main() starts each run with an empty set.
+    """
+    emitted = st.session_state.page_styles
+    if name in emitted:
+        return
+    emitted.add(name)
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+
+def apply_custom_css():
+    """Apply custom CSS based on age group and settings
+
+    The rules live in static/waterbuddy.css, which the browser fetches once
+    and caches; each run only sends the theme's CSS variables. Without
+    static file serving the stylesheet is inlined instead.
+    """
+    
+    age_colors = AGE_THEME_COLORS[st.session_state.age_group]
+    
+    # Font sizes by age group
+    font_sizes = {
+        'children': '18px',
+        'teen': '16px',
+        'adult': '16px',
+        'senior': '20px'
+    }
+    
+    # Border radius by age group
+    border_radius = {
+        'children': '1.5rem',
+        'teen': '0.75rem',
+        'adult': '0.5rem',
+        'senior': '1rem'
+    }
+    
+    high_contrast = st.session_state.high_contrast
+    
+    theme = {
+        'primary': age_colors['primary'],
+        'secondary': age_colors['secondary'],
+        'background': '#000000' if high_contrast else COLORS['pale_sand'],
+        'text': '#ffffff' if high_contrast else COLORS['dark_slate'],
+        'on-primary': '#ffffff' if high_contrast else COLORS['dark_slate'],
+        'surface': '#111111' if high_contrast else '#ffffff',
+        'raised': '#222222' if high_contrast else '#ffffff',
+        'tint': f"{'#222222' if high_contrast else age_colors['primary']}22",
+        'primary-tint': f"{age_colors['primary']}22",
+        'border': '2px solid #ffffff' if high_contrast else f"2px solid {age_colors['primary']}33",
+        'strong-border': '2px solid #ffffff' if high_contrast else f"2px solid {age_colors['primary']}",
+        'radius': border_radius[st.session_state.age_group],
+        'font-size': font_sizes[st.session_state.age_group],
+    }
+    
+    if st.get_option('server.enableStaticServing'):
+        st.markdown(f'<link rel="stylesheet" href="{STYLESHEET_URL}">', unsafe_allow_html=True)
+    else:
+        use_page_style('stylesheet', get_stylesheet())
+    use_page_style('theme', ':root {' + ' '.join(f'--wb-{name}: {value};' for name, value in theme.items()) + '}')
+
+# ============================================================================
+# VISUALIZATION COMPONENTS
+# ============================================================================
+
+def create_progress_ring(percentage: float):
+    """Create a circular progress indicator (server-rendered SVG, no Plotly)"""
+    
+    age_colors = AGE_THEME_COLORS[st.session_state.age_group]
+    
+    # Ensure percentage is capped at 100 for display; the SVG is cached per theme and whole percent
+    display_pct = int(min(percentage, 100))
+    svg = gauge_svg(display_pct, age_colors['primary'], age_colors['secondary'], age_colors['accent'])
+    
+    return f"<div style='text-align: center;'>{svg}</div>"
+
+@st.cache_data(max_entries=1024)
+def load_derived_stats(user_id: str, version: int, today: date, _session) -> dict:
+    """Progress and weekly stats, cached per (user, data version, user's local day)"""
+    return derived_stats(
+        _session.current_intake, _session.daily_goal, _session.join_date, _session.badges, len(BADGES),
+        _session.weekly_data, today
+    )
+
+def get_derived_stats() -> dict:
+    """This user's derived stats, shared by every screen until their data changes"""
+    return load_derived_stats(
+        st.session_state.user_id, st.session_state.data_version, st.session_state.today_date, st.session_state
+    )
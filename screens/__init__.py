@@ -0,0 +1,34 @@
+"""
+WaterBuddy screens
+Each screen lives in its own module, imported the first time a user opens
+it, so a process only loads (and keeps in memory) the screens in use.
+SCREENS is the routing table: screen key -> sidebar label, module and
+render function
+"""
+
+import importlib
+
+SCREENS = {
+    'splash': {'label': None, 'module': 'onboarding', 'render': 'splash_screen'},
+    'onboarding': {'label': None, 'module': 'onboarding', 'render': 'onboarding_screen'},
+    'dashboard': {'label': '🏠 Dashboard', 'module': 'dashboard', 'render': 'dashboard_screen'},
+    'profile': {'label': '👤 Profile', 'module': 'profile', 'render': 'profile_screen'},
+    'charts': {'label': '📊 Analytics', 'module': 'charts', 'render': 'charts_screen'},
+    'leaderboard': {'label': '🏆 Leaderboard', 'module': 'leaderboard', 'render': 'leaderboard_screen'},
+    'reminders': {'label': '⏰ Reminders', 'module': 'reminders', 'render': 'reminders_screen'},
+    'summary': {'label': '📋 Summary', 'module': 'summary', 'render': 'summary_screen'},
+    'help': {'label': '❓ Help', 'module': 'help', 'render': 'help_screen'},
+    'settings': {'label': '⚙️ Settings', 'module': 'settings', 'render': 'settings_screen'},
+}
+
+
+def menu_items():
+    """(key, label) of the screens shown in the sidebar, in menu order"""
+    return [(key, screen['label']) for key, screen in SCREENS.items() if screen['label']]
+
+
+def render(key: str):
+    """Import a screen's module if needed and draw the screen"""
+    screen = SCREENS[key]
+    module = importlib.import_module(f"{__name__}.{screen['module']}")
+    getattr(module, screen['render'])()
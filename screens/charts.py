@@ -0,0 +1,252 @@
+"""
+Analytics screen for WaterBuddy
+Weekly and long-range charts, the drinking-pattern heatmap, container
+sizes and recent activity with edit/undo
+"""
+
+import streamlit as st
+import plotly.graph_objects as go
+from datetime import datetime, timedelta
+
+from waterbuddy.analytics import HOURS, WEEKDAYS, intake_heatmap, size_distribution
+from waterbuddy.charts import (
+    history_figure,
+    history_frame,
+    history_spec,
+    weekly_figure,
+    weekly_frame,
+    weekly_spec,
+)
+from waterbuddy.timezones import date_to_day, day_to_date, local_days, local_seconds
+
+from core import (
+    AGE_THEME_COLORS,
+    CHART_BACKEND,
+    WATER_SIZES,
+    correct_water_intake,
+    editable_since,
+    get_derived_stats,
+    get_segment_store,
+)
+
+def create_weekly_chart():
+    """Create weekly intake chart"""
+    
+    age_colors = AGE_THEME_COLORS[st.session_state.age_group]
+    return weekly_figure(st.session_state.weekly_data, age_colors['primary'], age_colors['secondary'])
+
+def create_history_chart(series):
+    """Create long-range intake chart from pre-aggregated day/week/month points"""
+    
+    age_colors = AGE_THEME_COLORS[st.session_state.age_group]
+    return history_figure(series, st.session_state.daily_goal, age_colors['primary'], age_colors['secondary'])
+
+def show_weekly_chart():
+    """Weekly chart as a Plotly figure or, with the vega backend, Arrow data plus a Vega-Lite spec"""
+    if CHART_BACKEND == 'vega':
+        age_colors = AGE_THEME_COLORS[st.session_state.age_group]
+        st.vega_lite_chart(
+            weekly_frame(st.session_state.weekly_data),
+            weekly_spec(age_colors['primary'], age_colors['secondary']),
+            use_container_width=True
+        )
+    else:
+        st.plotly_chart(create_weekly_chart(), use_container_width=True)
+
+def show_history_chart(series):
+    """Long-range chart through the configured backend (see show_weekly_chart)"""
+    if CHART_BACKEND == 'vega':
+        age_colors = AGE_THEME_COLORS[st.session_state.age_group]
+        st.vega_lite_chart(
+            history_frame(series),
+            history_spec(series['level'], st.session_state.daily_goal, age_colors['primary'], age_colors['secondary']),
+            use_container_width=True
+        )
+    else:
+        st.plotly_chart(create_history_chart(series), use_container_width=True)
+
+def get_analytics_history():
+    """The session's intake history and a cache key for it
+
+    Analytics scan the user's memory-mapped segment, whose pages every
+    worker process shares, followed by the session's drinks logged since
+    the segment was written. The session's own copy is used when it has no
+    segment, or when an edit since then changed a drink the segment holds.
+    """
+    log = st.session_state.intake_history
+    segment = get_segment_store().open(st.session_state.user_id)
+    tail = log.drinks_since(segment.end) if segment is not None else None
+    if tail is not None:
+        return segment.with_tail(tail['timestamps'], tail['amounts']), ('segment', segment.end, log.version)
+    return log, ('session', log.version)
+
+@st.cache_data(max_entries=256)
+def get_intake_heatmap(user_id: str, zone_name: str, start_day: int, end_day: int,
+                       version: tuple, _log):
+    """Weekday x hour heatmap, cached per (user, range, data version)"""
+    return intake_heatmap(_log, zone_name, start_day, end_day)
+
+@st.cache_data(max_entries=256)
+def get_size_distribution(user_id: str, zone_name: str, start_day: int, end_day: int,
+                          version: tuple, _log):
+    """Container size distribution, cached per (user, range, data version)"""
+    return size_distribution(_log, zone_name, start_day, end_day, [w['amount'] for w in WATER_SIZES])
+
+def create_intake_heatmap(heatmap):
+    """Create day-of-week x hour-of-day intake heatmap"""
+    
+    age_colors = AGE_THEME_COLORS[st.session_state.age_group]
+    
+    fig = go.Figure(go.Heatmap(
+        z=heatmap,
+        x=[f"{hour:02d}:00" for hour in HOURS],
+        y=WEEKDAYS,
+        colorscale=[[0, '#ffffff'], [1, age_colors['primary']]],
+        hovertemplate="%{y} %{x}<br>%{z:.0f}ml<extra></extra>",
+        colorbar=dict(title="ml")
+    ))
+    
+    fig.update_layout(
+        title="Intake by Day & Hour",
+        height=350,
+        yaxis=dict(autorange='reversed'),
+        margin=dict(l=20, r=20, t=50, b=20)
+    )
+    
+    return fig
+
+def create_size_distribution_chart(distribution):
+    """Create intake-by-container-size bar chart"""
+    
+    age_colors = AGE_THEME_COLORS[st.session_state.age_group]
+    labels_by_amount = {w['amount']: f"{w['icon']} {w['label']}" for w in WATER_SIZES}
+    labels = [labels_by_amount[int(size)] for size in distribution['sizes']] + ['✏️ Custom']
+    
+    fig = go.Figure(go.Bar(
+        x=labels,
+        y=distribution['volume'],
+        marker=dict(color=age_colors['primary']),
+        text=[f"{int(count)}×" for count in distribution['counts']],
+        textposition='auto',
+        hovertemplate="%{x}<br>%{y:.0f}ml<extra></extra>"
+    ))
+    
+    fig.update_layout(
+        title="Intake by Container Size",
+        yaxis_title="Water (ml)",
+        height=350,
+        margin=dict(l=20, r=20, t=50, b=20)
+    )
+    
+    return fig
+
+def charts_screen():
+    """Analytics and charts"""
+    
+    st.title("📊 Analytics & Charts")
+    
+    # Weekly chart
+    st.markdown("### Weekly Progress")
+    show_weekly_chart()
+    
+    # Stats summary
+    col1, col2, col3 = st.columns(3)
+    
+    stats = get_derived_stats()
+    
+    with col1:
+        st.metric("Weekly Total", f"{stats['weekly_total']:,}ml")
+    
+    with col2:
+        st.metric("Weekly Average", f"{int(stats['weekly_average'])}ml")
+    
+    with col3:
+        st.metric("Goals Met This Week", f"{stats['days_met']}/7")
+    
+    st.divider()
+    
+    # Long-range history
+    st.markdown("### 📈 Long-Range History")
+    
+    pyramid = st.session_state.intake_pyramid
+    if pyramid.first_day is not None:
+        ranges = {'1 Month': 30, '3 Months': 91, '6 Months': 182, '1 Year': 365, 'All Time': None}
+        range_label = st.select_slider("Range", options=list(ranges), value='3 Months', key="history_range")
+        end_day = date_to_day(st.session_state.today_date)
+        span = ranges[range_label]
+        start_day = pyramid.first_day if span is None else end_day - span + 1
+        show_history_chart(pyramid.series(start_day, end_day))
+    else:
+        st.info("Your long-range history appears once you've logged some water.")
+    
+    st.divider()
+    
+    # Drinking patterns
+    st.markdown("### 🕒 When You Drink")
+    
+    log, version = get_analytics_history()
+    if log:
+        today = st.session_state.today_date
+        first_day = min(day_to_date(local_days(log.timestamps[:1], st.session_state.timezone)[0]), today)
+        date_range = st.date_input(
+            "Date range",
+            value=(max(first_day, today - timedelta(days=29)), today),
+            min_value=first_day,
+            max_value=today,
+            key="analytics_range"
+        )
+        start, end = (date_range[0], date_range[-1]) if date_range else (today, today)
+        
+        heatmap = get_intake_heatmap(
+            st.session_state.user_id, st.session_state.timezone,
+            date_to_day(start), date_to_day(end), version, log
+        )
+        st.plotly_chart(create_intake_heatmap(heatmap), use_container_width=True)
+        
+        distribution = get_size_distribution(
+            st.session_state.user_id, st.session_state.timezone,
+            date_to_day(start), date_to_day(end), version, log
+        )
+        st.plotly_chart(create_size_distribution_chart(distribution), use_container_width=True)
+    else:
+        st.info("Your drinking pattern heatmap appears once you've logged some water.")
+    
+    st.divider()
+    
+    # Intake history
+    if st.session_state.intake_history:
+        st.markdown("### Recent Activity")
+        
+        # Show last 10 entries
+        recent_entries = st.session_state.intake_history.tail(10)
+        
+        local_times = local_seconds(
+            [int(entry['timestamp'].timestamp()) for entry in recent_entries],
+            st.session_state.timezone
+        )
+        oldest_editable = editable_since()
+        for entry, local_time in zip(recent_entries, local_times):
+            logged_at = datetime(1970, 1, 1) + timedelta(seconds=int(local_time))
+            col1, col2 = st.columns([5, 1])
+            with col1:
+                st.markdown(f"🥤 **{entry['amount']}ml** - {logged_at.strftime('%I:%M %p')}")
+            if entry['timestamp'].timestamp() < oldest_editable:
+                continue
+            with col2:
+                with st.popover("✏️", use_container_width=True):
+                    new_amount = st.number_input(
+                        "Amount (ml)",
+                        min_value=1,
+                        max_value=2000,
+                        value=entry['amount'],
+                        step=50,
+                        key=f"edit_amount_{entry['index']}"
+                    )
+                    if st.button("Save", key=f"edit_save_{entry['index']}", use_container_width=True):
+                        if correct_water_intake(entry['index'], new_amount):
+                            st.rerun()
+                    if st.button("🗑️ Remove", key=f"edit_remove_{entry['index']}", use_container_width=True):
+                        if correct_water_intake(entry['index'], 0):
+                            st.rerun()
+    else:
+        st.info("No activity recorded yet. Start logging to see your history!")
@@ -0,0 +1,268 @@
+"""
+Dashboard screen for WaterBuddy
+Today's progress, the log-water panel, quick stats and the daily tip
+"""
+
+import streamlit as st
+import uuid
+
+from core import (
+    AGE_THEME_COLORS,
+    CLIENT_SYNC_SECONDS,
+    WATER_SIZES,
+    add_water_intake,
+    correct_water_intake,
+    editable_since,
+    create_mascot_svg,
+    get_age_specific_message,
+    get_content_catalog,
+    get_derived_stats,
+    get_pace_forecast,
+    intake_buffer,
+    local_now,
+    sync_buffered_intakes,
+)
+
+def create_bottle_visualization(percentage: float):
+    """Create a simple emoji-based bottle visualization that works perfectly in Streamlit"""
+    
+    age_colors = AGE_THEME_COLORS[st.session_state.age_group]
+    fill_height = max(0, min(100, percentage))
+    
+    # Determine bottle state based on fill percentage
+    if fill_height >= 100:
+        bottle_emoji = "🍶"  # Full bottle
+        status = "Full!"
+        status_emoji = "✨"
+    elif fill_height >= 75:
+        bottle_emoji = "🥤"  # Almost full
+        status = "Almost there!"
+        status_emoji = "🎯"
+    elif fill_height >= 50:
+        bottle_emoji = "🧃"  # Half full
+        status = "Halfway!"
+        status_emoji = "💪"
+    elif fill_height >= 25:
+        bottle_emoji = "🥛"  # Quarter full
+        status = "Keep going!"
+        status_emoji = "📈"
+    else:
+        bottle_emoji = "🫗"  # Empty/low
+        status = "Time to hydrate!"
+        status_emoji = "💧"
+    
+    # Create visual progress bar using block characters
+    bar_length = 20
+    filled_blocks = int((fill_height / 100) * bar_length)
+    empty_blocks = bar_length - filled_blocks
+    progress_bar = "█" * filled_blocks + "░" * empty_blocks
+    
+    # Simple HTML visualization that works perfectly in Streamlit
+    html_code = f'''
+    <div style="
+        text-align: center; 
+        padding: 30px 20px; 
+        background: linear-gradient(135deg, {age_colors['primary']}15, {age_colors['secondary']}15);
+        border-radius: 20px;
+        border: 3px solid {age_colors['primary']};
+    ">
+        <div style="font-size: 80px; margin-bottom: 15px; animation: bounce 2s infinite;">
+            {bottle_emoji}
+        </div>
+        <div style="
+            font-size: 36px; 
+            font-weight: bold; 
+            color: {age_colors['primary']};
+            margin-bottom: 10px;
+        ">
+            {int(fill_height)}%
+        </div>
+        <div style="
+            font-family: monospace;
+            font-size: 20px;
+            color: {age_colors['secondary']};
+            letter-spacing: 2px;
+            margin-bottom: 15px;
+        ">
+            {progress_bar}
+        </div>
+        <div style="
+            font-size: 18px;
+            color: {age_colors['primary']};
+            font-weight: 600;
+        ">
+            {status_emoji} {status}
+        </div>
+    </div>
+    '''
+    
+    return html_code
+
+def dashboard_screen():
+    """Main dashboard screen"""
+    
+    # Header
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.title(get_age_specific_message('greeting'))
+        st.caption(f"👋 {st.session_state.name}")
+        st.caption(local_now().strftime("%A, %B %d, %Y"))
+    
+    with col2:
+        mascot_expression = 'smile' if st.session_state.current_intake > 0 else 'neutral'
+        if st.session_state.current_intake >= st.session_state.daily_goal:
+            mascot_expression = 'cheer'
+        elif st.session_state.current_intake >= st.session_state.daily_goal * 0.75:
+            mascot_expression = 'excited'
+        
+        mascot_svg = create_mascot_svg(mascot_expression, 'large')
+        st.markdown(mascot_svg, unsafe_allow_html=True)
+    
+    st.divider()
+    
+    # Progress section
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.markdown("### Today's Progress")
+        
+        progress_pct = get_derived_stats()['progress_pct']
+        
+        st.progress(min(progress_pct / 100, 1.0))
+        
+        st.markdown(f"""
+        <div style='font-size: 1.5rem; font-weight: 600; margin: 1rem 0;'>
+            {st.session_state.current_intake}ml / {st.session_state.daily_goal}ml
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.info(get_age_specific_message('encouragement'))
+        
+        forecast = get_pace_forecast()
+        if forecast['reached']:
+            st.caption(f"📈 Projected today: ~{forecast['end_of_day']:,}ml")
+        elif forecast['goal_minute'] is not None:
+            goal_minute = min(forecast['goal_minute'], 24 * 60 - 1)
+            st.caption(f"📈 Projected today: ~{forecast['end_of_day']:,}ml • "
+                       f"goal reached around {goal_minute // 60:02d}:{goal_minute % 60:02d}")
+        else:
+            short = st.session_state.daily_goal - forecast['end_of_day']
+            st.caption(f"📈 Projected today: ~{forecast['end_of_day']:,}ml • "
+                       f"about {short:,}ml short of your goal at this pace")
+    
+    with col2:
+        bottle_svg = create_bottle_visualization(progress_pct)
+        st.markdown(bottle_svg, unsafe_allow_html=True)
+    
+    st.divider()
+    
+    # Water intake buttons
+    st.markdown("### 💧 Log Water Intake")
+    
+    if CLIENT_SYNC_SECONDS > 0:
+        # Taps show up instantly in the panel and reach the server in batches
+        batch = intake_buffer(
+            user_id=st.session_state.user_id,
+            sizes=WATER_SIZES,
+            current_intake=st.session_state.current_intake,
+            daily_goal=st.session_state.daily_goal,
+            synced=st.session_state.synced_client_taps.to_list(),
+            sync_ms=int(CLIENT_SYNC_SECONDS * 1000),
+            primary_color=AGE_THEME_COLORS[st.session_state.age_group]['primary'],
+            key="intake_buffer",
+            default=None
+        )
+        if sync_buffered_intakes(batch) is not None:
+            # Rerun so the panel gets the synced IDs (and the new totals) back
+            st.rerun()
+    else:
+        cols = st.columns(4)
+        for idx, water_size in enumerate(WATER_SIZES):
+            with cols[idx]:
+                if st.button(
+                    f"{water_size['icon']}\n\n**{water_size['label']}**\n\n{water_size['amount']}ml",
+                    key=f"water_{water_size['amount']}",
+                    use_container_width=True
+                ):
+                    if add_water_intake(water_size['amount'], f"water_{water_size['amount']}"):
+                        st.rerun()
+    
+    # Custom amount
+    with st.expander("➕ Add Custom Amount"):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            custom_amount = st.number_input(
+                "Enter amount (ml)", 
+                min_value=1, 
+                max_value=2000, 
+                value=250,
+                step=50,
+                key="custom_amount"
+            )
+        with col2:
+            st.write("")
+            st.write("")
+            if st.button("Add", key="add_custom"):
+                if add_water_intake(custom_amount, "add_custom"):
+                    st.rerun()
+    
+    # Undo the latest drink (older ones can be edited under Charts > Recent Activity)
+    latest = st.session_state.intake_history.tail(1)
+    if latest and latest[0]['timestamp'].timestamp() >= editable_since() and st.button(f"↩️ Undo last drink ({latest[0]['amount']}ml)", key="undo_last"):
+        if correct_water_intake(latest[0]['index'], 0):
+            st.rerun()
+    
+    st.divider()
+    
+    # Celebration message if goal reached
+    if st.session_state.current_intake >= st.session_state.daily_goal and st.session_state.show_celebration:
+        st.balloons()
+        st.success("🎉 " + get_age_specific_message('goal_reached'))
+        st.session_state.show_celebration = False
+    
+    # Quick stats
+    st.markdown("### 📊 Quick Stats")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown(f"""
+        <div class='stat-card'>
+            <div style='font-size: 2rem;'>🔥</div>
+            <div style='font-size: 1.5rem; font-weight: 700;'>{st.session_state.streak}</div>
+            <div style='opacity: 0.8;'>Day Streak</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class='stat-card'>
+            <div style='font-size: 2rem;'>🏆</div>
+            <div style='font-size: 1.5rem; font-weight: 700;'>{len(st.session_state.badges)}</div>
+            <div style='opacity: 0.8;'>Badges</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        last_time = st.session_state.last_drink.strftime("%H:%M") if st.session_state.last_drink else "--:--"
+        st.markdown(f"""
+        <div class='stat-card'>
+            <div style='font-size: 2rem;'>⏰</div>
+            <div style='font-size: 1.5rem; font-weight: 700;'>{last_time}</div>
+            <div style='opacity: 0.8;'>Last Drink</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.divider()
+    
+    # Hydration tips
+    st.markdown("### 💡 Daily Hydration Tip")
+    
+    tip_of_day = get_content_catalog().daily(
+        'tips', st.session_state.age_group, st.session_state.user_id, st.session_state.today_date,
+        st.session_state.locale
+    )
+    st.info(tip_of_day)
+    
+    # Clicks on the page just rendered get fresh intake IDs
+    st.session_state.intake_render_id = uuid.uuid4().hex
@@ -0,0 +1,176 @@
+"""
+Help screen for WaterBuddy
+Getting started guide, features guide and FAQ
+"""
+
+import streamlit as st
+
+def help_screen():
+    """Help and tutorial screen"""
+    
+    st.title("❓ Help & Tutorial")
+    
+    tab1, tab2, tab3 = st.tabs(["Getting Started", "Features Guide", "FAQ"])
+    
+    with tab1:
+        st.markdown("""
+        ## Welcome to WaterBuddy! 💧
+        
+        ### Quick Start Guide
+        
+        **1. Log Your Water Intake** 🥤
+        - Use the dashboard buttons to log different drink sizes
+        - Choose from: Glass (250ml), Can (330ml), Bottle (500ml), or Large Bottle (750ml)
+        - Or enter a custom amount
+        
+        **2. Track Your Progress** 📊
+        - Watch the bottle fill up as you drink
+        - Your mascot buddy gets happier as you progress
+        - See your progress percentage in real-time
+        
+        **3. Build Your Streak** 🔥
+        - Log water every day to maintain your streak
+        - Reach your daily goal to keep the streak alive
+        - Compete with yourself or family members
+        
+        **4. Earn Badges** 🏆
+        - Complete challenges to unlock achievements
+        - Each badge represents a milestone
+        - Collect them all!
+        
+        **5. View Analytics** 📈
+        - Check your weekly progress
+        - See patterns in your hydration
+        - Optimize your water drinking schedule
+        """)
+        
+        st.success("💡 Pro Tip: Log water regularly throughout the day for best results!")
+    
+    with tab2:
+        st.markdown("""
+        ## Features Guide
+        
+        ### 🏠 Dashboard
+        - **Main hub** for logging water intake
+        - View today's progress and goals
+        - Quick access to intake buttons
+        - See current streak and badges
+        - Get daily hydration tips
+        
+        ### 👤 Profile
+        - View your **lifetime statistics**
+        - See all earned badges
+        - Check current and best streak
+        - View achievement completion rate
+        - Customize your avatar
+        
+        ### 📊 Analytics
+        - **Weekly progress chart** showing daily intake
+        - **Heatmap** of when you drink by weekday and hour
+        - Compare against your goal
+        - View recent activity history
+        - Track weekly averages and totals
+        
+        ### 🏆 Leaderboard
+        - Available in **Family/Group mode**
+        - See rankings by daily intake
+        - View longest streaks
+        - Friendly competition with family
+        
+        ### ⏰ Reminders
+        - Set **custom reminder frequency**
+        - View today's reminder schedule
+        - Get motivational quotes
+        - Age-appropriate encouragement
+        
+        ### 📋 Summary
+        - **End-of-day review**
+        - See today's achievements
+        - Progress visualization
+        - Goal completion status
+        
+        ### ⚙️ Settings
+        - **Customize your profile**
+        - Adjust daily goal
+        - Change age group
+        - Configure notifications
+        - Enable high contrast mode
+        - Export/import data
+        """)
+    
+    with tab3:
+        st.markdown("""
+        ## Frequently Asked Questions
+        
+        ### General
+        
+        **Q: Is my data safe and private?**  
+        A: Yes! All data is stored locally in your browser session. We don't collect or send any personal information to external servers.
+        
+        **Q: Can I use this on my phone?**  
+        A: Absolutely! WaterBuddy works great on mobile browsers. Just bookmark the page for quick access.
+        
+        **Q: How do I save my progress?**  
+        A: Use the "Export Data" feature in Settings to download your progress as a JSON file. You can import it later.
+        
+        ### Tracking
+        
+        **Q: What if I forget to log my water?**  
+        A: You can add it anytime during the day. Try to log regularly for the most accurate tracking.
+        
+        **Q: Can I edit or delete logged entries?**  
+        A: Currently, entries can't be individually edited. If you make a mistake, you can reset today's data in Settings.
+        
+        **Q: What happens at midnight?**  
+        A: At midnight in your timezone (Settings → Profile) the app closes the day, resets your daily intake and updates your streak.
+        
+        ### Goals & Streaks
+        
+        **Q: How is my streak calculated?**  
+        A: You maintain your streak by reaching your daily goal each day. Missing a day resets it to 0.
+        
+        **Q: Can I change my daily goal?**  
+        A: Yes! Go to Settings → Profile to adjust your goal anytime.
+        
+        **Q: What's a good daily water goal?**  
+        A: Generally 2000-2500ml for adults, but this varies by age, activity level, and climate. Consult your doctor for personalized advice.
+        
+        ### Badges
+        
+        **Q: How do I earn badges?**  
+        A: Badges are earned automatically by completing specific challenges (first glass, daily goals, streaks, etc.).
+        
+        **Q: Can I see all available badges?**  
+        A: Yes! Check your Profile page to see all badges and which ones you've earned.
+        
+        ### Family Mode
+        
+        **Q: How does Family Mode work?**  
+        A: Enable it in Settings to view a leaderboard. Each family member should use their own profile or browser session.
+        
+        **Q: Can we share a single device?**  
+        A: Yes, but you'll need to export/import data when switching users, or use different browser profiles.
+        
+        ### Technical
+        
+        **Q: Why did my data disappear?**  
+        A: Data is stored in the browser session. Always export your data before closing the app to preserve it permanently.
+        
+        **Q: The app is slow. What can I do?**  
+        A: Try clearing your browser cache, closing other tabs, or using a different browser.
+        
+        **Q: Can I use this offline?**  
+        A: The app needs to be running on a server (local or online). You need an internet connection for online deployments.
+        
+        ### Deployment
+        
+        **Q: How do I deploy this online?**  
+        A: See our [Deployment Guide](DEPLOYMENT_GUIDE.md) for step-by-step instructions. Streamlit Cloud offers free hosting!
+        
+        **Q: Can I customize the colors?**  
+        A: Yes! Each age group has its own color scheme. You can also modify the config.toml file for custom theming.
+        """)
+        
+        st.divider()
+        
+        st.info("📧 Still have questions? Open an issue on GitHub or reach out to the community!")
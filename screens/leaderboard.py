@@ -0,0 +1,137 @@
+"""
+Leaderboard screen for WaterBuddy
+Today's standings, longest streaks and the family/workplace group overview
+"""
+
+import streamlit as st
+import plotly.graph_objects as go
+import html
+
+from waterbuddy.groups import GROUP_AGE_GROUPS
+from waterbuddy.leaderboard import SORT_KEYS, leaderboard_page, page_count
+from waterbuddy.timezones import date_to_day
+
+from core import (
+    AGE_GROUPS,
+    AGE_THEME_COLORS,
+    GROUP_INTAKE_BINS,
+    GROUP_SYNC_SECONDS,
+    LEADERBOARD_PAGE_SIZE,
+    get_group_registry,
+    load_leaderboard,
+)
+
+def create_group_distribution_chart(counts):
+    """Create stacked bar chart of today's member intake by age group"""
+    
+    labels = [f"{lo}-{hi}ml" for lo, hi in zip(GROUP_INTAKE_BINS, GROUP_INTAKE_BINS[1:])]
+    labels.append(f"{GROUP_INTAKE_BINS[-1]}ml+")
+    
+    fig = go.Figure([
+        go.Bar(x=labels, y=counts[i], name=f"{AGE_GROUPS[name]['icon']} {AGE_GROUPS[name]['label']}",
+               marker=dict(color=AGE_THEME_COLORS[name]['primary']))
+        for i, name in enumerate(GROUP_AGE_GROUPS)
+    ])
+    
+    fig.update_layout(
+        title="Members by Today's Intake",
+        barmode='stack',
+        yaxis_title="Members",
+        height=350,
+        margin=dict(l=20, r=20, t=50, b=20)
+    )
+    
+    return fig
+
+def leaderboard_screen():
+    """Leaderboard for family/group mode"""
+    
+    st.title("🏆 Leaderboard")
+    
+    if not st.session_state.family_mode:
+        st.info("Enable Family/Group mode in Settings to view the leaderboard!")
+        return
+    
+    standings, orders, places = load_leaderboard()
+    group_overview(standings)
+    
+    st.markdown("### Today's Standings")
+    
+    users = st.session_state.leaderboard_users
+    if not users:
+        st.info("Standings appear once group members have logged water.")
+        return
+    
+    # Sort and page on the server so only one page of rows is sent
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        sort_by = st.radio(
+            "Rank by", SORT_KEYS, horizontal=True, key='leaderboard_sort',
+            format_func=lambda key: {'intake': "💧 Today's intake", 'streak': '🔥 Streak'}[key]
+        )
+    pages = page_count(len(users), LEADERBOARD_PAGE_SIZE)
+    # The group may have shrunk since the page was picked
+    if st.session_state.get('leaderboard_page', 1) > pages:
+        st.session_state.leaderboard_page = pages
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1,
+                               key='leaderboard_page') if pages > 1 else 1
+    
+    frame, _ = leaderboard_page(users, orders[sort_by], page - 1, LEADERBOARD_PAGE_SIZE,
+                                pinned=places[sort_by].get(st.session_state.user_id))
+    st.dataframe(frame, use_container_width=True, hide_index=True)
+    st.caption(f"{len(users)} members · page {page} of {pages}")
+    
+    # Streak leaderboard
+    st.markdown("### Longest Streaks")
+    top_streaks = [users[i] for i in orders['streak'][:5]]
+    
+    cols = st.columns(len(top_streaks))
+    for idx, user in enumerate(top_streaks):
+        with cols[idx]:
+            st.markdown(f"""
+            <div class='stat-card'>
+                <div style='font-size: 2rem;'>🔥</div>
+                <div style='font-weight: 600;'>{html.escape(user['name'])}</div>
+                <div style='font-size: 1.5rem; font-weight: 700;'>{user['streak']}</div>
+                <div style='opacity: 0.8;'>days</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+def group_overview(standings: dict):
+    """Aggregate stats for the user's family/workplace group"""
+    # Members served by other worker processes arrive through the shared standings
+    group = get_group_registry().refresh(st.session_state.group_code, lambda: standings, GROUP_SYNC_SECONDS)
+    today = date_to_day(st.session_state.today_date)
+    summary = group.summary(today)
+    
+    st.markdown(f"### 👥 Group: {st.session_state.group_code}")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Members", summary['members'])
+    with col2:
+        st.metric("Average Intake", f"{summary['average_intake']:.0f}ml")
+    with col3:
+        st.metric("Meeting Goal", f"{summary['pct_meeting_goal']:.0f}%")
+    
+    if summary['members']:
+        st.dataframe(
+            [
+                {
+                    'Age Group': AGE_GROUPS[name]['label'],
+                    'Members': stats['members'],
+                    'Average Intake (ml)': round(stats['average_intake']),
+                    'Meeting Goal (%)': round(stats['pct_meeting_goal']),
+                }
+                for name, stats in summary['by_age'].items()
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+        st.plotly_chart(
+            create_group_distribution_chart(group.distribution(today, GROUP_INTAKE_BINS)),
+            use_container_width=True
+        )
+    
+    st.divider()
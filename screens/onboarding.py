@@ -0,0 +1,85 @@
+"""
+Splash and onboarding screens for WaterBuddy
+Shown until a new user has picked a name, age group and daily goal
+"""
+
+import streamlit as st
+from datetime import datetime
+
+from core import AGE_GROUPS, bump_data_version, save_user_record
+
+def splash_screen():
+    """Display splash screen"""
+    st.markdown("""
+    <div style='text-align: center; padding: 4rem 2rem;'>
+        <div style='font-size: 8rem; animation: float 3s ease-in-out infinite;'>
+            💧
+        </div>
+        <h1 style='font-size: 4rem; margin-top: 2rem;'>WaterBuddy</h1>
+        <p style='font-size: 1.5rem; opacity: 0.8;'>Your personal hydration companion</p>
+        <p style='margin-top: 2rem; opacity: 0.6;'>🔒 Privacy-first • No account needed<br/>Your data stays on your device</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    if st.button("Get Started →", key="splash_start"):
+        st.session_state.screen = 'onboarding'
+        st.rerun()
+
+def onboarding_screen():
+    """Onboarding flow for new users"""
+    
+    st.markdown("<div style='text-align: center; font-size: 4rem;'>💧</div>", unsafe_allow_html=True)
+    st.title("Let's get started!")
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    
+    with col2:
+        # Name input
+        name = st.text_input("What's your name?", value=st.session_state.name, key="onboard_name")
+        
+        # Age group selection
+        st.write("### Choose your age group:")
+        
+        cols = st.columns(2)
+        for idx, (key, value) in enumerate(AGE_GROUPS.items()):
+            with cols[idx % 2]:
+                if st.button(
+                    f"{value['icon']} {value['label']}", 
+                    key=f"age_{key}",
+                    use_container_width=True
+                ):
+                    st.session_state.age_group = key
+        
+        st.write(f"**Selected:** {AGE_GROUPS[st.session_state.age_group]['label']}")
+        
+        # Daily goal
+        st.write("### Set your daily goal:")
+        daily_goal = st.slider(
+            "Daily goal (ml)",
+            min_value=1000,
+            max_value=4000,
+            value=st.session_state.daily_goal,
+            step=250,
+            key="onboard_goal"
+        )
+        st.info(f"Your daily goal: **{daily_goal}ml**")
+        
+        # Family mode
+        family_mode = st.checkbox("Enable Family/Group mode", value=st.session_state.family_mode)
+        
+        # Start button
+        st.write("")
+        if st.button("Start My Journey! 🚀", key="start_journey", use_container_width=True):
+            if name.strip():
+                st.session_state.name = name
+                st.session_state.daily_goal = daily_goal
+                st.session_state.family_mode = family_mode
+                st.session_state.screen = 'dashboard'
+                st.session_state.show_onboarding = False
+                st.session_state.join_date = datetime.now()
+                bump_data_version()
+                save_user_record()
+                st.balloons()
+                st.rerun()
+            else:
+                st.error("Please enter your name to continue!")
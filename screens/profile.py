@@ -0,0 +1,76 @@
+"""
+Profile screen for WaterBuddy
+Basic info, lifetime and streak stats, badges and the goal progress gauge
+"""
+
+import streamlit as st
+
+from core import AGE_GROUPS, BADGES, create_mascot_svg, create_progress_ring, get_derived_stats
+
+def profile_screen():
+    """User profile and statistics"""
+    
+    st.title(f"👤 {st.session_state.name}'s Profile")
+    
+    # Avatar/Mascot display
+    col_avatar, col_info = st.columns([1, 3])
+    
+    with col_avatar:
+        mascot_svg = create_mascot_svg('smile', 'large')
+        st.markdown(mascot_svg, unsafe_allow_html=True)
+        st.caption(f"Level {min(len(st.session_state.badges), 10)}")
+    
+    with col_info:
+        st.markdown("### 📋 Basic Info")
+        st.write(f"**Name:** {st.session_state.name}")
+        st.write(f"**Age Group:** {AGE_GROUPS[st.session_state.age_group]['label']}")
+        st.write(f"**Daily Goal:** {st.session_state.daily_goal}ml")
+        st.write(f"**Member Since:** {st.session_state.join_date.strftime('%B %d, %Y')}")
+        days_active = get_derived_stats()['days_active']
+        st.write(f"**Days Active:** {days_active} days")
+    
+    st.divider()
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("### 📈 Lifetime Stats")
+        st.metric("Total Water Consumed", f"{st.session_state.total_intake:,}ml")
+        st.metric("Total Glasses Logged", st.session_state.total_glasses)
+    
+    with col2:
+        st.markdown("### 🔥 Streak Stats")
+        st.metric("Current Streak", f"{st.session_state.streak} days")
+        st.metric("Best Streak", f"{st.session_state.best_streak} days")
+    
+    with col3:
+        st.markdown("### 🏆 Achievement Stats")
+        st.metric("Badges Earned", len(st.session_state.badges))
+        completion_rate = get_derived_stats()['completion_rate']
+        st.metric("Completion", f"{int(completion_rate)}%")
+    
+    st.divider()
+    
+    # Badges
+    st.markdown("### 🏆 Badges & Achievements")
+    
+    if st.session_state.badges:
+        badge_cols = st.columns(min(len(st.session_state.badges), 4))
+        for idx, badge_key in enumerate(st.session_state.badges):
+            with badge_cols[idx % 4]:
+                badge = BADGES[badge_key]
+                st.markdown(f"""
+                <div class='badge-container'>
+                    <div style='font-size: 3rem;'>{badge['emoji']}</div>
+                    <div style='font-weight: 600;'>{badge['title']}</div>
+                    <div style='font-size: 0.8rem; opacity: 0.8;'>{badge['description']}</div>
+                </div>
+                """, unsafe_allow_html=True)
+    else:
+        st.info("Start logging water to earn badges! 🌟")
+    
+    st.divider()
+    
+    # Progress ring
+    progress_pct = get_derived_stats()['progress_pct']
+    st.markdown(create_progress_ring(progress_pct), unsafe_allow_html=True)
@@ -0,0 +1,71 @@
+"""
+Reminders screen for WaterBuddy
+Reminder settings and today's reminder schedule
+"""
+
+import streamlit as st
+from datetime import datetime
+
+from waterbuddy.reminders import plan_reminders
+
+from core import get_content_catalog, local_now
+
+def reminders_screen():
+    """Smart reminder system"""
+    
+    st.title("⏰ Smart Reminders")
+    
+    st.markdown("### Reminder Settings")
+    
+    # Check if it's time for a reminder
+    if st.session_state.notifications_enabled:
+        time_since_last = (datetime.now() - st.session_state.last_reminder_time).total_seconds() / 60
+        
+        if time_since_last >= st.session_state.notification_frequency:
+            st.warning("💧 Time for your next glass of water!")
+            st.session_state.last_reminder_time = datetime.now()
+    
+    # Reminder schedule
+    st.markdown("### Today's Reminder Schedule")
+    
+    profile = st.session_state.drinking_profile
+    now = local_now()
+    reminders = plan_reminders(
+        profile,
+        st.session_state.notification_frequency,
+        st.session_state.current_intake,
+        st.session_state.daily_goal,
+        now.hour * 60 + now.minute
+    )
+    
+    start_hour, end_hour = profile.window()
+    if profile.learned:
+        st.caption(f"📈 Planned around when you usually drink ({start_hour:02d}:00 – {end_hour:02d}:00). "
+                   "Reminders you're already ahead of are skipped.")
+    else:
+        st.caption("Reminders adapt to your drinking habits after a few days of logging.")
+    
+    status_icons = {'due': '⏰', 'skip': '✅', 'passed': '🕘'}
+    status_labels = {'due': '', 'skip': 'Ahead of pace', 'passed': 'Passed'}
+    
+    cols = st.columns(max(min(len(reminders), 4), 1))
+    for idx, reminder in enumerate(reminders):
+        with cols[idx % 4]:
+            st.markdown(f"""
+            <div class='stat-card' style='opacity: {1 if reminder['status'] == 'due' else 0.5};'>
+                <div style='font-size: 2rem;'>{status_icons[reminder['status']]}</div>
+                <div style='font-weight: 600;'>{reminder['time']}</div>
+                <div style='font-size: 0.8rem;'>{status_labels[reminder['status']]}</div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    st.divider()
+    
+    # Motivational quotes
+    if st.session_state.get('reminderQuotes', True):
+        quote = get_content_catalog().daily(
+            'quotes', st.session_state.age_group, st.session_state.user_id, st.session_state.today_date,
+            st.session_state.locale
+        )
+        
+        st.info(quote)
@@ -0,0 +1,209 @@
+"""
+Settings screen for WaterBuddy
+Profile, notification and display settings, plus data export and reset
+"""
+
+import streamlit as st
+from datetime import datetime
+import json
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from waterbuddy.groups import publish_standing
+from waterbuddy.history import HISTORY_NAMESPACE
+from waterbuddy.rollover import USERS_NAMESPACE, unregister_user
+from waterbuddy.snapshots import SNAPSHOTS_NAMESPACE
+
+from core import (
+    AGE_GROUPS,
+    LANGUAGE_NAMES,
+    SESSION_IDLE_SECONDS,
+    bump_data_version,
+    get_content_catalog,
+    get_event_bus,
+    get_group_registry,
+    get_log_compactor,
+    get_rollover_job,
+    get_segment_store,
+    get_session_manager,
+    get_store,
+    get_timezone_options,
+    save_user_record,
+    sync_group_membership,
+)
+
+def settings_screen():
+    """Settings and preferences"""
+    
+    st.title("⚙️ Settings")
+    
+    tab1, tab2, tab3 = st.tabs(["Profile", "Notifications", "Preferences"])
+    
+    with tab1:
+        st.markdown("### Profile Settings")
+        
+        new_name = st.text_input("Name", value=st.session_state.name)
+        
+        st.write("**Age Group:**")
+        age_cols = st.columns(2)
+        for idx, (key, value) in enumerate(AGE_GROUPS.items()):
+            with age_cols[idx % 2]:
+                if st.button(
+                    f"{value['icon']} {value['label']}", 
+                    key=f"settings_age_{key}",
+                    use_container_width=True,
+                    type="primary" if st.session_state.age_group == key else "secondary"
+                ):
+                    st.session_state.age_group = key
+                    st.rerun()
+        
+        new_goal = st.slider(
+            "Daily Goal (ml)",
+            min_value=1000,
+            max_value=4000,
+            value=st.session_state.daily_goal,
+            step=250
+        )
+        
+        timezones = get_timezone_options(st.session_state.timezone)
+        new_timezone = st.selectbox(
+            "Timezone",
+            options=timezones,
+            index=timezones.index(st.session_state.timezone),
+            help="Your day (and streak) rolls over at midnight in this timezone"
+        )
+        
+        if st.button("Save Profile Changes", use_container_width=True):
+            st.session_state.name = new_name
+            st.session_state.daily_goal = new_goal
+            st.session_state.timezone = new_timezone
+            bump_data_version()
+            save_user_record()
+            get_rollover_job().wake()
+            st.success("Profile updated successfully!")
+            st.rerun()
+    
+    with tab2:
+        st.markdown("### Notification Settings")
+        
+        st.session_state.notifications_enabled = st.checkbox(
+            "Enable Notifications",
+            value=st.session_state.notifications_enabled
+        )
+        
+        if st.session_state.notifications_enabled:
+            st.session_state.notification_frequency = st.slider(
+                "Reminder Frequency (minutes)",
+                min_value=15,
+                max_value=180,
+                value=st.session_state.notification_frequency,
+                step=15
+            )
+            
+            st.session_state.notification_tone = st.selectbox(
+                "Notification Tone",
+                options=['gentle', 'cheerful', 'motivational', 'silent'],
+                index=['gentle', 'cheerful', 'motivational', 'silent'].index(st.session_state.notification_tone)
+            )
+        
+        st.session_state.sound_enabled = st.checkbox(
+            "Enable Sound Effects",
+            value=st.session_state.sound_enabled
+        )
+    
+    with tab3:
+        st.markdown("### Display Preferences")
+        
+        locales = get_content_catalog().locales
+        new_locale = st.selectbox(
+            "Language",
+            options=locales,
+            index=locales.index(st.session_state.locale) if st.session_state.locale in locales else 0,
+            format_func=lambda code: LANGUAGE_NAMES.get(code, code)
+        )
+        if new_locale != st.session_state.locale:
+            st.session_state.locale = new_locale
+            save_user_record()
+        
+        st.session_state.high_contrast = st.checkbox(
+            "High Contrast Mode",
+            value=st.session_state.high_contrast,
+            help="Increases contrast for better visibility"
+        )
+        
+        st.session_state.family_mode = st.checkbox(
+            "Family/Group Mode",
+            value=st.session_state.family_mode,
+            help="Enable multiple user profiles"
+        )
+        
+        if st.session_state.family_mode:
+            group_code = st.text_input(
+                "Group Code",
+                value=st.session_state.group_code,
+                help="Share your code, or enter one shared with you: everyone using the same code shares a group dashboard"
+            ).strip() or st.session_state.group_code
+            if group_code != st.session_state.group_code:
+                st.session_state.group_code = group_code
+                sync_group_membership()
+                save_user_record()
+        
+        st.divider()
+        
+        st.markdown("### Data Management")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            if st.button("Export Data", use_container_width=True):
+                data = {
+                    'name': st.session_state.name,
+                    'age_group': st.session_state.age_group,
+                    'daily_goal': st.session_state.daily_goal,
+                    'current_intake': st.session_state.current_intake,
+                    'total_intake': st.session_state.total_intake,
+                    'streak': st.session_state.streak,
+                    'badges': st.session_state.badges,
+                    'intake_history': [
+                        {
+                            'timestamp': entry['timestamp'].isoformat(),
+                            'amount': entry['amount'],
+                            'date': entry['date'].isoformat()
+                        }
+                        for entry in st.session_state.intake_history.records(st.session_state.timezone)
+                    ]
+                }
+                json_str = json.dumps(data, indent=2)
+                st.download_button(
+                    "Download JSON",
+                    data=json_str,
+                    file_name=f"waterbuddy_data_{datetime.now().strftime('%Y%m%d')}.json",
+                    mime="application/json"
+                )
+        
+        with col2:
+            if st.button("Reset All Data", use_container_width=True, type="secondary"):
+                if st.checkbox("I confirm I want to reset all data"):
+                    ctx = get_script_run_ctx()
+                    if ctx is not None:
+                        get_session_manager().forget(ctx.session_id)
+                    get_event_bus().flush()
+                    get_store().delete(USERS_NAMESPACE, st.session_state.user_id)
+                    get_store().log_delete(HISTORY_NAMESPACE, st.session_state.user_id)
+                    get_store().delete(SNAPSHOTS_NAMESPACE, st.session_state.user_id)
+                    get_log_compactor().forget(st.session_state.user_id)
+                    get_segment_store().delete(st.session_state.user_id)
+                    if st.session_state.family_mode:
+                        publish_standing(get_store(), st.session_state.group_code, st.session_state.user_id, None)
+                    get_group_registry().leave(st.session_state.user_id)
+                    unregister_user(get_store(), st.session_state.user_id)
+                    for key in list(st.session_state.keys()):
+                        del st.session_state[key]
+                    st.success("Data reset! Reloading...")
+                    st.rerun()
+        
+        with st.expander("🧠 Session Memory"):
+            ctx = get_script_run_ctx()
+            usage = get_session_manager().usage(ctx.session_id) if ctx is not None else None
+            st.caption(f"Your history and charts are moved to disk after {SESSION_IDLE_SECONDS // 60} idle minutes")
+            if usage:
+                st.metric("This session", f"{usage['bytes'] / 1024:.0f} KB")
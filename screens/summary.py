@@ -0,0 +1,46 @@
+"""
+Summary screen for WaterBuddy
+Today's totals and goal progress at a glance
+"""
+
+import streamlit as st
+
+from waterbuddy.timezones import date_to_day
+
+from core import create_progress_ring, get_derived_stats
+
+def summary_screen():
+    """End of day summary"""
+    
+    st.title("📋 Today's Summary")
+    
+    mascot = '🎉' if st.session_state.current_intake >= st.session_state.daily_goal else '😊'
+    st.markdown(f"<div style='text-align: center; font-size: 6rem;'>{mascot}</div>", unsafe_allow_html=True)
+    
+    if st.session_state.current_intake >= st.session_state.daily_goal:
+        st.success("### Fantastic work today!")
+        st.write("You've crushed your hydration goal! 🎯")
+    else:
+        st.info("### Great progress today!")
+        st.write("You've made excellent hydration progress! Keep it up!")
+    
+    st.divider()
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.metric("Today's Intake", f"{st.session_state.current_intake}ml")
+        st.metric("Goal Progress", f"{int(get_derived_stats()['progress_pct'])}%")
+    
+    with col2:
+        glasses_today = st.session_state.intake_history.count_on_day(
+            date_to_day(st.session_state.today_date), st.session_state.timezone
+        )
+        st.metric("Glasses Logged Today", glasses_today)
+        st.metric("Current Streak", f"{st.session_state.streak} days")
+    
+    st.divider()
+    
+    # Progress visualization
+    progress_pct = get_derived_stats()['progress_pct']
+    st.markdown(create_progress_ring(progress_pct), unsafe_allow_html=True)
@@ -32,6 +32,8 @@ def check_files():
     """Check if required files exist"""
     required_files = [
         "streamlit_app.py",
+        "core.py",
+        "screens/__init__.py",
         "requirements.txt",
         ".streamlit/config.toml"
     ]
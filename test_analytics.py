@@ -0,0 +1,86 @@
+"""
+Test script to verify the columnar intake log and heatmap analytics
+Run with: python test_analytics.py
+"""
+
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from waterbuddy.analytics import derived_stats, intake_heatmap, size_distribution, weekly_intake
+from waterbuddy.history import IntakeLog
+from waterbuddy.timeseries import IntakePyramid
+from waterbuddy.timezones import date_to_day
+
+
+def ts(*args):
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+def test_intake_log_grows_and_tracks_version():
+    log = IntakeLog(capacity=2)
+    for i in range(100):
+        log.append(ts(2024, 1, 1) + i * 60, 250)
+    assert len(log) == 100 and log.version == 100
+    assert log.amounts.sum() == 25000
+    assert log.tail(2)[0]['timestamp'] == datetime(2024, 1, 1, 1, 39, tzinfo=timezone.utc)
+    assert log.count_on_day(date_to_day(date(2024, 1, 1)), 'UTC') == 100
+
+
+def test_heatmap_uses_local_weekday_and_hour():
+    log = IntakeLog()
+    # Monday 2024-01-01 23:30 UTC is Tuesday 08:30 in Tokyo
+    log.append(ts(2024, 1, 1, 23, 30), 500)
+    log.append(ts(2024, 1, 2, 0, 15), 250)
+    day = date_to_day(date(2024, 1, 2))
+    heatmap = intake_heatmap(log, 'Asia/Tokyo', day, day)
+    assert heatmap.shape == (7, 24)
+    assert heatmap[1, 8] == 500 and heatmap[1, 9] == 250
+    assert heatmap.sum() == 750
+
+    utc = intake_heatmap(log, 'UTC', date_to_day(date(2024, 1, 1)), date_to_day(date(2024, 1, 1)))
+    assert utc[0, 23] == 500 and utc.sum() == 500
+
+
+def test_size_distribution_separates_custom_amounts():
+    log = IntakeLog()
+    log.extend(np.arange(6) * 3600 + int(ts(2024, 1, 1)), [250, 250, 330, 750, 400, 10])
+    day = date_to_day(date(2024, 1, 1))
+    dist = size_distribution(log, 'UTC', day, day, [250, 330, 500, 750])
+    assert dist['counts'].tolist() == [2, 1, 0, 1, 2]
+    assert dist['volume'].tolist() == [500, 330, 0, 750, 410]
+
+
+def test_derived_stats_leave_today_out_of_weekly_totals():
+    week = [{'day': name, 'intake': 1900 + 100 * i, 'goal': 2000} for i, name in enumerate('MTWTFSS')]
+    stats = derived_stats(1500, 2000, datetime(2024, 1, 1, 23, 30), ['first-glass', 'early-bird'], 8,
+                          week, date(2024, 1, 11))
+    assert stats['progress_pct'] == 75
+    assert stats['days_active'] == 10
+    assert stats['completion_rate'] == 25
+    assert stats['weekly_total'] == sum(1900 + 100 * i for i in range(6))
+    assert stats['weekly_average'] == stats['weekly_total'] / 6
+    assert stats['days_met'] == 6
+    # Joined late at night server time, which is still the previous day locally
+    stats = derived_stats(0, 2000, datetime(2024, 1, 2, 0, 30), [], 8, week, date(2024, 1, 1))
+    assert stats['days_active'] == 0
+
+
+def test_weekly_intake_reads_daily_totals():
+    today = date_to_day(date(2024, 1, 14))  # a Sunday
+    pyramid = IntakePyramid.from_days([today - 10, today - 5, today - 5, today - 1, today], [900, 1000, 750, 2100, 400])
+    week = weekly_intake(pyramid, today, 2000, 650)
+    assert [d['day'] for d in week] == ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+    # Days without drinks are zero, and today is the live total
+    assert [d['intake'] for d in week] == [0, 1750, 0, 0, 0, 2100, 650]
+    assert {d['goal'] for d in week} == {2000}
+    assert [d['intake'] for d in weekly_intake(IntakePyramid(), today, 2000, 0)] == [0] * 7
+
+
+if __name__ == "__main__":
+    test_intake_log_grows_and_tracks_version()
+    test_heatmap_uses_local_weekday_and_hour()
+    test_size_distribution_separates_custom_amounts()
+    test_derived_stats_leave_today_out_of_weekly_totals()
+    test_weekly_intake_reads_daily_totals()
+    print("✅ All analytics tests passed!")
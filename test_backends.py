@@ -0,0 +1,297 @@
+"""
+Test script to verify the shared-state storage backends
+Run with: python test_backends.py
+"""
+
+import os
+import socketserver
+import tempfile
+import threading
+from collections import defaultdict
+
+import numpy as np
+
+from waterbuddy.groups import GroupRegistry, publish_standing, read_standings
+from waterbuddy.history import IntakeLog
+from waterbuddy.resp import RespClient, RespError, encode_command, read_reply
+from waterbuddy.storage import FileStore, LogTrimmedError, RedisStore, SQLiteStore, open_store
+
+DAY = 86400
+
+
+class FakeRedis:
+    """In-memory data for the stand-in server: strings, sets and lists with per-key versions"""
+
+    def __init__(self):
+        self.data = {}
+        self.versions = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def touch(self, key):
+        self.versions[key] += 1
+
+    def run(self, name, args):
+        if name == 'PING':
+            return 'PONG'
+        if name == 'GET':
+            return self.data.get(args[0])
+        if name == 'SET':
+            self.data[args[0]] = args[1]
+            self.touch(args[0])
+            return 'OK'
+        if name == 'DEL':
+            removed = sum(self.data.pop(key, None) is not None for key in args)
+            for key in args:
+                self.touch(key)
+            return removed
+        if name in ('SADD', 'SREM'):
+            members = self.data.setdefault(args[0], set())
+            before = len(members)
+            if name == 'SADD':
+                members.update(args[1:])
+            else:
+                members.difference_update(args[1:])
+            self.touch(args[0])
+            return abs(len(members) - before)
+        if name == 'SMEMBERS':
+            return sorted(self.data.get(args[0], set()))
+        if name == 'RPUSH':
+            items = self.data.setdefault(args[0], [])
+            items.extend(args[1:])
+            self.touch(args[0])
+            return len(items)
+        if name == 'LRANGE':
+            items = self.data.get(args[0], [])
+            start, stop = int(args[1]), int(args[2])
+            stop = len(items) if stop == -1 else stop + 1
+            return items[start:stop]
+        if name == 'LLEN':
+            return len(self.data.get(args[0], []))
+        if name == 'LTRIM':
+            items = self.data.get(args[0], [])
+            start, stop = int(args[1]), int(args[2])
+            self.data[args[0]] = items[start:len(items) if stop == -1 else stop + 1]
+            self.touch(args[0])
+            return 'OK'
+        return RespError(f'ERR unknown command {name}')
+
+
+def encode_reply(value) -> bytes:
+    if isinstance(value, RespError):
+        return b'-%s\r\n' % str(value).encode()
+    if value is None:
+        return b'$-1\r\n'
+    if isinstance(value, str):
+        return b'+%s\r\n' % value.encode()
+    if isinstance(value, int):
+        return b':%d\r\n' % value
+    if isinstance(value, bytes):
+        return b'$%d\r\n%s\r\n' % (len(value), value)
+    return b'*%d\r\n' % len(value) + b''.join(encode_reply(item) for item in value)
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    """One client connection speaking RESP2, including WATCH/MULTI/EXEC"""
+
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        db = self.server.db
+        watched, queued = {}, None
+        while True:
+            try:
+                command = read_reply(self.rfile)
+            except ConnectionError:
+                return
+            name, args = command[0].decode().upper(), command[1:]
+            with db.lock:
+                if name == 'WATCH':
+                    watched.update({key: db.versions[key] for key in args})
+                    reply = 'OK'
+                elif name == 'UNWATCH':
+                    watched.clear()
+                    reply = 'OK'
+                elif name == 'MULTI':
+                    queued = []
+                    reply = 'OK'
+                elif name == 'DISCARD':
+                    queued, reply = None, 'OK'
+                    watched.clear()
+                elif name == 'EXEC':
+                    if any(db.versions[key] != version for key, version in watched.items()):
+                        reply = None
+                    else:
+                        reply = [db.run(queued_name, queued_args) for queued_name, queued_args in queued]
+                    queued = None
+                    watched.clear()
+                elif queued is not None:
+                    queued.append((name, args))
+                    reply = 'QUEUED'
+                else:
+                    reply = db.run(name, args)
+            self.wfile.write(encode_reply(reply))
+
+
+def start_server():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), RespHandler)
+    server.daemon_threads = True
+    server.db = FakeRedis()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def each_store(check):
+    """Run check(store) against every backend"""
+    server = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as root:
+            for store in (FileStore(os.path.join(root, 'files')), SQLiteStore(os.path.join(root, 'state.db')),
+                          RedisStore('redis://127.0.0.1:%d/0' % server.server_address[1])):
+                check(store)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_resp_encoding_round_trip():
+    assert encode_command('SET', 'k', 5) == b'*3\r\n$3\r\nSET\r\n$1\r\nk\r\n$1\r\n5\r\n'
+    server = start_server()
+    try:
+        client = RespClient.from_url('redis://127.0.0.1:%d' % server.server_address[1])
+        assert client.execute('PING') == 'PONG'
+        assert client.pipeline([('SET', 'a', b'\r\n'), ('GET', 'a'), ('GET', 'missing')]) == ['OK', b'\r\n', None]
+        try:
+            client.execute('BOGUS')
+        except RespError:
+            pass
+        else:
+            raise AssertionError('error reply should raise')
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_key_value_round_trip():
+    def check(store):
+        store.put('users', 'u1', {'name': 'Ana', 'total': 750})
+        store.put('users', 'u/2', [1, 2])
+        assert store.get('users', 'u1') == {'name': 'Ana', 'total': 750}
+        assert store.get('users', 'missing', 'x') == 'x'
+        assert store.update('users', 'u1', lambda value: {**value, 'total': 1000})['total'] == 1000
+        assert store.get('users', 'u1')['total'] == 1000
+        store.update('users', 'u1', lambda value: None)
+        assert store.get('users', 'u1') is None
+        assert len(store.keys('users')) == 1
+        store.delete('users', 'u/2')
+        assert store.keys('users') == []
+
+    each_store(check)
+
+
+def test_logs_append_and_read_from_offset():
+    def check(store):
+        assert store.log_read('history', 'u1') == [] and store.log_length('history', 'u1') == 0
+        assert store.log_append('history', 'u1', [(1, 250, -1), (2, 500, -1)]) == 2
+        assert store.log_append('history', 'u1', [(3, -250, 0)]) == 3
+        assert store.log_read('history', 'u1') == [(1, 250, -1), (2, 500, -1), (3, -250, 0)]
+        assert store.log_read('history', 'u1', start=2) == [(3, -250, 0)]
+        store.log_delete('history', 'u1')
+        assert store.log_length('history', 'u1') == 0
+
+    each_store(check)
+
+
+def test_trimmed_logs_keep_their_positions():
+    def check(store):
+        store.log_append('history', 'u1', [(i, 250, -1) for i in range(5)])
+        store.log_trim('history', 'u1', 3)
+        store.log_trim('history', 'u1', 2)
+        assert store.log_length('history', 'u1') == 5
+        assert store.log_read('history', 'u1', 3) == [(3, 250, -1), (4, 250, -1)]
+        try:
+            store.log_read('history', 'u1', 1)
+        except LogTrimmedError:
+            pass
+        else:
+            raise AssertionError('reading trimmed positions should fail')
+        assert store.log_append('history', 'u1', [(5, 500, -1)]) == 6
+        store.log_trim('history', 'u1', 6)
+        assert store.log_length('history', 'u1') == 6 and store.log_read('history', 'u1', 6) == []
+        store.log_delete('history', 'u1')
+        assert store.log_length('history', 'u1') == 0 and store.log_read('history', 'u1') == []
+
+    each_store(check)
+
+
+def test_concurrent_updates_are_not_lost():
+    def check(store):
+        def bump():
+            for _ in range(25):
+                store.update('counters', 'n', lambda value: (value or 0) + 1)
+
+        threads = [threading.Thread(target=bump) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert store.get('counters', 'n') == 100, type(store).__name__
+
+    each_store(check)
+
+
+def test_open_store_picks_backend_from_url():
+    with tempfile.TemporaryDirectory() as root:
+        assert isinstance(open_store(root), FileStore)
+        assert isinstance(open_store('file://' + root), FileStore)
+        assert isinstance(open_store('sqlite:///' + os.path.join(root, 'a.db')), SQLiteStore)
+    assert isinstance(open_store('redis://localhost:6379/0'), RedisStore)
+
+
+def test_log_rebuilds_intake_history():
+    log = IntakeLog()
+    rows = []
+    for timestamp, amount in [(10 * DAY, 250), (10 * DAY + 60, 500), (11 * DAY, 330)]:
+        log.append(timestamp, amount)
+        rows.append(IntakeLog.row(timestamp, amount))
+    log.amend(1, -250, 11 * DAY + 60)
+    rows.append(IntakeLog.row(11 * DAY + 60, -250, 1))
+
+    rebuilt = IntakeLog.from_entries(rows)
+    assert rebuilt.timestamps.tolist() == log.timestamps.tolist()
+    assert rebuilt.amounts.tolist() == [250, 250, 330]
+    assert np.array_equal(rebuilt.entries()['refs'], log.entries()['refs'])
+    assert len(IntakeLog.from_entries([])) == 0
+
+
+def test_group_registry_syncs_from_shared_standings():
+    with tempfile.TemporaryDirectory() as root:
+        store = FileStore(root)
+        entry = {'name': 'A', 'intake': 2100, 'streak': 1, 'day': 5, 'goal': 2000, 'age_group': 'adult'}
+        publish_standing(store, 'office', 'a', entry)
+        publish_standing(store, 'office', 'b', {**entry, 'intake': 500, 'age_group': 'teen'})
+
+        clock = [0.0]
+        registry = GroupRegistry(clock=lambda: clock[0])
+        load = lambda: read_standings(store, 'office')
+        group = registry.refresh('office', load, max_age=30)
+        assert group.summary(5)['members'] == 2 and group.summary(5)['pct_meeting_goal'] == 50
+
+        # Another worker removes b; this one only notices after max_age
+        publish_standing(store, 'office', 'b', None)
+        assert registry.refresh('office', load, max_age=30).summary(5)['members'] == 2
+        clock[0] = 31
+        assert registry.refresh('office', load, max_age=30).summary(5)['members'] == 1
+        assert 'b' not in registry.membership
+
+
+if __name__ == "__main__":
+    test_resp_encoding_round_trip()
+    test_key_value_round_trip()
+    test_logs_append_and_read_from_offset()
+    test_trimmed_logs_keep_their_positions()
+    test_concurrent_updates_are_not_lost()
+    test_open_store_picks_backend_from_url()
+    test_log_rebuilds_intake_history()
+    test_group_registry_syncs_from_shared_standings()
+    print("✅ All storage backend tests passed!")
@@ -0,0 +1,65 @@
+"""
+Test script to verify client-buffered intake batches
+Run with: python test_buffering.py
+"""
+
+from waterbuddy.buffering import MAX_BATCH_TAPS, SyncedIds, parse_batch
+
+NOW = 1_700_000_000.0
+
+
+def tap(client_id, seconds_ago, amount=250):
+    return {'id': client_id, 'ts': (NOW - seconds_ago) * 1000, 'amount': amount}
+
+
+def test_taps_come_back_oldest_first():
+    batch = {'batch': 'b1', 'taps': [tap('b', 10), tap('a', 60, 500), tap('c', 5, 330)]}
+    taps = parse_batch(batch, NOW)
+    assert [t.client_id for t in taps] == ['a', 'b', 'c']
+    assert [t.amount for t in taps] == [500, 250, 330]
+    assert taps[0].timestamp == NOW - 60
+
+
+def test_malformed_taps_are_dropped():
+    assert parse_batch(None, NOW) == [] and parse_batch({'taps': 'x'}, NOW) == []
+    batch = {'taps': [
+        tap('ok', 1), {'id': 'no-ts', 'amount': 250}, tap('zero', 1, 0), tap('huge', 1, 5000),
+        {'id': 'text', 'ts': 'soon', 'amount': 250}, tap('', 1), 'junk',
+    ]}
+    assert [t.client_id for t in parse_batch(batch, NOW)] == ['ok']
+    assert len(parse_batch({'taps': [tap(str(i), 1) for i in range(MAX_BATCH_TAPS + 5)]}, NOW)) == MAX_BATCH_TAPS
+
+
+def test_timestamps_are_clamped_for_the_log():
+    batch = {'taps': [tap('future', -3600), tap('ancient', 30 * 86400), tap('early', 120), tap('late', 30)]}
+    taps = {t.client_id: t.timestamp for t in parse_batch(batch, NOW, after=NOW - 60, max_age=3600)}
+    # Nothing before the latest logged drink, nothing in the future, and still in order
+    assert taps['ancient'] == taps['early'] == NOW - 60
+    assert taps['late'] == NOW - 30
+    assert taps['future'] == NOW
+
+
+def test_non_finite_timestamps_are_dropped():
+    batch = {'taps': [
+        tap('ok', 1), {'id': 'nan', 'ts': 'nan', 'amount': 250}, {'id': 'inf', 'ts': 'inf', 'amount': 250},
+        {'id': '-inf', 'ts': float('-inf'), 'amount': 250}, {'id': 'big', 'ts': 1, 'amount': float('inf')},
+    ]}
+    taps = parse_batch(batch, NOW)
+    assert [t.client_id for t in taps] == ['ok'] and taps[0].timestamp == NOW - 1
+
+
+def test_synced_ids_keep_the_latest():
+    synced = SyncedIds(kept=3)
+    synced.add(['a', 'b'])
+    synced.add(['c', 'd'])
+    assert 'a' not in synced and 'd' in synced
+    assert synced.to_list() == ['b', 'c', 'd']
+
+
+if __name__ == "__main__":
+    test_taps_come_back_oldest_first()
+    test_malformed_taps_are_dropped()
+    test_timestamps_are_clamped_for_the_log()
+    test_non_finite_timestamps_are_dropped()
+    test_synced_ids_keep_the_latest()
+    print("✅ All intake buffering tests passed!")
@@ -0,0 +1,63 @@
+"""
+Test script to verify the Plotly and Vega-Lite chart backends
+Run with: python test_charts.py
+"""
+
+import json
+
+import numpy as np
+
+from waterbuddy.charts import history_figure, history_frame, history_spec, weekly_figure, weekly_frame, weekly_spec
+from waterbuddy.timeseries import IntakePyramid
+
+WEEK = [{'day': day, 'intake': ml, 'goal': 2000}
+        for day, ml in zip(['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'], [1800, 2100, 2000, 0, 2500, 1200, 900])]
+
+
+def sample_pyramid():
+    days = np.arange(19000, 19400)
+    return IntakePyramid.from_days(days, 1000 + (days % 7) * 200)
+
+
+def test_weekly_frame_and_spec():
+    frame = weekly_frame(WEEK)
+    assert frame['day'].tolist()[0] == 'Mon' and frame['intake'].dtype == np.int32
+    assert frame['met'].tolist() == [False, True, True, False, True, False, False]
+    spec = weekly_spec('#70D6FF', '#1E9BC7')
+    assert 'data' not in spec and json.dumps(spec)
+    assert spec['layer'][0]['encoding']['color']['scale']['range'] == ['#70D6FF', '#1E9BC7']
+
+
+def test_history_frame_matches_series():
+    pyramid = sample_pyramid()
+    series = pyramid.series(19100, 19399)
+    frame = history_frame(series)
+    assert len(frame) == len(series['start']) and series['level'] == 'day'
+    assert str(frame['date'].iloc[0].date()) == '2022-04-18'
+    assert frame['sum'].tolist() == series['sum'].tolist()
+    assert np.allclose(frame['mean'], series['mean'])
+
+
+def test_whiskers_only_above_day_level():
+    pyramid = sample_pyramid()
+    day_spec = history_spec('day', 2000, '#70D6FF', '#1E9BC7')
+    week_spec = history_spec(pyramid.series(19000, 19399)['level'], 2000, '#70D6FF', '#1E9BC7')
+    assert len(day_spec['layer']) == 2 and len(week_spec['layer']) == 3
+    assert day_spec['layer'][-1]['encoding']['y'] == {'datum': 2000}
+    assert week_spec['title'] == 'Hydration History (weekly view)'
+
+
+def test_plotly_figures_show_the_same_data():
+    fig = weekly_figure(WEEK, '#70D6FF', '#1E9BC7')
+    assert list(fig.data[1].y) == [d['intake'] for d in WEEK]
+    series = sample_pyramid().series(19000, 19399)
+    fig = history_figure(series, 2000, '#70D6FF', '#1E9BC7')
+    assert len(fig.data[0].x) == len(series['start']) and fig.data[0].error_y.array is not None
+
+
+if __name__ == "__main__":
+    test_weekly_frame_and_spec()
+    test_history_frame_matches_series()
+    test_whiskers_only_above_day_level()
+    test_plotly_figures_show_the_same_data()
+    print("✅ All chart backend tests passed!")
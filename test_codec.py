@@ -0,0 +1,90 @@
+"""
+Test script to verify the compact intake event codec
+Run with: python test_codec.py
+"""
+
+import pickle
+
+import numpy as np
+
+from waterbuddy.codec import (
+    CodecError,
+    decode_events,
+    decode_varints,
+    encode_events,
+    encode_varints,
+    unzigzag,
+    zigzag,
+)
+from waterbuddy.history import IntakeLog
+
+
+def make_columns(n=10_000, seed=3):
+    rng = np.random.default_rng(seed)
+    timestamps = 1_700_000_000 + np.cumsum(rng.integers(0, 6 * 3600, n))
+    amounts = rng.choice([250, 330, 500, 750, 200, 1200], n, p=[0.4, 0.2, 0.2, 0.1, 0.05, 0.05])
+    refs = np.full(n, -1)
+    fixes = np.sort(rng.choice(np.arange(10, n), 50, replace=False))
+    refs[fixes] = fixes - 5
+    amounts[fixes] = -100
+    return timestamps, amounts, refs
+
+
+def test_varints_and_zigzag_round_trip():
+    values = np.array([0, 1, 127, 128, 16383, 16384, 2 ** 35, 2 ** 63, 2 ** 64 - 1], dtype=np.uint64)
+    encoded = encode_varints(values)
+    assert len(encode_varints(np.array([127, 128], dtype=np.uint64))) == 3
+    assert decode_varints(encoded).tolist() == values.tolist()
+    signed = np.array([0, -1, 1, -64, 63, -2 ** 63, 2 ** 63 - 1])
+    assert zigzag(signed)[:5].tolist() == [0, 1, 2, 127, 126]
+    assert unzigzag(zigzag(signed)).tolist() == signed.tolist()
+
+
+def test_events_round_trip_in_a_few_bytes_each():
+    timestamps, amounts, refs = make_columns()
+    blob = encode_events(timestamps, amounts, refs, block_events=1000)
+    columns = decode_events(blob)
+    assert columns['timestamps'].tolist() == timestamps.tolist()
+    assert columns['amounts'].tolist() == amounts.tolist()
+    assert columns['refs'].tolist() == refs.tolist()
+    assert len(blob) / len(timestamps) < 5
+
+    # Timestamps that go backwards and logs without corrections
+    back = decode_events(encode_events([100, 50, 75], [250, 333, 750]))
+    assert back['timestamps'].tolist() == [100, 50, 75] and back['refs'].tolist() == [-1, -1, -1]
+    assert len(decode_events(encode_events([], []))['timestamps']) == 0
+
+
+def test_corrupted_blocks_are_rejected():
+    timestamps, amounts, refs = make_columns(3000)
+    blob = bytearray(encode_events(timestamps, amounts, refs, block_events=1000))
+    for damaged in (blob[:-1], blob[:10], blob[:40] + bytes([blob[40] ^ 1]) + blob[41:], b'XX' + blob[2:]):
+        try:
+            decode_events(bytes(damaged))
+        except CodecError:
+            pass
+        else:
+            raise AssertionError('damaged data should not decode')
+
+
+def test_intake_log_pickles_through_the_codec():
+    timestamps, amounts, _ = make_columns(2000)
+    log = IntakeLog()
+    log.extend(timestamps, np.abs(amounts))
+    log.amend(7, -250 if log.amount_of(7) >= 250 else -log.amount_of(7), timestamps[-1] + 60)
+    blob = pickle.dumps(log)
+    restored = pickle.loads(blob)
+    assert len(blob) < 6 * log.entries()['timestamps'].size + 200
+    assert restored.version == log.version and restored.corrections == 1
+    assert restored.timestamps.tolist() == log.timestamps.tolist()
+    assert restored.amounts.tolist() == log.amounts.tolist()
+    restored.append(timestamps[-1] + 120, 500)
+    assert len(restored) == len(log) + 1
+
+
+if __name__ == "__main__":
+    test_varints_and_zigzag_round_trip()
+    test_events_round_trip_in_a_few_bytes_each()
+    test_corrupted_blocks_are_rejected()
+    test_intake_log_pickles_through_the_codec()
+    print("✅ All codec tests passed!")
@@ -0,0 +1,28 @@
+"""
+Test script to verify the Streamlit server config is picked up
+Run with: python test_config.py
+"""
+
+import os
+
+from streamlit import config
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_static_serving_is_enabled():
+    # Streamlit only reads .streamlit/config.toml under the directory it is started from
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        config.get_config_options(force_reparse=True)
+        assert config.get_option('server.enableStaticServing') is True
+        assert os.path.exists(os.path.join(ROOT, 'static', 'waterbuddy.css'))
+    finally:
+        os.chdir(cwd)
+        config.get_config_options(force_reparse=True)
+
+
+if __name__ == "__main__":
+    test_static_serving_is_enabled()
+    print("✅ All config tests passed!")
@@ -0,0 +1,188 @@
+"""
+Test script to verify edit/undo of logged drinks via compensating entries
+Run with: python test_corrections.py
+"""
+
+import pickle
+import tempfile
+from datetime import date, timedelta
+
+import numpy as np
+
+from waterbuddy.forecast import PaceForecaster
+from waterbuddy.history import HISTORY_NAMESPACE, IntakeLog
+from waterbuddy.reminders import DrinkingProfile
+from waterbuddy.rollover import ROLLUPS_NAMESPACE, USERS_NAMESPACE, correct_closed_day, restreak
+from waterbuddy.snapshots import durable_drink, restore_history, take_snapshot
+from waterbuddy.storage import FileStore
+from waterbuddy.timeseries import IntakePyramid
+
+DAY = 86400
+TODAY = date(2024, 3, 20)
+
+
+def make_log():
+    log = IntakeLog()
+    log.extend([10 * DAY + 9 * 3600, 10 * DAY + 12 * 3600, 11 * DAY + 8 * 3600], [250, 500, 330])
+    return log
+
+
+def test_amend_appends_compensating_entries():
+    log = make_log()
+    version = log.version
+    log.amend(1, -250, 12 * DAY)
+    log.amend(0, -250, 12 * DAY + 60)
+
+    # Drinks show their corrected amounts; the undone one is gone
+    assert log.timestamps.tolist() == [10 * DAY + 12 * 3600, 11 * DAY + 8 * 3600]
+    assert log.amounts.tolist() == [250, 330]
+    assert len(log) == 2 and log.version == version + 2
+    assert [entry['index'] for entry in log.tail(5)] == [2, 1]
+
+    # The raw log keeps everything, in time order
+    raw = log.entries()
+    assert raw['amounts'].tolist() == [250, 500, 330, -250, -250]
+    assert raw['refs'].tolist() == [-1, -1, -1, 1, 0]
+    assert np.all(np.diff(raw['timestamps']) >= 0)
+
+    # Compensating entries and over-corrections are refused
+    for bad in (lambda: log.amend(3, 10, 13 * DAY), lambda: log.amend(2, -400, 13 * DAY)):
+        try:
+            bad()
+        except (IndexError, ValueError):
+            pass
+        else:
+            raise AssertionError('correction should have been refused')
+
+
+def test_old_pickled_logs_gain_correction_columns():
+    log = make_log()
+    state = dict(log.__dict__)
+    for key in ('_refs', '_net', 'corrections', '_drinks_version', '_drinks'):
+        del state[key]
+    old = IntakeLog.__new__(IntakeLog)
+    old.__setstate__(state)
+    restored = pickle.loads(pickle.dumps(old))
+    restored.amend(2, 170, 12 * DAY)
+    assert restored.amounts.tolist() == [250, 500, 500]
+
+
+def test_incremental_adjustments_match_rebuilds():
+    log = make_log()
+    pyramid = IntakePyramid.from_log(log, 'UTC')
+    profile = DrinkingProfile.from_log(log, 'UTC', today=40)
+    log.amend(1, -500, 12 * DAY)
+    pyramid.add(10, -500)
+    profile.adjust(10, 12, -500)
+
+    rebuilt_pyramid = IntakePyramid.from_log(log, 'UTC')
+    assert pyramid.days.tolist() == rebuilt_pyramid.days.tolist()
+    assert pyramid.levels['week'].sum.tolist() == rebuilt_pyramid.levels['week'].sum.tolist()
+    assert np.allclose(profile.weights, DrinkingProfile.from_log(log, 'UTC', today=40).weights)
+
+    totals = [1800, 2100, 0, 2500, 1900, 700]
+    for offset in range(len(totals)):
+        model = PaceForecaster.from_daily_totals(totals, today=105)
+        model.adjust(100 + offset, -300)
+        corrected = list(totals)
+        corrected[offset] -= 300
+        refit = PaceForecaster.from_daily_totals(corrected, today=105)
+        assert np.isclose(model.daily_mean, refit.daily_mean), offset
+        assert model.day_total == refit.day_total
+
+
+def make_rollups(met_days):
+    rollups = {}
+    for back in range(1, 15):
+        day = TODAY - timedelta(days=back)
+        met = back in met_days
+        rollups[day] = {'date': day, 'intake': 2000 if met else 1000, 'goal': 2000, 'met': met}
+    return rollups
+
+
+def test_restreak_walks_only_the_affected_run():
+    # Met the last 5 days and days 7-9 back; day 6 back was missed
+    rollups = make_rollups({1, 2, 3, 4, 5, 7, 8, 9})
+    missed = TODAY - timedelta(days=6)
+    rollups[missed]['met'] = True
+    assert restreak(rollups, missed, TODAY, 5, 5) == (9, 9)
+
+    # Breaking the joined run splits it again
+    rollups[missed]['met'] = False
+    assert restreak(rollups, missed, TODAY, 9, 9) == (5, 5)
+
+    # Breaking a run that does not reach today leaves the streak alone
+    old = TODAY - timedelta(days=8)
+    rollups[old]['met'] = False
+    assert restreak(rollups, old, TODAY, 5, 5) == (5, 5)
+
+
+def test_correct_closed_day_updates_rollup_streak_and_badges():
+    with tempfile.TemporaryDirectory() as root:
+        store = FileStore(root)
+        store.put(ROLLUPS_NAMESPACE, 'u1', make_rollups({1, 2, 3, 4, 5, 6, 7}))
+        yesterday = TODAY - timedelta(days=1)
+
+        streak, best, badges = correct_closed_day(
+            store, 'u1', yesterday, -500, TODAY, 7, 7, ['first-glass', 'week-streak']
+        )
+        assert store.get(ROLLUPS_NAMESPACE, 'u1')[yesterday]['intake'] == 1500
+        assert (streak, best) == (0, 6)
+        assert badges == ['first-glass']
+
+        streak, best, badges = correct_closed_day(store, 'u1', yesterday, 500, TODAY, streak, best, badges)
+        assert (streak, best) == (7, 7)
+        assert badges == ['first-glass', 'week-streak']
+
+        # A correction that keeps the goal status only changes the total
+        assert correct_closed_day(store, 'u1', yesterday, 100, TODAY, 7, 7, badges) == (7, 7, badges)
+        assert store.get(ROLLUPS_NAMESPACE, 'u1')[yesterday]['intake'] == 2100
+
+
+def test_replay_voids_corrections_that_do_not_fit():
+    rows = [IntakeLog.row(10 * DAY, 250), IntakeLog.row(10 * DAY + 60, 500),
+            # More than is left of drink 0, then a ref to a correction, then a valid undo
+            IntakeLog.row(10 * DAY + 120, -500, 0), IntakeLog.row(10 * DAY + 180, -10, 2),
+            IntakeLog.row(10 * DAY + 240, -500, 1), IntakeLog.row(10 * DAY + 300, 330)]
+    rebuilt = IntakeLog.from_entries(rows)
+    assert rebuilt.amounts.tolist() == [250, 330] and rebuilt.end == len(rows)
+    assert rebuilt.entries()['refs'].tolist() == [-1, -1, 2, 3, 1, -1]
+
+    with tempfile.TemporaryDirectory() as root:
+        store = FileStore(root)
+        store.put(USERS_NAMESPACE, 'u1', {'timezone': 'UTC'})
+        store.log_append(HISTORY_NAMESPACE, 'u1', rows[:2])
+        take_snapshot(store, 'u1', 11)
+        store.log_append(HISTORY_NAMESPACE, 'u1', rows[2:])
+        state = restore_history(store, 'u1', 'UTC', 11)
+        assert state['history'].amounts.tolist() == [250, 330] and state['history'].end == len(rows)
+        assert state['total_intake'] == 580 and state['total_glasses'] == 2
+
+
+def test_corrections_find_the_drink_in_the_shared_log():
+    with tempfile.TemporaryDirectory() as root:
+        store = FileStore(root)
+        store.put(USERS_NAMESPACE, 'u1', {'timezone': 'UTC'})
+        # Tab A logs 250 ml, then tab B (restored before it) logs 500 ml as its drink 0
+        store.log_append(HISTORY_NAMESPACE, 'u1', [IntakeLog.row(10 * DAY, 250), IntakeLog.row(10 * DAY + 60, 500)])
+        assert durable_drink(store, 'u1', 0, 10 * DAY + 60, 500, -500) == 1
+        store.log_append(HISTORY_NAMESPACE, 'u1', [IntakeLog.row(10 * DAY + 120, -500, 1)])
+        # Once undone it cannot be undone again
+        assert durable_drink(store, 'u1', 0, 10 * DAY + 60, 500, -500) is None
+        assert durable_drink(store, 'u1', 0, 10 * DAY, 250, -250) == 0
+
+        # The same from a snapshot that covers the drinks
+        take_snapshot(store, 'u1', 11)
+        assert durable_drink(store, 'u1', 0, 10 * DAY + 60, 500, -500) is None
+        assert durable_drink(store, 'u1', 0, 10 * DAY, 250, -250) == 0
+
+
+if __name__ == "__main__":
+    test_amend_appends_compensating_entries()
+    test_old_pickled_logs_gain_correction_columns()
+    test_incremental_adjustments_match_rebuilds()
+    test_restreak_walks_only_the_affected_run()
+    test_correct_closed_day_updates_rollup_streak_and_badges()
+    test_replay_voids_corrections_that_do_not_fit()
+    test_corrections_find_the_drink_in_the_shared_log()
+    print("✅ All correction tests passed!")
@@ -0,0 +1,95 @@
+"""
+Test script to verify the intake event bus and its dispatchers
+Run with: python test_events.py
+"""
+
+import asyncio
+import threading
+import time
+
+from waterbuddy.events import (
+    INTAKE_LOGGED,
+    AsyncioDispatcher,
+    EventBus,
+    IntakeEvent,
+    SyncDispatcher,
+    ThreadPoolDispatcher,
+)
+
+
+def make_event(amount: int) -> IntakeEvent:
+    return IntakeEvent('user-1', 1_700_000_000.0, amount, 19675, 8)
+
+
+def test_inline_handlers_run_in_order_before_publish_returns():
+    bus = EventBus()
+    calls = []
+    bus.subscribe(INTAKE_LOGGED, lambda e: calls.append(('totals', e.amount)))
+    bus.subscribe(INTAKE_LOGGED, lambda e: calls.append(('badges', e.amount)))
+    bus.publish(INTAKE_LOGGED, make_event(250))
+    assert calls == [('totals', 250), ('badges', 250)]
+    assert bus.subscribers(INTAKE_LOGGED) == (2, 0)
+    bus.publish('other.topic', make_event(1))
+    assert len(calls) == 2
+
+
+def test_deferred_handlers_keep_publish_order_per_handler():
+    for dispatcher in (SyncDispatcher(), ThreadPoolDispatcher(max_workers=4), AsyncioDispatcher()):
+        bus = EventBus(dispatcher)
+        seen = []
+        bus.subscribe(INTAKE_LOGGED, lambda e: (time.sleep(0.001), seen.append(e.amount)), deferred=True)
+        for amount in range(50):
+            bus.publish(INTAKE_LOGGED, make_event(amount))
+        assert bus.flush(timeout=5)
+        assert seen == list(range(50)), type(dispatcher).__name__
+        assert bus.pending == 0
+        bus.close()
+
+
+def test_slow_deferred_consumer_does_not_block_publisher():
+    bus = EventBus(ThreadPoolDispatcher())
+    release = threading.Event()
+    done = []
+    bus.subscribe(INTAKE_LOGGED, lambda e: (release.wait(5), done.append(e)), deferred=True)
+    start = time.perf_counter()
+    bus.publish(INTAKE_LOGGED, make_event(250))
+    assert time.perf_counter() - start < 0.5
+    assert not done and bus.pending == 1
+    release.set()
+    assert bus.flush(timeout=5)
+    assert len(done) == 1
+    bus.close()
+
+
+def test_coroutine_consumers_and_failures():
+    bus = EventBus(AsyncioDispatcher())
+    seen = []
+
+    async def analytics(event):
+        await asyncio.sleep(0)
+        seen.append(event.amount)
+
+    def broken(event):
+        raise ValueError('boom')
+
+    bus.subscribe(INTAKE_LOGGED, analytics, deferred=True)
+    bus.subscribe(INTAKE_LOGGED, broken, deferred=True)
+    bus.publish(INTAKE_LOGGED, make_event(330))
+    bus.publish(INTAKE_LOGGED, make_event(500))
+    assert bus.flush(timeout=5)
+    assert seen == [330, 500]
+    assert bus.failures == 2 and isinstance(bus.last_error, ValueError)
+
+    bus.unsubscribe(INTAKE_LOGGED, broken)
+    bus.publish(INTAKE_LOGGED, make_event(750))
+    assert bus.flush(timeout=5)
+    assert bus.failures == 2 and seen[-1] == 750
+    bus.close()
+
+
+if __name__ == "__main__":
+    test_inline_handlers_run_in_order_before_publish_returns()
+    test_deferred_handlers_keep_publish_order_per_handler()
+    test_slow_deferred_consumer_does_not_block_publisher()
+    test_coroutine_consumers_and_failures()
+    print("✅ All event bus tests passed!")
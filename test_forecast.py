@@ -0,0 +1,64 @@
+"""
+Test script to verify intake pace forecasting
+Run with: python test_forecast.py
+"""
+
+import numpy as np
+
+from waterbuddy.forecast import PaceForecaster
+from waterbuddy.reminders import DrinkingProfile
+
+
+def steady_profile():
+    profile = DrinkingProfile()
+    for day in range(7):
+        for hour in range(8, 20):
+            profile.observe(100 + day, hour, 200)
+    return profile
+
+
+def test_batch_fit_matches_online_updates():
+    totals = [1800, 2200, 0, 2500, 2000, 900]
+    online = PaceForecaster()
+    for day, total in enumerate(totals):
+        online.observe(day, total)
+    batch = PaceForecaster.from_daily_totals(totals, today=len(totals) - 1)
+    assert np.isclose(online.daily_mean, batch.daily_mean)
+    assert batch.day_total == 900
+
+
+def test_on_pace_user_reaches_goal_late_afternoon():
+    model = PaceForecaster.from_daily_totals([2400] * 8, today=107)
+    profile = steady_profile()
+    # 14:00 with half the usual volume logged: right on pace
+    forecast = model.predict(profile, 107, current_intake=1200, daily_goal=2000, now_minute=14 * 60)
+    assert abs(forecast['end_of_day'] - 2400) < 50
+    assert 17 * 60 <= forecast['goal_minute'] <= 18 * 60
+    assert not forecast['reached']
+
+
+def test_behind_pace_user_misses_goal_and_prediction_is_cached():
+    model = PaceForecaster.from_daily_totals([2000] * 8, today=107)
+    profile = steady_profile()
+    forecast = model.predict(profile, 107, current_intake=200, daily_goal=2000, now_minute=16 * 60)
+    assert forecast['goal_minute'] is None and forecast['end_of_day'] < 2000
+    assert model.predict(profile, 107, current_intake=200, daily_goal=2000, now_minute=16 * 60) is forecast
+
+    model.observe(107, 250)
+    assert model.predict(profile, 107, current_intake=450, daily_goal=2000, now_minute=16 * 60) is not forecast
+
+
+def test_new_day_folds_previous_total():
+    model = PaceForecaster()
+    model.observe(1, 2000)
+    model.close_days(4)
+    # day 1 seeds the mean, then two skipped zero days decay it
+    assert np.isclose(model.daily_mean, 2000 * (1 - model.alpha) ** 2)
+
+
+if __name__ == "__main__":
+    test_batch_fit_matches_online_updates()
+    test_on_pace_user_reaches_goal_late_afternoon()
+    test_behind_pace_user_misses_goal_and_prediction_is_cached()
+    test_new_day_folds_previous_total()
+    print("✅ All forecast tests passed!")
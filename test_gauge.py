@@ -0,0 +1,42 @@
+"""
+Test script to verify the SVG progress gauge
+Run with: python test_gauge.py
+"""
+
+import re
+import xml.etree.ElementTree as ET
+
+from waterbuddy.gauge import gauge_svg, hex_to_rgba
+
+COLORS = ('#70D6FF', '#1E9BC7', '#FFB3A7')
+
+
+def test_gauge_is_small_well_formed_svg():
+    svg = gauge_svg(63, *COLORS)
+    root = ET.fromstring(svg)
+    assert root.tag.endswith('svg') and '\n' not in svg
+    assert len(svg) < 1024
+    assert '63%' in svg and 'Daily Goal Progress' in svg
+
+
+def test_theme_steps_and_bar():
+    svg = gauge_svg(40, *COLORS)
+    assert hex_to_rgba('#1E9BC7') == 'rgba(30,155,199,0.2)'
+    for color in (hex_to_rgba(COLORS[1]), hex_to_rgba(COLORS[0]), hex_to_rgba(COLORS[2])):
+        assert f'stroke="{color}"' in svg
+    # Three step bands plus the bar; an empty gauge has no bar
+    assert len(re.findall(r'<path d="M[^"]*A', svg)) == 4
+    assert len(re.findall(r'<path d="M[^"]*A', gauge_svg(0, *COLORS))) == 3
+
+
+def test_percent_is_clamped_and_cached():
+    assert '100%' in gauge_svg(250, *COLORS) and '0%' in gauge_svg(-5, *COLORS)
+    assert gauge_svg(63, *COLORS) is gauge_svg(63, *COLORS)
+    assert gauge_svg(63, *COLORS) != gauge_svg(63, '#FF6B9D', '#FFE66D', '#4ECDC4')
+
+
+if __name__ == "__main__":
+    test_gauge_is_small_well_formed_svg()
+    test_theme_steps_and_bar()
+    test_percent_is_clamped_and_cached()
+    print("✅ All progress gauge tests passed!")
@@ -0,0 +1,110 @@
+"""
+Test script to verify incremental group analytics
+Run with: python test_groups.py
+"""
+
+import numpy as np
+
+from waterbuddy.groups import GROUP_AGE_GROUPS, GroupAnalytics, GroupRegistry, new_group_code
+
+
+def brute_force(members, day):
+    """Reference aggregates from plain per-member dicts"""
+    rows = list(members.values())
+    intakes = np.array([m['days'].get(day, 0) for m in rows])
+    met = np.array([m['days'].get(day, 0) >= m['goal'] for m in rows])
+    by_age = {}
+    for name in GROUP_AGE_GROUPS:
+        mask = np.array([m['age'] == name for m in rows], dtype=bool)
+        by_age[name] = (int(mask.sum()), float(intakes[mask].mean()) if mask.any() else 0.0,
+                        float(100 * met[mask].mean()) if mask.any() else 0.0)
+    return len(rows), float(intakes.mean()) if rows else 0.0, float(100 * met.mean()) if rows else 0.0, by_age
+
+
+def test_incremental_aggregates_match_brute_force():
+    rng = np.random.default_rng(7)
+    group = GroupAnalytics(window_days=7, capacity=4)
+    members = {}
+    day = 100
+    for step in range(3000):
+        op = rng.random()
+        user = f'u{rng.integers(60)}'
+        if op < 0.1:
+            age = GROUP_AGE_GROUPS[rng.integers(4)]
+            goal = int(rng.choice([1500, 2000, 2500]))
+            group.join(user, age, goal, day)
+            members.setdefault(user, {'days': {}})
+            members[user].update(age=age, goal=goal)
+        elif op < 0.13:
+            group.leave(user)
+            members.pop(user, None)
+        elif op < 0.15:
+            day += int(rng.integers(1, 3))
+        elif user in members:
+            when = day - int(rng.integers(0, 3))
+            amount = int(rng.choice([250, 330, 500, 750, -250]))
+            amount = max(amount, -members[user]['days'].get(when, 0))
+            group.record(user, when, amount)
+            members[user]['days'][when] = members[user]['days'].get(when, 0) + amount
+
+        if step % 100 == 0:
+            expected_count, expected_avg, expected_pct, expected_by_age = brute_force(members, day)
+            summary = group.summary(day)
+            assert summary['members'] == expected_count
+            assert np.isclose(summary['average_intake'], expected_avg)
+            assert np.isclose(summary['pct_meeting_goal'], expected_pct)
+            for name, (count, avg, pct) in expected_by_age.items():
+                stats = summary['by_age'][name]
+                assert stats['members'] == count
+                assert np.isclose(stats['average_intake'], avg) and np.isclose(stats['pct_meeting_goal'], pct)
+    assert len(group) == len(members)
+
+
+def test_window_drops_old_days_and_distribution_bins():
+    group = GroupAnalytics(window_days=3)
+    group.join('a', 'adult', 2000, day=10, intake_today=2100)
+    group.join('b', 'teen', 2000, day=10, intake_today=600)
+    group.join('c', 'adult', 2000, day=10)
+    assert group.summary(10)['pct_meeting_goal'] == 100 / 3
+
+    counts = group.distribution(10, [0, 500, 1000, 2000])
+    assert counts[GROUP_AGE_GROUPS.index('adult')].tolist() == [1, 0, 0, 1]
+    assert counts[GROUP_AGE_GROUPS.index('teen')].tolist() == [0, 1, 0, 0]
+
+    group.record('a', 13, 250)
+    assert group.summary(10)['members'] == 3
+    assert group.summary(10)['average_intake'] == 0.0
+    trend = group.trend(13, days=3)
+    assert trend['day'].tolist() == [11, 12, 13]
+    assert np.allclose(trend['average_intake'], [0, 0, 250 / 3])
+
+    # Records older than the window are ignored
+    group.record('a', 5, 1000)
+    assert group.summary(13)['average_intake'] == 250 / 3
+
+
+def test_registry_moves_members_between_groups():
+    registry = GroupRegistry()
+    registry.join('a', 'office', 'adult', 2000, day=1, intake_today=500)
+    registry.record('a', 1, 250)
+    assert registry.group('office').summary(1)['average_intake'] == 750
+    registry.join('a', 'family', 'adult', 2000, day=1, intake_today=750)
+    assert registry.group('office').summary(1)['members'] == 0
+    assert registry.group('family').summary(1)['average_intake'] == 750
+    registry.leave('a')
+    registry.record('a', 1, 250)
+    assert registry.group('family').summary(1)['members'] == 0
+
+
+def test_new_group_codes_are_private():
+    codes = {new_group_code() for _ in range(1000)}
+    assert len(codes) == 1000
+    assert all(len(code) == 8 and code != 'family' for code in codes)
+
+
+if __name__ == "__main__":
+    test_incremental_aggregates_match_brute_force()
+    test_window_drops_old_days_and_distribution_bins()
+    test_registry_moves_members_between_groups()
+    test_new_group_codes_are_private()
+    print("✅ All group analytics tests passed!")
@@ -0,0 +1,74 @@
+"""
+Test script to verify intake de-duplication
+Run with: python test_idempotency.py
+"""
+
+from waterbuddy.idempotency import RecentIds, client_event_id, intake_event_id
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_event_id_depends_on_every_part():
+    base = intake_event_id('user-1', 'render-1', 'water_250', 250)
+    assert base == intake_event_id('user-1', 'render-1', 'water_250', 250)
+    assert len({
+        base,
+        intake_event_id('user-2', 'render-1', 'water_250', 250),
+        intake_event_id('user-1', 'render-2', 'water_250', 250),
+        intake_event_id('user-1', 'render-1', 'add_custom', 250),
+        intake_event_id('user-1', 'render-1', 'add_custom', 300),
+    }) == 5
+
+
+def test_client_ids_are_scoped_per_user():
+    assert client_event_id('user-1', 'tap-1') == client_event_id('user-1', 'tap-1')
+    assert client_event_id('user-1', 'tap-1') != client_event_id('user-2', 'tap-1')
+    assert client_event_id('user-1', 'water_250') != intake_event_id('user-1', '', 'water_250', 250)
+
+
+def test_duplicates_rejected_inside_window_only():
+    clock = FakeClock()
+    recent = RecentIds(window_seconds=30, clock=clock)
+    assert recent.add('a')
+    assert not recent.add('a')
+    assert not recent.add('a')
+    assert recent.rejected == 2
+
+    clock.now += 29
+    assert 'a' in recent
+    clock.now += 2
+    assert 'a' not in recent
+    assert recent.add('a')
+
+
+def test_size_is_bounded():
+    clock = FakeClock()
+    recent = RecentIds(window_seconds=3600, max_size=100, clock=clock)
+    for i in range(1000):
+        assert recent.add(f'id-{i}')
+    assert len(recent) == 100
+    # The oldest IDs were evicted, the newest are still tracked
+    assert 'id-0' not in recent
+    assert not recent.add('id-999')
+
+
+def test_discard_allows_retry():
+    recent = RecentIds(clock=FakeClock())
+    assert recent.add('a')
+    recent.discard('a')
+    assert recent.add('a')
+
+
+if __name__ == "__main__":
+    test_event_id_depends_on_every_part()
+    test_client_ids_are_scoped_per_user()
+    test_duplicates_rejected_inside_window_only()
+    test_size_is_bounded()
+    test_discard_allows_retry()
+    print("✅ All idempotency tests passed!")
@@ -0,0 +1,59 @@
+"""
+Test script to verify leaderboard ranking and paging
+Run with: python test_leaderboard.py
+"""
+
+import numpy as np
+
+from waterbuddy.leaderboard import COLUMNS, leaderboard_page, page_count, rank_order, rank_places
+
+
+def sample_users(count: int = 103):
+    rng = np.random.default_rng(3)
+    return [{'user_id': f'u{i}', 'name': f'Member {i:03d}', 'intake': int(rng.integers(0, 30)) * 100,
+             'streak': int(rng.integers(0, 10))} for i in range(count)]
+
+
+def test_order_matches_python_sort():
+    users = sample_users()
+    for sort_by, other in (('intake', 'streak'), ('streak', 'intake')):
+        expected = sorted(range(len(users)), key=lambda i: (-users[i][sort_by], -users[i][other], users[i]['name']))
+        assert rank_order(users, sort_by).tolist() == expected
+    assert len(rank_order([])) == 0
+
+
+def test_pages_have_fixed_size_and_medals():
+    users = sample_users()
+    order = rank_order(users)
+    assert page_count(len(users), 25) == 5 and page_count(0, 25) == 1
+    frame, pinned_row = leaderboard_page(users, order, 0, 25)
+    assert list(frame.columns) == list(COLUMNS) and len(frame) == 25 and pinned_row is None
+    assert frame['Rank'].tolist()[:4] == ['🥇', '🥈', '🥉', '4.']
+    assert frame['Intake (ml)'].dtype == np.int32
+    assert frame['Intake (ml)'].is_monotonic_decreasing
+    # Past the end clamps to the last, partial page
+    frame, _ = leaderboard_page(users, order, 99, 25)
+    assert len(frame) == 3 and frame['Rank'].tolist()[-1] == '103.'
+
+
+def test_current_user_is_pinned():
+    users = sample_users()
+    order = rank_order(users)
+    places = rank_places(users, order)
+    last = users[order[-1]]
+    assert places[last['user_id']] == 102 and places[users[order[0]]['user_id']] == 0
+    frame, pinned_row = leaderboard_page(users, order, 0, 25, pinned=places[last['user_id']])
+    assert len(frame) == 26 and pinned_row == 0
+    assert frame['Rank'][0] == '103.' and frame['Name'][0] == f"{last['name']} (you)"
+    # On their own page the row stays where it ranks
+    frame, pinned_row = leaderboard_page(users, order, 4, 25, pinned=places[last['user_id']])
+    assert len(frame) == 3 and pinned_row == 2 and frame['Name'][2].endswith('(you)')
+    frame, pinned_row = leaderboard_page(users, order, 0, 25, pinned=places.get('nobody'))
+    assert len(frame) == 25 and pinned_row is None
+
+
+if __name__ == "__main__":
+    test_order_matches_python_sort()
+    test_pages_have_fixed_size_and_medals()
+    test_current_user_is_pinned()
+    print("✅ All leaderboard tests passed!")
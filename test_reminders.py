@@ -0,0 +1,78 @@
+"""
+Test script to verify adaptive reminder planning
+Run with: python test_reminders.py
+"""
+
+import numpy as np
+
+from waterbuddy.history import IntakeLog
+from waterbuddy.reminders import (
+    DEFAULT_WINDOW,
+    DrinkingProfile,
+    active_windows,
+    decay_weights,
+    plan_reminders,
+)
+
+
+def morning_person(days=10):
+    profile = DrinkingProfile()
+    for day in range(days):
+        for hour in (6, 8, 10, 12, 14):
+            profile.observe(19000 + day, hour, 400)
+    return profile
+
+
+def test_profile_decays_and_learns_window():
+    profile = morning_person()
+    assert profile.learned
+    assert profile.window() == (6, 15)
+
+    before = profile.weights.sum()
+    profile.decay_to(profile.last_day + 14)
+    assert np.isclose(profile.weights.sum(), before / 2)
+
+    assert DrinkingProfile().window() == DEFAULT_WINDOW
+
+
+def test_batch_decay_and_windows_match_single_profiles():
+    profiles = [morning_person(), DrinkingProfile()]
+    weights = np.stack([p.weights for p in profiles])
+    decayed = decay_weights(weights, np.array([14, 0]))
+    assert np.allclose(decayed[0], profiles[0].weights / 2)
+    start, end = active_windows(decayed)
+    assert start.tolist() == [6, DEFAULT_WINDOW[0]] and end.tolist() == [15, DEFAULT_WINDOW[1]]
+
+
+def test_from_log_matches_incremental_observe():
+    log = IntakeLog()
+    incremental = DrinkingProfile()
+    for day in range(5):
+        for hour in (9, 13):
+            log.append(((19000 + day) * 24 + hour) * 3600, 500)
+            incremental.observe(19000 + day, hour, 500)
+    built = DrinkingProfile.from_log(log, 'UTC', 19004)
+    assert np.allclose(built.weights, incremental.weights)
+
+
+def test_plan_skips_slots_when_ahead_of_pace():
+    profile = morning_person()
+    plan = plan_reminders(profile, 60, current_intake=0, daily_goal=2000, now_minutes=9 * 60)
+    assert [r['time'] for r in plan][:2] == ['06:00', '07:00']
+    assert {r['status'] for r in plan if r['minute'] < 9 * 60} == {'passed'}
+    assert all(r['status'] == 'due' for r in plan if r['minute'] >= 9 * 60)
+
+    ahead = plan_reminders(profile, 60, current_intake=1300, daily_goal=2000, now_minutes=9 * 60)
+    statuses = {r['time']: r['status'] for r in ahead}
+    assert statuses['10:00'] == 'skip' and statuses['14:00'] == 'due'
+
+    done = plan_reminders(profile, 60, current_intake=2000, daily_goal=2000, now_minutes=0)
+    assert {r['status'] for r in done} == {'skip'}
+
+
+if __name__ == "__main__":
+    test_profile_decays_and_learns_window()
+    test_batch_decay_and_windows_match_single_profiles()
+    test_from_log_matches_incremental_observe()
+    test_plan_skips_slots_when_ahead_of_pace()
+    print("✅ All reminder tests passed!")
@@ -0,0 +1,139 @@
+"""
+Test script to verify tiered retention of intake history
+Run with: python test_retention.py
+"""
+
+import pickle
+import tempfile
+
+import numpy as np
+
+from waterbuddy.history import HISTORY_NAMESPACE, IntakeLog
+from waterbuddy.retention import IntakeArchive, RetentionPolicy, apply_retention
+from waterbuddy.rollover import USERS_NAMESPACE
+from waterbuddy.snapshots import restore_history, take_snapshot
+from waterbuddy.storage import FileStore
+from waterbuddy.timeseries import IntakePyramid
+from waterbuddy.timezones import local_days
+
+DAY = 86400
+ZONE = 'Asia/Kolkata'
+
+
+def make_rows(days=400, per_day=6):
+    """A drink every 2-3 hours for days days, with a few corrections"""
+    rng = np.random.default_rng(11)
+    rows = []
+    drinks = []
+    for day in range(days):
+        for slot in range(per_day):
+            timestamp = day * DAY + 6 * 3600 + slot * 2.5 * 3600 + int(rng.integers(0, 600))
+            drinks.append(len(rows))
+            rows.append(IntakeLog.row(timestamp, int(rng.choice([250, 330, 500, 750, 180]))))
+        if day % 50 == 0:
+            rows.append(IntakeLog.row(rows[-1][0] + 60, -rows[drinks[-1]][1], drinks[-1]))
+    return rows
+
+
+def test_compaction_keeps_indices_and_referenced_drinks():
+    log = IntakeLog()
+    for i in range(6):
+        log.append(i * DAY, 250)
+    log.amend(4, -100, 5 * DAY + 60)
+    log.amend(1, -250, 5 * DAY + 120)
+
+    # Drink 1 is still referenced by a kept correction, so it stays along with everything after it
+    dropped = log.compact_before(3 * DAY)
+    assert log.base == 1 and dropped['timestamps'].tolist() == [0]
+    log.compact_before(3 * DAY + 1)
+    assert log.base == 1
+
+    assert log.amount_of(4) == 150 and log.tail(1)[0]['index'] == 5
+    assert log.append(6 * DAY, 500) == 8
+    restored = pickle.loads(pickle.dumps(log))
+    assert restored.base == 1 and restored.amount_of(4) == 150 and restored.amounts.tolist() == log.amounts.tolist()
+    try:
+        log.amount_of(0)
+    except IndexError:
+        pass
+    else:
+        raise AssertionError('archived drinks cannot be amended')
+
+
+def test_archive_tiers_keep_totals_and_local_days():
+    rows = make_rows(days=60)
+    log = IntakeLog.from_entries(rows)
+    full_days = local_days(log.timestamps, ZONE)
+    expected = np.bincount(full_days - full_days.min(), weights=log.amounts)
+    total_ml, total_glasses = int(log.amounts.sum()), len(log)
+
+    archive = IntakeArchive(ZONE)
+    counts = apply_retention(log, archive, RetentionPolicy(raw_days=20, hourly_days=40), today=60)
+    assert counts['drinks'] > 0 and counts['hours'] > 0 and len(archive.days) > 0
+    assert int(log.amounts.sum()) + archive.total_ml == total_ml
+    assert len(log) + archive.total_glasses == total_glasses
+
+    days, ml = archive.daily()
+    pyramid = IntakePyramid.from_days(np.concatenate([days, local_days(log.timestamps, ZONE)]),
+                                      np.concatenate([ml, log.amounts]))
+    assert pyramid.days.tolist() == expected.astype(np.int64).tolist()
+
+
+def test_snapshots_apply_retention_and_stay_exact():
+    rows = make_rows()
+    with tempfile.TemporaryDirectory() as root:
+        store = FileStore(root)
+        store.put(USERS_NAMESPACE, 'u1', {'timezone': ZONE, 'streak': 3, 'best_streak': 12, 'badges': []})
+        store.log_append(HISTORY_NAMESPACE, 'u1', rows)
+        full = IntakeLog.from_entries(rows)
+
+        snapshot = take_snapshot(store, 'u1', 400, RetentionPolicy(raw_days=90, hourly_days=180))
+        assert snapshot['total_intake'] == int(full.amounts.sum())
+        assert snapshot['total_glasses'] == len(full)
+        assert len(snapshot['history'].entries()['timestamps']) < len(rows) / 4
+        assert len(snapshot['archive'].hours) <= 24 * 90
+
+        # Rebuilding for another zone still sees every archived day
+        state = restore_history(store, 'u1', 'UTC', 400)
+        assert state['pyramid'].days.sum() == full.amounts.sum()
+        assert state['pyramid'].first_day == int(local_days(full.timestamps, 'UTC').min())
+
+        # A correction logged against a drink archived since (older logs only) is skipped, not fatal
+        store.log_append(HISTORY_NAMESPACE, 'u1', [IntakeLog.row(401 * DAY, -100, 3)])
+        assert restore_history(store, 'u1', ZONE, 401)['position'] == len(rows) + 1
+
+
+def test_editable_drinks_are_never_archived_before_their_corrections():
+    rows = [IntakeLog.row(day * DAY + 12 * 3600, 400) for day in range(60)]
+    policy = RetentionPolicy(raw_days=20, hourly_days=40)
+    cutoff = policy.editable_since(59)
+    oldest = next(i for i, row in enumerate(rows) if row[0] >= cutoff)
+    with tempfile.TemporaryDirectory() as root:
+        store = FileStore(root)
+        store.put(USERS_NAMESPACE, 'u1', {'timezone': ZONE, 'streak': 0, 'best_streak': 0, 'badges': []})
+        store.log_append(HISTORY_NAMESPACE, 'u1', rows)
+
+        # A worker whose day already rolled over snapshots before the edit reaches the log
+        snapshot = take_snapshot(store, 'u1', 60, policy)
+        assert 0 < snapshot['history'].base <= oldest
+
+        store.log_append(HISTORY_NAMESPACE, 'u1', [IntakeLog.row(60 * DAY, -150, oldest)])
+        state = restore_history(store, 'u1', ZONE, 60)
+        assert state['history'].amount_of(oldest) == 250
+        assert state['pyramid'].days.sum() == 400 * 60 - 150
+        assert state['total_intake'] == 400 * 60 - 150
+
+    try:
+        RetentionPolicy(raw_days=2)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('raw events must outlive the edit margin')
+
+
+if __name__ == "__main__":
+    test_compaction_keeps_indices_and_referenced_drinks()
+    test_archive_tiers_keep_totals_and_local_days()
+    test_snapshots_apply_retention_and_stay_exact()
+    test_editable_drinks_are_never_archived_before_their_corrections()
+    print("✅ All retention tests passed!")
@@ -0,0 +1,126 @@
+"""
+Test script to verify the midnight rollover batch job
+Run with: python test_rollover.py
+"""
+
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+from waterbuddy.rollover import (
+    ROLLUPS_NAMESPACE,
+    USERS_NAMESPACE,
+    RolloverJob,
+    register_user_zone,
+    roll_batch,
+)
+from waterbuddy.reminders import DrinkingProfile
+from waterbuddy.storage import FileStore
+from waterbuddy.timezones import date_to_day, local_today
+
+
+def make_record(**overrides):
+    record = {
+        'name': 'Ada', 'daily_goal': 2000, 'timezone': 'UTC', 'current_intake': 0,
+        'today_date': date(2024, 3, 1), 'streak': 0, 'best_streak': 0, 'badges': [],
+    }
+    record.update(overrides)
+    return record
+
+
+def test_roll_batch_streaks_and_badges():
+    result = roll_batch(
+        today=np.array([10, 10, 10, 9]),
+        last_day=np.array([9, 9, 7, 9]),
+        intake=np.array([2500, 1000, 2500, 2500]),
+        goal=np.array([2000, 2000, 2000, 2000]),
+        streak=np.array([6, 4, 6, 6]),
+        best_streak=np.array([6, 9, 6, 6]),
+    )
+    assert result['due'].tolist() == [True, True, True, False]
+    # met yesterday, missed yesterday, met but skipped two days, not due yet
+    assert result['streak'].tolist() == [7, 0, 0, 6]
+    assert result['best_streak'].tolist() == [7, 9, 7, 6]
+    assert result['week-streak'].tolist() == [True, False, True, False]
+
+
+def test_job_rolls_users_at_their_local_midnight():
+    with tempfile.TemporaryDirectory() as root:
+        store = FileStore(root)
+        store.put(USERS_NAMESPACE, 'utc', make_record(current_intake=2100, streak=6))
+        store.put(USERS_NAMESPACE, 'tokyo', make_record(timezone='Asia/Tokyo', current_intake=500, streak=3))
+        register_user_zone(store, 'utc', 'UTC')
+        register_user_zone(store, 'tokyo', 'Asia/Tokyo')
+        job = RolloverJob(store)
+
+        # 2024-03-01 20:00 UTC is already 2024-03-02 in Tokyo
+        assert job.run(datetime(2024, 3, 1, 20, tzinfo=timezone.utc)) == ['tokyo']
+        tokyo = store.get(USERS_NAMESPACE, 'tokyo')
+        assert tokyo['today_date'] == date(2024, 3, 2)
+        assert tokyo['current_intake'] == 0 and tokyo['streak'] == 0
+        assert store.get(ROLLUPS_NAMESPACE, 'tokyo')[date(2024, 3, 1)]['intake'] == 500
+
+        assert job.run(datetime(2024, 3, 2, 0, 5, tzinfo=timezone.utc)) == ['utc']
+        utc = store.get(USERS_NAMESPACE, 'utc')
+        assert utc['streak'] == 7 and utc['best_streak'] == 7
+        assert 'week-streak' in utc['badges']
+        assert job.generation == 2
+
+        # Nothing left to do until the next midnight
+        assert job.run(datetime(2024, 3, 2, 1, tzinfo=timezone.utc)) == []
+
+
+def test_next_run_is_planned_for_earliest_midnight():
+    with tempfile.TemporaryDirectory() as root:
+        store = FileStore(root)
+        register_user_zone(store, 'a', 'UTC')
+        register_user_zone(store, 'b', 'Asia/Tokyo')
+        job = RolloverJob(store)
+        now = datetime(2024, 3, 1, 14, 30, tzinfo=timezone.utc)
+        # Tokyo midnight (15:00 UTC) comes first
+        assert job.seconds_until_next_run(now) == 1801
+
+
+def test_rollover_ages_drinking_profiles():
+    with tempfile.TemporaryDirectory() as root:
+        store = FileStore(root)
+        profile = DrinkingProfile()
+        profile.observe(date_to_day(date(2024, 2, 16)), 9, 1000)
+        store.put(USERS_NAMESPACE, 'ada', make_record(today_date=date(2024, 2, 29), drinking_profile=profile))
+        register_user_zone(store, 'ada', 'UTC')
+
+        RolloverJob(store).run(datetime(2024, 3, 1, 0, 5, tzinfo=timezone.utc))
+        aged = store.get(USERS_NAMESPACE, 'ada')['drinking_profile']
+        assert aged.last_day == date_to_day(date(2024, 3, 1))
+        assert np.isclose(aged.weights[9], 500)
+
+
+def test_session_picks_up_a_rollover_from_another_worker(app_test, tmp_path):
+    """The job's generation only moves where it ran, so a session past midnight reads the store"""
+    store = FileStore(str(tmp_path))
+    uid, today = 'cd' * 16, local_today('UTC')
+    store.put(USERS_NAMESPACE, uid, make_record(today_date=today, drinking_profile=DrinkingProfile()))
+
+    at = app_test
+    at.query_params['uid'] = uid
+    at.run()
+    assert not at.exception
+    # The session is still on yesterday while another worker has closed it
+    at.session_state['today_date'] = today - timedelta(days=1)
+    at.session_state['current_intake'] = 2400
+    store.put(USERS_NAMESPACE, uid, make_record(today_date=today, streak=4, best_streak=4,
+                                                drinking_profile=DrinkingProfile()))
+    at.run()
+    assert not at.exception
+    assert at.session_state['today_date'] == today
+    assert (at.session_state['current_intake'], at.session_state['streak']) == (0, 4)
+
+
+if __name__ == "__main__":
+    test_roll_batch_streaks_and_badges()
+    test_job_rolls_users_at_their_local_midnight()
+    test_next_run_is_planned_for_earliest_midnight()
+    test_rollover_ages_drinking_profiles()
+    # The app test needs pytest's fixtures (see conftest.py)
+    print("✅ All rollover tests passed!")
@@ -0,0 +1,132 @@
+"""
+Test script to verify idle session spilling and rehydration
+Run with: python test_sessions.py
+"""
+
+import tempfile
+import time
+
+from waterbuddy.sessions import IdleSessionManager, SPILL_NAMESPACE
+from waterbuddy.storage import FileStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeState(dict):
+    """Stand-in for Streamlit's session state"""
+
+
+def make_manager(root, is_alive=lambda session_id: True):
+    clock = FakeClock()
+    manager = IdleSessionManager(FileStore(root), idle_seconds=60, sweep_interval=0, clock=clock,
+                                 is_alive=is_alive)
+    return manager, clock
+
+
+def test_file_store_round_trip():
+    with tempfile.TemporaryDirectory() as root:
+        store = FileStore(root)
+        store.put('users', 'a/b', {'x': [1, 2]})
+        assert store.get('users', 'a/b') == {'x': [1, 2]}
+        assert store.keys('users') == ['a_b']
+        store.delete('users', 'a/b')
+        assert store.get('users', 'a/b', 'missing') == 'missing'
+
+
+def test_idle_session_is_spilled_and_rehydrated():
+    with tempfile.TemporaryDirectory() as root:
+        manager, clock = make_manager(root)
+        state = FakeState(name='Ada', intake_history=[{'amount': 250}], weekly_data=[1, 2, 3])
+        manager.touch('s1', state)
+
+        clock.now += 30
+        assert manager.evict_idle() == []
+
+        clock.now += 60
+        assert manager.evict_idle() == ['s1']
+        assert 'intake_history' not in state and 'weekly_data' not in state
+        assert state['name'] == 'Ada'
+        assert manager.memory_report()[0]['spilled'] is True
+
+        restored = manager.touch('s1', state)
+        assert sorted(restored) == ['intake_history', 'weekly_data']
+        assert state['intake_history'] == [{'amount': 250}]
+        assert manager.store.get(SPILL_NAMESPACE, 's1') is None
+
+
+def test_memory_report_and_forget():
+    with tempfile.TemporaryDirectory() as root:
+        manager, clock = make_manager(root)
+        small = FakeState(intake_history=[])
+        large = FakeState(intake_history=[{'amount': i} for i in range(500)])
+        manager.touch('small', small)
+        manager.touch('large', large)
+
+        report = manager.memory_report()
+        assert [row['session_id'] for row in report] == ['large', 'small']
+        assert report[0]['bytes'] > report[1]['bytes']
+
+        clock.now += 120
+        manager.evict_idle()
+        manager.forget('large')
+        assert manager.store.get(SPILL_NAMESPACE, 'large') is None
+        assert [row['session_id'] for row in manager.memory_report()] == ['small']
+
+
+def test_closed_session_is_dropped_after_grace_period():
+    with tempfile.TemporaryDirectory() as root:
+        open_sessions = {'s1'}
+        manager, clock = make_manager(root, is_alive=lambda session_id: session_id in open_sessions)
+        state = FakeState(intake_history=[{'amount': 250}])
+        manager.touch('s1', state)
+        clock.now += 120
+        assert manager.evict_idle() == ['s1']
+
+        # A disconnected session keeps its spilled fields so it can reconnect
+        open_sessions.clear()
+        clock.now += 30
+        manager.evict_idle()
+        assert manager.store.get(SPILL_NAMESPACE, 's1')
+        clock.now += 60
+        manager.evict_idle()
+        assert manager.memory_report() == [] and manager.store.get(SPILL_NAMESPACE, 's1') is None
+
+
+def test_streamlit_session_is_tracked_across_reruns(app_test):
+    """The registry must hold the session's state, not a per-run wrapper"""
+    at = app_test
+    at.session_state['show_onboarding'] = False
+    at.session_state['screen'] = 'dashboard'
+    at.run()
+    at.run()
+    assert not at.exception
+
+    import core
+    manager = core.get_session_manager()
+    assert len(manager.memory_report()) == 1
+    session_id = manager.memory_report()[0]['session_id']
+    assert manager.usage(session_id)['bytes'] > 0 and manager.usage('other') is None
+
+    # An hour later the session is idle, not closed: its heavy fields are spilled
+    assert manager.evict_idle(time.time() + 3600) == [session_id]
+    assert 'weekly_data' not in at.session_state
+    assert manager.store.get(SPILL_NAMESPACE, session_id)
+
+    at.run()
+    assert not at.exception and 'weekly_data' in at.session_state
+    assert manager.store.get(SPILL_NAMESPACE, session_id) is None
+
+
+if __name__ == "__main__":
+    test_file_store_round_trip()
+    test_idle_session_is_spilled_and_rehydrated()
+    test_memory_report_and_forget()
+    test_closed_session_is_dropped_after_grace_period()
+    # The app test needs pytest's fixtures (see conftest.py)
+    print("✅ All session tests passed!")
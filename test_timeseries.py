@@ -0,0 +1,72 @@
+"""
+Test script to verify the multi-resolution intake time series
+Run with: python test_timeseries.py
+"""
+
+from datetime import date
+
+import numpy as np
+
+from waterbuddy.history import IntakeLog
+from waterbuddy.timeseries import IntakePyramid
+from waterbuddy.timezones import date_to_day
+
+
+def build_random(seed=3, count=3000):
+    rng = np.random.default_rng(seed)
+    start = date_to_day(date(2022, 1, 1)) * 86400
+    timestamps = np.sort(rng.integers(start, start + 800 * 86400, size=count))
+    amounts = rng.choice([250, 330, 500, 750], size=count)
+    return timestamps, amounts
+
+
+def test_incremental_matches_full_build():
+    timestamps, amounts = build_random()
+    log = IntakeLog()
+    incremental = IntakePyramid()
+    for ts, amount in zip(timestamps, amounts):
+        log.append(ts, amount)
+        incremental.add(ts // 86400, amount)
+    full = IntakePyramid.from_log(log, 'UTC')
+
+    assert np.array_equal(incremental.days, full.days)
+    for name in ('week', 'month'):
+        for field in ('sum', 'min', 'max', 'count'):
+            assert np.array_equal(getattr(incremental.levels[name], field), getattr(full.levels[name], field)), (name, field)
+
+
+def test_series_picks_level_and_bounds_points():
+    timestamps, amounts = build_random()
+    log = IntakeLog()
+    log.extend(timestamps, amounts)
+    pyramid = IntakePyramid.from_log(log, 'UTC')
+    first, last = pyramid.first_day, pyramid.last_day
+
+    week = pyramid.series(last - 6, last)
+    assert week['level'] == 'day' and len(week['start']) == 7
+
+    everything = pyramid.series(first, last)
+    assert everything['level'] == 'week' and len(everything['start']) <= 300
+    assert everything['sum'].sum() == amounts.sum()
+
+    months = pyramid.series(first, last, max_points=40)
+    assert months['level'] == 'month' and months['sum'].sum() == amounts.sum()
+    assert (months['min'] <= months['mean']).all() and (months['mean'] <= months['max']).all()
+
+
+def test_gap_days_count_as_zero():
+    pyramid = IntakePyramid()
+    monday = date_to_day(date(2024, 1, 1))
+    pyramid.add(monday, 2000)
+    pyramid.add(monday + 3, 1000)
+    week = pyramid.series(monday, monday + 6, max_points=1)
+    assert week['level'] == 'week'
+    assert week['sum'].tolist() == [3000] and week['min'].tolist() == [0]
+    assert week['max'].tolist() == [2000] and week['mean'].tolist() == [750]
+
+
+if __name__ == "__main__":
+    test_incremental_matches_full_build()
+    test_series_picks_level_and_bounds_points()
+    test_gap_days_count_as_zero()
+    print("✅ All time series tests passed!")
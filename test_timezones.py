@@ -0,0 +1,53 @@
+"""
+Test script to verify timezone offset tables and event bucketing
+Run with: python test_timezones.py
+"""
+
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from waterbuddy.timezones import (
+    bucket_events,
+    day_to_date,
+    local_datetime,
+    local_seconds_multi,
+    local_today,
+    offset_table,
+)
+
+
+def test_offsets_match_zoneinfo():
+    rng = np.random.default_rng(7)
+    timestamps = rng.integers(946684800, 2524608000, size=2000)  # 2000-2050
+    for zone_name in ['America/New_York', 'Europe/Berlin', 'Australia/Sydney', 'Asia/Kolkata']:
+        zone = ZoneInfo(zone_name)
+        days, hours = bucket_events(timestamps, zone_name)
+        for ts, day, hour in zip(timestamps[:300], days[:300], hours[:300]):
+            local = datetime.fromtimestamp(int(ts), zone)
+            assert day_to_date(day) == local.date(), (zone_name, ts)
+            assert hour == local.hour, (zone_name, ts)
+
+
+def test_dst_transition_is_exact():
+    table = offset_table('America/New_York')
+    spring_forward = int(datetime(2024, 3, 10, 7, 0, tzinfo=timezone.utc).timestamp())
+    assert table.offsets_at([spring_forward - 1, spring_forward]).tolist() == [-18000, -14400]
+
+
+def test_per_row_zones_and_local_helpers():
+    ts = int(datetime(2024, 6, 30, 23, 30, tzinfo=timezone.utc).timestamp())
+    local = local_seconds_multi([ts, ts, ts], ['UTC', 'Asia/Tokyo', 'Not/AZone'])
+    assert (local - ts).tolist() == [0, 9 * 3600, 0]
+
+    now = datetime(2024, 6, 30, 23, 30, tzinfo=timezone.utc)
+    assert local_today('Asia/Tokyo', now) == date(2024, 7, 1)
+    assert local_datetime(ts, 'America/New_York') == datetime(2024, 6, 30, 19, 30)
+
+
+if __name__ == "__main__":
+    test_offsets_match_zoneinfo()
+    test_dst_transition_is_exact()
+    test_per_row_zones_and_local_helpers()
+    print("✅ All timezone tests passed!")
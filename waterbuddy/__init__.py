@@ -0,0 +1,4 @@
+"""
+WaterBuddy support package
+Storage, session and analytics helpers used by streamlit_app.py
+"""
@@ -0,0 +1,84 @@
+"""
+Intake analytics for WaterBuddy
+Day-of-week x hour-of-day heatmaps and container size distributions computed
+with NumPy bincount over the columnar intake history, plus the per-user
+summary numbers every screen shows
+"""
+
+from datetime import date, datetime
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from waterbuddy.timezones import SECONDS_PER_DAY, SECONDS_PER_HOUR, local_seconds
+
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+HOURS = list(range(24))
+
+
+def _local_window(log, zone_name: str, start_day: int, end_day: int):
+    """Local seconds and amounts of the events on local days start_day..end_day"""
+    window = log.day_range(start_day, end_day)
+    local = local_seconds(log.timestamps[window], zone_name)
+    days = local // SECONDS_PER_DAY
+    keep = (days >= start_day) & (days <= end_day)
+    return local[keep], log.amounts[window][keep]
+
+
+def intake_heatmap(log, zone_name: str, start_day: int, end_day: int) -> np.ndarray:
+    """7 x 24 matrix of ml logged per weekday (Mon first) and local hour"""
+    local, amounts = _local_window(log, zone_name, start_day, end_day)
+    days = local // SECONDS_PER_DAY
+    # 1970-01-01 was a Thursday
+    weekday = (days + 3) % 7
+    hour = (local % SECONDS_PER_DAY) // SECONDS_PER_HOUR
+    cells = np.bincount(weekday * 24 + hour, weights=amounts, minlength=7 * 24)
+    return cells.reshape(7, 24)
+
+
+def size_distribution(log, zone_name: str, start_day: int, end_day: int,
+                      sizes: Sequence[int]) -> Dict[str, np.ndarray]:
+    """Drink count and volume per standard container size, with 'custom' last"""
+    _, amounts = _local_window(log, zone_name, start_day, end_day)
+    sizes = np.asarray(sorted(sizes), dtype=np.int64)
+    idx = np.minimum(np.searchsorted(sizes, amounts), len(sizes) - 1)
+    bucket = np.where(sizes[idx] == amounts, idx, len(sizes))
+    return {
+        'sizes': sizes,
+        'counts': np.bincount(bucket, minlength=len(sizes) + 1),
+        'volume': np.bincount(bucket, weights=amounts, minlength=len(sizes) + 1),
+    }
+
+
+def weekly_intake(pyramid, today: int, goal: int, today_intake: int) -> List[dict]:
+    """The seven local days ending today as weekly chart rows ({'day', 'intake', 'goal'})
+
+    Past days are the pyramid's daily totals, which include corrections and
+    rolled-up archives; today is the live running total.
+    """
+    totals = pyramid.daily_totals(today - 6, today - 1).tolist() + [today_intake]
+    return [
+        # 1970-01-01 was a Thursday
+        {'day': WEEKDAYS[(day + 3) % 7], 'intake': int(intake), 'goal': goal}
+        for day, intake in zip(range(today - 6, today + 1), totals)
+    ]
+
+
+def derived_stats(current_intake: int, daily_goal: int, join_date: datetime, badges: Sequence[str],
+                  badge_count: int, weekly_data: List[dict], today: date) -> Dict[str, float]:
+    """Progress, activity and weekly numbers derived from a user's tracking state
+
+    weekly_data ends with today, which the weekly total and average leave
+    out because the day is still in progress.
+    """
+    past_days = weekly_data[:-1]
+    weekly_total = sum(day['intake'] for day in past_days)
+    return {
+        'progress_pct': current_intake / daily_goal * 100,
+        # join_date is server time, which can be a day ahead of the user's local today
+        'days_active': max((today - join_date.date()).days, 0),
+        'completion_rate': len(badges) / badge_count * 100,
+        'weekly_total': weekly_total,
+        'weekly_average': weekly_total / len(past_days) if past_days else 0,
+        'days_met': sum(1 for day in weekly_data if day['intake'] >= day['goal']),
+    }
@@ -0,0 +1,75 @@
+"""
+Client-buffered intake logging for WaterBuddy
+The log-water panel records taps in the browser and sends them in batches.
+A batch is untrusted input: taps are validated, deduplicated by their client
+ID and given timestamps the append-only history can take (in order, not in
+the future, not older than the buffer may hold) before they are logged
+"""
+
+import math
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+BUFFER_MAX_AGE_SECONDS = 6 * 3600
+MAX_BATCH_TAPS = 200
+MAX_TAP_AMOUNT = 2000
+SYNCED_IDS_KEPT = 200
+
+
+class BufferedTap:
+    """One tap recorded by the client: its ID, UTC seconds and amount in ml"""
+
+    __slots__ = ('client_id', 'timestamp', 'amount')
+
+    def __init__(self, client_id: str, timestamp: float, amount: int):
+        self.client_id = client_id
+        self.timestamp = timestamp
+        self.amount = amount
+
+    def __repr__(self) -> str:
+        return f'BufferedTap({self.client_id!r}, {self.timestamp!r}, {self.amount!r})'
+
+
+def parse_batch(batch: Optional[Dict], now: float, after: float = 0.0,
+                max_age: float = BUFFER_MAX_AGE_SECONDS) -> List[BufferedTap]:
+    """Valid taps of a client batch, oldest first, with timestamps fit for the log
+
+    batch is {'batch': id, 'taps': [{'id', 'ts' (ms since epoch), 'amount'}]}.
+    Malformed taps, including ones with a NaN or infinite timestamp, are
+    dropped. Timestamps are clamped into [max(now - max_age, after), now],
+    so clock skew cannot log a drink in the future, days ago, or before the
+    newest drink already logged.
+    """
+    if not isinstance(batch, dict) or not isinstance(batch.get('taps'), list):
+        return []
+    taps = []
+    for tap in batch['taps'][:MAX_BATCH_TAPS]:
+        try:
+            client_id, timestamp, amount = str(tap['id']), float(tap['ts']) / 1000, int(tap['amount'])
+        except (KeyError, TypeError, ValueError, OverflowError):
+            continue
+        # float() accepts 'nan' and 'inf', which would slip past the clamping below
+        if client_id and math.isfinite(timestamp) and 0 < amount <= MAX_TAP_AMOUNT:
+            taps.append(BufferedTap(client_id, timestamp, amount))
+    taps.sort(key=lambda tap: tap.timestamp)
+    floor = max(now - max_age, after)
+    for tap in taps:
+        tap.timestamp = min(max(tap.timestamp, floor), now)
+        floor = tap.timestamp
+    return taps
+
+
+class SyncedIds:
+    """Client IDs of the latest synced taps, sent back so the client can drop them"""
+
+    def __init__(self, kept: int = SYNCED_IDS_KEPT):
+        self._ids = deque(maxlen=kept)
+
+    def add(self, client_ids: Iterable[str]):
+        self._ids.extend(client_ids)
+
+    def __contains__(self, client_id: str) -> bool:
+        return client_id in self._ids
+
+    def to_list(self) -> List[str]:
+        return list(self._ids)
@@ -0,0 +1,184 @@
+"""
+Weekly and long-range charts for WaterBuddy
+Each chart has two backends: a Plotly figure, and a lighter Vega-Lite
+path where a small data-free spec travels with a column-typed DataFrame
+that Streamlit ships to the browser as Arrow, so the payload grows by a
+few bytes per point instead of a JSON value per point and trace
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from waterbuddy.timezones import day_to_date
+
+GOAL_LINE_COLOR = '#94a3b8'
+LEVEL_TITLES = {'day': 'daily', 'week': 'weekly', 'month': 'monthly'}
+
+
+def weekly_figure(weekly_data: Sequence[Dict], primary: str, secondary: str) -> go.Figure:
+    """Intake bars (primary when the goal was met) with the goal as a dashed line"""
+    days = [d['day'] for d in weekly_data]
+    intakes = [d['intake'] for d in weekly_data]
+    goals = [d['goal'] for d in weekly_data]
+
+    fig = go.Figure()
+
+    # Goal line
+    fig.add_trace(go.Scatter(
+        x=days,
+        y=goals,
+        mode='lines',
+        name='Goal',
+        line=dict(color=GOAL_LINE_COLOR, width=2, dash='dash')
+    ))
+
+    # Actual intake bars
+    colors = [primary if intake >= goal else secondary for intake, goal in zip(intakes, goals)]
+
+    fig.add_trace(go.Bar(
+        x=days,
+        y=intakes,
+        name='Intake',
+        marker=dict(color=colors),
+        text=[f"{intake}ml" for intake in intakes],
+        textposition='auto'
+    ))
+
+    fig.update_layout(
+        title="Weekly Hydration Progress",
+        xaxis_title="Day",
+        yaxis_title="Water (ml)",
+        height=400,
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    return fig
+
+
+def history_figure(series: Dict[str, np.ndarray], goal: int, primary: str, secondary: str) -> go.Figure:
+    """Daily average per day/week/month point, min/max error bars above day level, and the goal"""
+    level = series['level']
+    dates = [day_to_date(day) for day in series['start']]
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(
+        x=dates,
+        y=series['mean'],
+        name='Daily intake' if level == 'day' else f'Daily average ({level})',
+        marker=dict(color=primary),
+        error_y=None if level == 'day' else dict(
+            type='data',
+            symmetric=False,
+            array=series['max'] - series['mean'],
+            arrayminus=series['mean'] - series['min'],
+            color=secondary
+        ),
+        customdata=series['sum'],
+        hovertemplate="%{x}<br>%{y:.0f}ml/day<br>Total %{customdata:,}ml<extra></extra>"
+    ))
+
+    fig.add_hline(
+        y=goal,
+        line=dict(color=GOAL_LINE_COLOR, width=2, dash='dash'),
+        annotation_text="Goal"
+    )
+
+    fig.update_layout(
+        title=f"Hydration History ({LEVEL_TITLES[level]} view)",
+        yaxis_title="Water (ml per day)",
+        height=400,
+        bargap=0.1,
+        showlegend=False
+    )
+
+    return fig
+
+
+def weekly_frame(weekly_data: Sequence[Dict]) -> pd.DataFrame:
+    """Day label, intake, goal and whether the goal was met, one row per day"""
+    frame = pd.DataFrame({
+        'day': [d['day'] for d in weekly_data],
+        'intake': np.array([d['intake'] for d in weekly_data], dtype=np.int32),
+        'goal': np.array([d['goal'] for d in weekly_data], dtype=np.int32),
+    })
+    frame['met'] = frame['intake'] >= frame['goal']
+    return frame
+
+
+def history_frame(series: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Pyramid series points as typed columns (start date, mean, min, max, sum)
+
+    Columns are narrowed to 32 bits (plenty for ml per day or month), which
+    halves the Arrow payload.
+    """
+    return pd.DataFrame({
+        'date': np.asarray(series['start'], dtype='datetime64[D]'),
+        'mean': np.asarray(series['mean'], dtype=np.float32),
+        'min': np.asarray(series['min'], dtype=np.int32),
+        'max': np.asarray(series['max'], dtype=np.int32),
+        'sum': np.asarray(series['sum'], dtype=np.int32),
+    })
+
+
+def weekly_spec(primary: str, secondary: str) -> Dict:
+    """Intake bars (primary when the goal was met) with the goal as a dashed line"""
+    x = {'field': 'day', 'type': 'ordinal', 'sort': None, 'title': 'Day'}
+    return {
+        'title': 'Weekly Hydration Progress',
+        'height': 400,
+        'encoding': {'x': x},
+        'layer': [
+            {
+                'mark': {'type': 'bar'},
+                'encoding': {
+                    'y': {'field': 'intake', 'type': 'quantitative', 'title': 'Water (ml)'},
+                    'color': {
+                        'field': 'met', 'type': 'nominal', 'legend': None,
+                        'scale': {'domain': [True, False], 'range': [primary, secondary]},
+                    },
+                    'tooltip': [{'field': 'day'}, {'field': 'intake', 'title': 'Intake (ml)'},
+                                {'field': 'goal', 'title': 'Goal (ml)'}],
+                },
+            },
+            {
+                'mark': {'type': 'line', 'color': GOAL_LINE_COLOR, 'strokeDash': [6, 4]},
+                'encoding': {'y': {'field': 'goal', 'type': 'quantitative'}},
+            },
+        ],
+    }
+
+
+def history_spec(level: str, goal: int, primary: str, secondary: str) -> Dict:
+    """Per-point daily average bars, min/max whiskers above day level, and the goal"""
+    x = {'field': 'date', 'type': 'temporal', 'title': None}
+    layers = [
+        {
+            'mark': {'type': 'bar', 'color': primary},
+            'encoding': {
+                'y': {'field': 'mean', 'type': 'quantitative', 'title': 'Water (ml per day)'},
+                'tooltip': [{'field': 'date', 'type': 'temporal'},
+                            {'field': 'mean', 'title': 'ml/day', 'format': '.0f'},
+                            {'field': 'sum', 'title': 'Total (ml)', 'format': ','}],
+            },
+        },
+    ]
+    if level != 'day':
+        layers.append({
+            'mark': {'type': 'rule', 'color': secondary},
+            'encoding': {'y': {'field': 'min', 'type': 'quantitative'}, 'y2': {'field': 'max'}},
+        })
+    layers.append({
+        'mark': {'type': 'rule', 'color': GOAL_LINE_COLOR, 'strokeWidth': 2, 'strokeDash': [6, 4]},
+        'encoding': {'y': {'datum': goal}},
+    })
+    return {
+        'title': f'Hydration History ({LEVEL_TITLES[level]} view)',
+        'height': 400,
+        'encoding': {'x': x},
+        'layer': layers,
+    }
@@ -0,0 +1,196 @@
+"""
+Compact binary encoding of intake events for WaterBuddy
+Raw (timestamp, amount, ref) rows are packed into checksummed blocks:
+timestamps as zigzag varint deltas, amounts as a one-byte code into the
+standard container sizes (with escapes for custom amounts and corrections).
+A typical drink takes 3-4 bytes, and both directions are vectorized NumPy
+so whole histories decode without a Python loop per event
+"""
+
+import struct
+import zlib
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+FORMAT_VERSION = 1
+MAGIC = b'WB'
+STANDARD_SIZES = (250, 330, 500, 750)
+BLOCK_EVENTS = 65536
+
+# Tag byte escapes; tags below these index the block's size dictionary
+CUSTOM = 0xFE  # a drink of another size: its zigzag amount follows in the extras
+CORRECTION = 0xFF  # a compensating entry: zigzag delta, then the drink index
+
+# magic, version, dictionary size, event count, first timestamp, delta and extras stream lengths
+_HEADER = struct.Struct('<2sBBIqII')
+_CHECKSUM = struct.Struct('<I')
+
+
+class CodecError(ValueError):
+    """Encoded data is truncated, corrupted or of an unknown format"""
+
+
+def zigzag(values: np.ndarray) -> np.ndarray:
+    """Map signed integers to unsigned ones with small magnitudes kept small"""
+    values = np.asarray(values, dtype=np.int64)
+    return ((values << 1) ^ (values >> 63)).astype(np.uint64)
+
+
+def unzigzag(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=np.uint64).view(np.int64)
+    return (values >> 1 & np.int64(0x7FFFFFFFFFFFFFFF)) ^ -(values & 1)
+
+
+def encode_varints(values: np.ndarray) -> bytes:
+    """LEB128 encoding of unsigned integers, 7 bits per byte"""
+    values = np.asarray(values, dtype=np.uint64)
+    if not len(values):
+        return b''
+    bits = np.zeros(len(values), dtype=np.int64)
+    remaining = values.copy()
+    while remaining.any():
+        bits += remaining > 0
+        remaining >>= np.uint64(7)
+    lengths = np.maximum(bits, 1)
+    starts = np.cumsum(lengths) - lengths
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    for k in range(int(lengths.max())):
+        present = lengths > k
+        chunk = (values[present] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (lengths[present] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[present] + k] = (chunk | more).astype(np.uint8)
+    return out.tobytes()
+
+
+def decode_varints(data, count: Optional[int] = None) -> np.ndarray:
+    """Inverse of encode_varints"""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if not len(raw):
+        return np.zeros(0, dtype=np.uint64)
+    if raw[-1] >= 0x80:
+        raise CodecError('varint stream ends mid-value')
+    ends = np.flatnonzero(raw < 0x80)
+    if count is not None and len(ends) != count:
+        raise CodecError(f'expected {count} varints, found {len(ends)}')
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts + 1
+    longest = int(lengths.max())
+    if longest > 10:
+        raise CodecError('varint longer than 64 bits')
+    # One gather per byte position: as many passes as the longest value has bytes
+    payload = np.concatenate([raw & 0x7F, np.zeros(longest, dtype=np.uint8)])
+    values = payload[starts].astype(np.uint64)
+    for k in range(1, longest):
+        chunk = payload[starts + k] * (lengths > k)
+        values |= chunk.astype(np.uint64) << np.uint64(7 * k)
+    return values
+
+
+def _extras_counts(carrier_tags: np.ndarray) -> np.ndarray:
+    """Number of extras values each custom drink (1) or correction (2) carries"""
+    return np.where(carrier_tags == CORRECTION, 2, 1)
+
+
+def _encode_block(timestamps: np.ndarray, amounts: np.ndarray, refs: np.ndarray, sizes: np.ndarray) -> bytes:
+    tags = np.full(len(amounts), CUSTOM, dtype=np.uint8)
+    if len(sizes):
+        slot = np.minimum(np.searchsorted(sizes, amounts), len(sizes) - 1)
+        tags = np.where(sizes[slot] == amounts, slot, CUSTOM).astype(np.uint8)
+    tags[refs >= 0] = CORRECTION
+
+    base = int(timestamps[0])
+    deltas = zigzag(np.diff(timestamps, prepend=base))
+
+    # Only custom drinks and corrections (rare) carry extras
+    carriers = np.flatnonzero(tags >= CUSTOM)
+    counts = _extras_counts(tags[carriers])
+    first = np.cumsum(counts) - counts
+    extras = np.zeros(int(counts.sum()), dtype=np.uint64)
+    extras[first] = zigzag(amounts[carriers])
+    corrections = counts == 2
+    extras[first[corrections] + 1] = refs[carriers[corrections]].astype(np.uint64)
+
+    delta_bytes = encode_varints(deltas)
+    extra_bytes = encode_varints(extras)
+    body = b''.join([
+        _HEADER.pack(MAGIC, FORMAT_VERSION, len(sizes), len(tags), base, len(delta_bytes), len(extra_bytes)),
+        sizes.astype('<u4').tobytes(),
+        tags.tobytes(),
+        delta_bytes,
+        extra_bytes,
+    ])
+    return body + _CHECKSUM.pack(zlib.crc32(body))
+
+
+def encode_events(timestamps, amounts, refs=None, sizes: Sequence[int] = STANDARD_SIZES,
+                  block_events: int = BLOCK_EVENTS) -> bytes:
+    """Encode raw intake log columns (refs -1 for drinks) into checksummed blocks"""
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    amounts = np.asarray(amounts, dtype=np.int64)
+    refs = np.full(len(timestamps), -1, dtype=np.int64) if refs is None else np.asarray(refs, dtype=np.int64)
+    sizes = np.asarray(sorted(sizes), dtype=np.int64)
+    if len(sizes) >= CUSTOM:
+        raise ValueError(f'at most {CUSTOM - 1} standard sizes')
+    return b''.join(
+        _encode_block(timestamps[i:i + block_events], amounts[i:i + block_events], refs[i:i + block_events], sizes)
+        for i in range(0, len(timestamps), block_events)
+    )
+
+
+def _decode_block(data: memoryview, offset: int):
+    """One block's columns and the offset just after it"""
+    if len(data) - offset < _HEADER.size:
+        raise CodecError('truncated block header')
+    magic, version, n_sizes, count, base, delta_len, extra_len = _HEADER.unpack_from(data, offset)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise CodecError(f'unknown block format {magic!r} v{version}')
+    pos = offset + _HEADER.size
+    end = pos + 4 * n_sizes + count + delta_len + extra_len
+    if len(data) < end + _CHECKSUM.size:
+        raise CodecError('truncated block')
+    (checksum,) = _CHECKSUM.unpack_from(data, end)
+    if zlib.crc32(data[offset:end]) != checksum:
+        raise CodecError(f'checksum mismatch in block at byte {offset}')
+
+    sizes = np.frombuffer(data, dtype='<u4', count=n_sizes, offset=pos)
+    pos += 4 * n_sizes
+    tags = np.frombuffer(data, dtype=np.uint8, count=count, offset=pos)
+    pos += count
+    deltas = decode_varints(data[pos:pos + delta_len], count)
+    pos += delta_len
+    if np.any((tags >= n_sizes) & (tags < CUSTOM)):
+        raise CodecError('size code outside the block dictionary')
+
+    timestamps = base + np.cumsum(unzigzag(deltas))
+    table = np.zeros(256, dtype=np.int64)
+    table[:n_sizes] = sizes
+    amounts = table[tags]
+    refs = np.full(count, -1, dtype=np.int64)
+    carriers = np.flatnonzero(tags >= CUSTOM)
+    counts = _extras_counts(tags[carriers])
+    extras = decode_varints(data[pos:pos + extra_len], int(counts.sum()))
+    if len(carriers):
+        first = np.cumsum(counts) - counts
+        amounts[carriers] = unzigzag(extras[first])
+        corrections = counts == 2
+        refs[carriers[corrections]] = extras[first[corrections] + 1].astype(np.int64)
+    return timestamps, amounts, refs, end + _CHECKSUM.size
+
+
+def decode_events(blob) -> Dict[str, np.ndarray]:
+    """Decode every block into 'timestamps', 'amounts' and 'refs' columns"""
+    data = memoryview(blob).cast('B')
+    columns = {'timestamps': [], 'amounts': [], 'refs': []}
+    offset = 0
+    while offset < len(data):
+        timestamps, amounts, refs, offset = _decode_block(data, offset)
+        columns['timestamps'].append(timestamps)
+        columns['amounts'].append(amounts)
+        columns['refs'].append(refs)
+    return {
+        name: np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+        for name, parts in columns.items()
+    }
@@ -0,0 +1,103 @@
+"""
+Content catalog for WaterBuddy
+Age-specific messages, tips and quotes are loaded once from JSON locale
+bundles into immutable lookup tables. Missing translations fall back to
+English at load time, so a message lookup is a single dict access and the
+daily tip/quote pick is a stable hash of (user, kind, day)
+"""
+
+import glob
+import hashlib
+import json
+import os
+from types import MappingProxyType
+from typing import Dict, Iterable, Tuple
+
+BUILTIN_CONTENT_DIR = os.path.join(os.path.dirname(__file__), 'data', 'content')
+DEFAULT_LOCALE = 'en'
+
+
+def stable_index(size: int, *parts) -> int:
+    """Deterministic index in range(size) derived from parts"""
+    seed = ':'.join(str(part) for part in parts).encode('utf-8')
+    digest = hashlib.blake2b(seed, digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % size
+
+
+class ContentCatalog:
+    """Read-only content for every locale, merged from one or more bundles
+
+    A bundle is a JSON object such as
+    {"locale": "en",
+     "messages": {"adult": {"greeting": "...", ...}, ...},
+     "tips": {"adult": ["...", ...], ...},
+     "quotes": {...}}.
+    Later bundles for the same locale override messages and add tips/quotes.
+    """
+
+    def __init__(self, lists: Dict[Tuple[str, str, str], Tuple[str, ...]],
+                 messages: Dict[Tuple[str, str, str], str]):
+        self._lists = MappingProxyType(lists)
+        self._messages = MappingProxyType(messages)
+        self.locales = tuple(sorted({key[0] for key in lists} | {key[0] for key in messages}))
+
+    @classmethod
+    def from_bundles(cls, bundles: Iterable[dict]) -> 'ContentCatalog':
+        lists: Dict[Tuple[str, str, str], list] = {}
+        messages: Dict[Tuple[str, str, str], str] = {}
+        for bundle in bundles:
+            locale = bundle.get('locale', DEFAULT_LOCALE)
+            for group, texts in bundle.get('messages', {}).items():
+                for message_type, text in texts.items():
+                    messages[(locale, group, message_type)] = text
+            for kind, groups in bundle.items():
+                if kind in ('locale', 'messages'):
+                    continue
+                for group, items in groups.items():
+                    lists.setdefault((locale, kind, group), []).extend(items)
+
+        # Resolve English fallbacks now so lookups never need a second probe
+        locales = {key[0] for key in lists} | {key[0] for key in messages}
+        for (locale, group, message_type), text in list(messages.items()):
+            if locale == DEFAULT_LOCALE:
+                for other in locales:
+                    messages.setdefault((other, group, message_type), text)
+        for (locale, kind, group), items in list(lists.items()):
+            if locale == DEFAULT_LOCALE:
+                for other in locales:
+                    lists.setdefault((other, kind, group), items)
+
+        return cls({key: tuple(items) for key, items in lists.items()}, messages)
+
+    @classmethod
+    def load(cls, extra_dir: str = '') -> 'ContentCatalog':
+        """Every built-in locale bundle plus the *.json bundles in extra_dir
+
+        Built-in bundles default to the locale in their file name; extra
+        bundles without a "locale" key extend English.
+        """
+        sources = [(path, os.path.splitext(os.path.basename(path))[0])
+                   for path in sorted(glob.glob(os.path.join(BUILTIN_CONTENT_DIR, '*.json')))]
+        if extra_dir:
+            sources.extend((path, DEFAULT_LOCALE) for path in sorted(glob.glob(os.path.join(extra_dir, '*.json'))))
+        bundles = []
+        for path, default_locale in sources:
+            with open(path, encoding='utf-8') as f:
+                bundle = json.load(f)
+            bundle.setdefault('locale', default_locale)
+            bundles.append(bundle)
+        return cls.from_bundles(bundles)
+
+    def message(self, age_group: str, message_type: str, locale: str = DEFAULT_LOCALE) -> str:
+        """Age-specific message text ('' if unknown)"""
+        return self._messages.get((locale, age_group, message_type), '')
+
+    def items(self, kind: str, age_group: str, locale: str = DEFAULT_LOCALE) -> Tuple[str, ...]:
+        return self._lists.get((locale, kind, age_group), ())
+
+    def daily(self, kind: str, age_group: str, user_id: str, day, locale: str = DEFAULT_LOCALE) -> str:
+        """The entry shown to a user on a given day (stable across reruns)"""
+        items = self.items(kind, age_group, locale)
+        if not items:
+            return ''
+        return items[stable_index(len(items), user_id, kind, day)]
@@ -0,0 +1,202 @@
+"""
+In-process event bus for WaterBuddy
+An intake is published once; consumers subscribe to a topic and run either
+inline in the publishing thread or deferred on a dispatcher (thread pool or
+asyncio loop), so click latency does not grow with every new consumer
+"""
+
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+INTAKE_LOGGED = 'intake.logged'
+INTAKE_CORRECTED = 'intake.corrected'
+RECORD_CHANGED = 'record.changed'
+
+Handler = Callable[[Any], Any]
+
+
+class IntakeEvent(NamedTuple):
+    """One logged drink"""
+    user_id: str
+    timestamp: float
+    amount: int
+    day: int
+    hour: int
+    event_id: str = ''
+
+
+class IntakeCorrection(NamedTuple):
+    """An edit or undo of a logged drink
+
+    `index` is the drink's place in the session's log; the drink's time and
+    logged amount find it in the durable log that other sessions share.
+    """
+    user_id: str
+    timestamp: float
+    index: int
+    delta: int
+    day: int
+    hour: int
+    removed: bool
+    drink_timestamp: int
+    drink_amount: int
+
+
+class _Lane:
+    """FIFO of pending events for one deferred handler"""
+
+    __slots__ = ('handler', 'queue', 'scheduled')
+
+    def __init__(self, handler: Handler):
+        self.handler = handler
+        self.queue: deque = deque()
+        self.scheduled = False
+
+
+class SyncDispatcher:
+    """Run deferred handlers immediately in the publishing thread"""
+
+    def submit(self, run: Callable[[], None]):
+        run()
+
+    def wait(self, coroutine) -> Any:
+        return asyncio.run(coroutine)
+
+    def shutdown(self):
+        pass
+
+
+class ThreadPoolDispatcher(SyncDispatcher):
+    """Run deferred handlers on a shared thread pool"""
+
+    def __init__(self, max_workers: int = 4):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='waterbuddy-events')
+
+    def submit(self, run: Callable[[], None]):
+        self._executor.submit(run)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+class AsyncioDispatcher:
+    """Run deferred handlers around an asyncio loop in a background thread
+
+    Plain handlers run in the loop's default executor; coroutine handlers
+    are awaited on the one shared loop, so they can share async clients.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='waterbuddy-events', daemon=True)
+        self._thread.start()
+
+    def submit(self, run: Callable[[], None]):
+        self._loop.call_soon_threadsafe(self._loop.run_in_executor, None, run)
+
+    def wait(self, coroutine) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def shutdown(self):
+        asyncio.run_coroutine_threadsafe(self._loop.shutdown_default_executor(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+DISPATCHERS = {
+    'sync': SyncDispatcher,
+    'thread': ThreadPoolDispatcher,
+    'asyncio': AsyncioDispatcher,
+}
+
+
+class EventBus:
+    """Topic-based publish/subscribe
+
+    Inline handlers run first, in subscription order, and their exceptions
+    propagate to the publisher. Deferred handlers then run on the
+    dispatcher; each one sees its events in publish order, while
+    different handlers run concurrently. Their failures are counted rather
+    than raised.
+    """
+
+    def __init__(self, dispatcher=None):
+        self.dispatcher = dispatcher or SyncDispatcher()
+        self._inline: Dict[str, List[Handler]] = {}
+        self._deferred: Dict[str, List[_Lane]] = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self.failures = 0
+        self.last_error: Optional[BaseException] = None
+
+    def subscribe(self, topic: str, handler: Handler, deferred: bool = False) -> Handler:
+        with self._lock:
+            if deferred:
+                self._deferred.setdefault(topic, []).append(_Lane(handler))
+            else:
+                self._inline.setdefault(topic, []).append(handler)
+        return handler
+
+    def unsubscribe(self, topic: str, handler: Handler):
+        with self._lock:
+            if handler in self._inline.get(topic, ()):
+                self._inline[topic].remove(handler)
+            self._deferred[topic] = [lane for lane in self._deferred.get(topic, ()) if lane.handler is not handler]
+
+    def subscribers(self, topic: str) -> Tuple[int, int]:
+        """Number of inline and deferred handlers on a topic"""
+        return len(self._inline.get(topic, ())), len(self._deferred.get(topic, ()))
+
+    def publish(self, topic: str, event: Any):
+        """Deliver an event to every subscriber of topic"""
+        for handler in list(self._inline.get(topic, ())):
+            handler(event)
+        to_schedule = []
+        with self._lock:
+            for lane in self._deferred.get(topic, ()):
+                lane.queue.append(event)
+                self._pending += 1
+                if not lane.scheduled:
+                    lane.scheduled = True
+                    to_schedule.append(lane)
+        for lane in to_schedule:
+            self.dispatcher.submit(lambda lane=lane: self._drain(lane))
+
+    def _drain(self, lane: _Lane):
+        while True:
+            with self._lock:
+                if not lane.queue:
+                    lane.scheduled = False
+                    return
+                event = lane.queue.popleft()
+            try:
+                result = lane.handler(event)
+                if asyncio.iscoroutine(result):
+                    self.dispatcher.wait(result)
+            except Exception as error:  # one bad consumer must not stop the others
+                with self._lock:
+                    self.failures += 1
+                    self.last_error = error
+            finally:
+                with self._lock:
+                    self._pending -= 1
+                    if not self._pending:
+                        self._idle.notify_all()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every deferred event has been handled"""
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        self.flush(timeout)
+        self.dispatcher.shutdown()
@@ -0,0 +1,140 @@
+"""
+Intake pace forecasting for WaterBuddy
+Projects end-of-day intake and the time the daily goal will be reached from
+today's partial intake, the user's typical daily volume and their learned
+hourly drinking profile
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+DAILY_HALF_LIFE = 7
+MINUTES = np.arange(24 * 60 + 1)
+
+
+class PaceForecaster:
+    """Online model of one user's daily volume with a cached prediction
+
+    The typical daily volume is an exponentially weighted mean of closed
+    days, folded in as soon as an intake (or prediction) lands on a new day.
+    Predictions are memoized until the model, intake, goal or minute changes.
+    """
+
+    def __init__(self, half_life: float = DAILY_HALF_LIFE):
+        self.alpha = 1 - 0.5 ** (1 / half_life)
+        self.daily_mean: Optional[float] = None
+        # The first closed day seeds the mean instead of being blended in
+        self.first_day: Optional[int] = None
+        self.day: Optional[int] = None
+        self.day_total = 0
+        self.version = 0
+        self._cache_key = None
+        self._cache_value = None
+
+    @classmethod
+    def from_daily_totals(cls, totals, today: int, half_life: float = DAILY_HALF_LIFE) -> 'PaceForecaster':
+        """Fit from daily totals ending with today's (oldest first)"""
+        model = cls(half_life)
+        totals = np.asarray(totals, dtype=float)
+        if len(totals) > 1:
+            # Same weights the online update gives: the first day seeds the mean
+            closed = totals[:-1]
+            weights = model.alpha * (1 - model.alpha) ** np.arange(len(closed))[::-1]
+            weights[0] = (1 - model.alpha) ** (len(closed) - 1)
+            model.daily_mean = float(np.dot(weights, closed))
+        if len(totals):
+            model.first_day = int(today) - len(totals) + 1
+            model.day = int(today)
+            model.day_total = int(totals[-1])
+        return model
+
+    @classmethod
+    def from_pyramid(cls, pyramid, today: int, lookback: int = 90,
+                     half_life: float = DAILY_HALF_LIFE) -> 'PaceForecaster':
+        """Fit from the daily totals of an IntakePyramid"""
+        if pyramid.first_day is None or pyramid.last_day > today:
+            return cls(half_life)
+        totals = np.r_[pyramid.days, np.zeros(today - pyramid.last_day)]
+        return cls.from_daily_totals(totals[-lookback:], today, half_life)
+
+    def close_days(self, day: int):
+        """Fold finished days (including skipped, zero-intake ones) into the mean"""
+        if self.day is None:
+            self.day = int(day)
+            self.first_day = int(day)
+            return
+        if day <= self.day:
+            return
+        if self.daily_mean is None:
+            self.daily_mean = float(self.day_total)
+        else:
+            self.daily_mean += self.alpha * (self.day_total - self.daily_mean)
+        skipped = day - self.day - 1
+        if skipped:
+            self.daily_mean *= (1 - self.alpha) ** skipped
+        self.day = int(day)
+        self.day_total = 0
+        self.version += 1
+
+    def observe(self, day: int, amount: int):
+        """Update the model with one intake event"""
+        self.close_days(day)
+        self.day_total += amount
+        self.version += 1
+
+    def adjust(self, day: int, amount: int):
+        """Correct the total of today or an already closed day by amount ml
+
+        A closed day's correction is scaled by the weight that day still has
+        in the mean, so nothing is refitted.
+        """
+        if self.day is None or day > self.day:
+            self.observe(day, amount)
+            return
+        if day == self.day:
+            self.day_total += amount
+        elif self.daily_mean is not None:
+            first_day = getattr(self, 'first_day', None)
+            if first_day is not None and day < first_day:
+                return
+            weight = (1 - self.alpha) ** (self.day - 1 - day)
+            if day != first_day:
+                weight *= self.alpha
+            self.daily_mean += weight * amount
+        self.version += 1
+
+    def predict(self, profile, today: int, current_intake: int, daily_goal: int, now_minute: int) -> Dict:
+        """Projected end-of-day intake and the minute the goal is reached
+
+        Returns `end_of_day` (ml), `goal_minute` (minute of day, or None if the
+        goal is not expected today) and `reached` (goal already met).
+        """
+        self.close_days(today)
+        key = (self.version, profile.last_day, float(profile.weights.sum()), current_intake, daily_goal, now_minute)
+        if key == self._cache_key:
+            return self._cache_value
+
+        typical = self.daily_mean if self.daily_mean else float(daily_goal)
+        share = profile.expected_share(MINUTES)
+        share_now = share[now_minute]
+        expected_now = typical * share_now
+        ratio = current_intake / expected_now if expected_now > 0 else 1.0
+        # Trust today's pace more the further into the usual drinking day we are
+        pace = share_now * ratio + (1 - share_now)
+
+        projected = current_intake + typical * pace * (share - share_now)
+        end_of_day = float(projected[-1])
+        if current_intake >= daily_goal:
+            goal_minute = now_minute
+        else:
+            ahead = np.flatnonzero(projected[now_minute:] >= daily_goal)
+            goal_minute = int(now_minute + ahead[0]) if len(ahead) else None
+
+        value = {
+            'end_of_day': int(round(end_of_day)),
+            'goal_minute': goal_minute,
+            'reached': current_intake >= daily_goal,
+        }
+        self._cache_key, self._cache_value = key, value
+        return value
@@ -0,0 +1,61 @@
+"""
+Server-rendered SVG progress gauge for WaterBuddy
+A half-ring gauge drawn as a few SVG arcs: colored bands for the 0-50,
+50-75 and 75-100% steps, the progress bar and a goal tick. The markup is
+a few hundred bytes and needs no JavaScript to render
+"""
+
+import math
+from functools import lru_cache
+
+# Gauge geometry in viewBox units
+WIDTH, HEIGHT = 200, 130
+CENTER_X, CENTER_Y = 100, 116
+BAND_RADIUS, BAND_WIDTH = 80, 24
+BAR_WIDTH = 12
+
+
+def hex_to_rgba(hex_color: str, opacity: float = 0.2) -> str:
+    """Convert a #rrggbb color to rgba() with an opacity"""
+    hex_color = hex_color.lstrip('#')
+    r, g, b = (int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+    return f'rgba({r},{g},{b},{opacity})'
+
+
+def _point(pct: float, radius: float) -> str:
+    """Point of the half ring at pct percent (0 left, 100 right)"""
+    angle = math.pi * (1 - pct / 100)
+    return f'{CENTER_X + radius * math.cos(angle):.1f} {CENTER_Y - radius * math.sin(angle):.1f}'
+
+
+def _arc(start: float, end: float, color: str, width: float) -> str:
+    return (f'<path d="M{_point(start, BAND_RADIUS)}A{BAND_RADIUS} {BAND_RADIUS} 0 0 1 {_point(end, BAND_RADIUS)}" '
+            f'stroke="{color}" stroke-width="{width}" fill="none"/>')
+
+
+@lru_cache(maxsize=1024)
+def gauge_svg(pct: int, primary: str, secondary: str, accent: str, title: str = 'Daily Goal Progress') -> str:
+    """Half-ring gauge of pct percent (clamped to 0..100) as a single-line SVG
+
+    Cached per (percent, colors): one entry per age group theme and whole
+    percent, so a rerun reuses the markup instead of rebuilding it.
+    """
+    pct = max(0, min(100, int(pct)))
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {HEIGHT}" role="img" '
+        f'aria-label="{title}: {pct}%" style="width:100%;max-height:300px">',
+        f'<text x="{CENTER_X}" y="14" text-anchor="middle" font-size="11" fill="currentColor">{title}</text>',
+        _arc(0, 50, hex_to_rgba(secondary), BAND_WIDTH),
+        _arc(50, 75, hex_to_rgba(primary), BAND_WIDTH),
+        _arc(75, 100, hex_to_rgba(accent), BAND_WIDTH),
+    ]
+    if pct:
+        parts.append(_arc(0, pct, primary, BAR_WIDTH))
+    tick_inner, tick_outer = _point(100, BAND_RADIUS - BAND_WIDTH / 2), _point(100, BAND_RADIUS + BAND_WIDTH / 2)
+    parts += [
+        f'<path d="M{tick_inner}L{tick_outer}" stroke="{accent}" stroke-width="4"/>',
+        f'<text x="{CENTER_X}" y="{CENTER_Y}" text-anchor="middle" font-size="30" font-weight="700" '
+        f'fill="{primary}">{pct}%</text>',
+        '</svg>',
+    ]
+    return ''.join(parts)
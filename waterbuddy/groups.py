@@ -0,0 +1,297 @@
+"""
+Group analytics for WaterBuddy
+Each family/workplace group keeps its members' recent daily intake in one
+dense matrix plus per-age-group totals and goal-met counts per day. Logging
+an intake updates those counters in O(1), so group dashboards read a handful
+of numbers instead of iterating every member
+"""
+
+import secrets
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+GROUP_AGE_GROUPS = ('children', 'teen', 'adult', 'senior')
+WINDOW_DAYS = 28
+
+# Code every family-mode user used to share by default; records still on
+# it are moved to a private group when they are restored
+LEGACY_DEFAULT_GROUP = 'family'
+
+# Store namespace prefix of the groups' shared standings; each group has its
+# own namespace with one key per member, so members never rewrite each other
+LEADERBOARD_NAMESPACE = 'leaderboards'
+
+
+class GroupAnalytics:
+    """Rolling per-member daily intake for one group
+
+    Day columns form a ring buffer of `window_days` local day numbers, so
+    the matrix never grows with time, only with members. `age_sum`,
+    `age_met` (age group x day column) and `age_members` are the running
+    aggregates every summary is read from.
+    """
+
+    def __init__(self, window_days: int = WINDOW_DAYS, age_groups: Sequence[str] = GROUP_AGE_GROUPS,
+                 capacity: int = 64):
+        self.window_days = window_days
+        self.age_groups = tuple(age_groups)
+        self.last_day: Optional[int] = None
+        self.intake = np.zeros((capacity, window_days), dtype=np.int64)
+        self.goal = np.zeros(capacity, dtype=np.int64)
+        self.age = np.zeros(capacity, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.age_sum = np.zeros((len(self.age_groups), window_days), dtype=np.int64)
+        self.age_met = np.zeros((len(self.age_groups), window_days), dtype=np.int64)
+        self.age_members = np.zeros(len(self.age_groups), dtype=np.int64)
+        self.rows: Dict[str, int] = {}
+        self._free = list(range(capacity - 1, -1, -1))
+        self.version = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self.rows
+
+    def _grow(self):
+        old = len(self.goal)
+        size = 2 * old
+        self.intake = np.vstack([self.intake, np.zeros((size - old, self.window_days), dtype=np.int64)])
+        for name in ('goal', 'age', 'active'):
+            values = getattr(self, name)
+            setattr(self, name, np.concatenate([values, np.zeros(size - old, dtype=values.dtype)]))
+        self._free.extend(range(size - 1, old - 1, -1))
+
+    def _advance(self, day: int):
+        """Move the window forward so day is its newest column"""
+        if self.last_day is None:
+            self.last_day = day
+            return
+        if day <= self.last_day:
+            return
+        for new_day in range(self.last_day + 1, min(day, self.last_day + self.window_days) + 1):
+            col = new_day % self.window_days
+            self.intake[:, col] = 0
+            self.age_sum[:, col] = 0
+            self.age_met[:, col] = 0
+        self.last_day = day
+
+    def _column(self, day: int) -> Optional[int]:
+        if self.last_day is None or not self.last_day - self.window_days < day <= self.last_day:
+            return None
+        return day % self.window_days
+
+    def _row_met(self, row: int) -> np.ndarray:
+        return (self.intake[row] >= self.goal[row]).astype(np.int64)
+
+    def join(self, user_id: str, age_group: str, goal: int, day: int, intake_today: int = 0):
+        """Add a member, or update an existing member's age group and goal"""
+        with self._lock:
+            self._advance(day)
+            age = self.age_groups.index(age_group)
+            row = self.rows.get(user_id)
+            if row is None:
+                if not self._free:
+                    self._grow()
+                row = self._free.pop()
+                self.rows[user_id] = row
+                self.active[row] = True
+                self.intake[row] = 0
+                self.goal[row] = goal
+                self.age[row] = age
+                self.age_members[age] += 1
+                self.age_met[age] += self._row_met(row)
+                self.record(user_id, day, intake_today - int(self.intake[row, day % self.window_days]))
+            elif self.goal[row] != goal or self.age[row] != age:
+                # Move the member's contributions to the new age group / goal: O(window)
+                old_age = self.age[row]
+                self.age_sum[old_age] -= self.intake[row]
+                self.age_met[old_age] -= self._row_met(row)
+                self.age_members[old_age] -= 1
+                self.goal[row] = goal
+                self.age[row] = age
+                self.age_sum[age] += self.intake[row]
+                self.age_met[age] += self._row_met(row)
+                self.age_members[age] += 1
+            self.version += 1
+
+    def leave(self, user_id: str):
+        with self._lock:
+            row = self.rows.pop(user_id, None)
+            if row is None:
+                return
+            age = self.age[row]
+            self.age_sum[age] -= self.intake[row]
+            self.age_met[age] -= self._row_met(row)
+            self.age_members[age] -= 1
+            self.active[row] = False
+            self.intake[row] = 0
+            self._free.append(row)
+            self.version += 1
+
+    def record(self, user_id: str, day: int, amount: int):
+        """Add amount ml (negative for corrections) to a member's local day"""
+        with self._lock:
+            row = self.rows.get(user_id)
+            if row is None or not amount:
+                return
+            self._advance(day)
+            col = self._column(day)
+            if col is None:
+                return
+            age = self.age[row]
+            before = self.intake[row, col] >= self.goal[row]
+            self.intake[row, col] += amount
+            after = self.intake[row, col] >= self.goal[row]
+            self.age_sum[age, col] += amount
+            self.age_met[age, col] += int(after) - int(before)
+            self.version += 1
+
+    def set_intake(self, user_id: str, day: int, total: int):
+        """Set a member's total for a day (e.g. from standings written elsewhere)"""
+        with self._lock:
+            row = self.rows.get(user_id)
+            col = self._column(day)
+            current = int(self.intake[row, col]) if row is not None and col is not None else 0
+            self.record(user_id, day, total - current)
+
+    def summary(self, day: int) -> Dict:
+        """Members, average intake and share meeting their goal, overall and per age group"""
+        with self._lock:
+            col = self._column(day)
+            members = self.age_members.copy()
+            totals = self.age_sum[:, col].copy() if col is not None else np.zeros_like(members)
+            met = self.age_met[:, col].copy() if col is not None else np.zeros_like(members)
+        count = int(members.sum())
+        return {
+            'members': count,
+            'average_intake': float(totals.sum() / count) if count else 0.0,
+            'pct_meeting_goal': float(100 * met.sum() / count) if count else 0.0,
+            'by_age': {
+                name: {
+                    'members': int(members[i]),
+                    'average_intake': float(totals[i] / members[i]) if members[i] else 0.0,
+                    'pct_meeting_goal': float(100 * met[i] / members[i]) if members[i] else 0.0,
+                }
+                for i, name in enumerate(self.age_groups)
+            },
+        }
+
+    def trend(self, end_day: int, days: int = 7) -> Dict[str, np.ndarray]:
+        """Daily average intake and % meeting goal for the days up to end_day"""
+        day_numbers = np.arange(end_day - days + 1, end_day + 1)
+        with self._lock:
+            members = int(self.age_members.sum())
+            valid = np.array([self._column(int(day)) is not None for day in day_numbers])
+            cols = day_numbers % self.window_days
+            totals = np.where(valid, self.age_sum[:, cols].sum(axis=0), 0)
+            met = np.where(valid, self.age_met[:, cols].sum(axis=0), 0)
+        return {
+            'day': day_numbers,
+            'average_intake': totals / max(members, 1),
+            'pct_meeting_goal': 100 * met / max(members, 1),
+        }
+
+    def distribution(self, day: int, edges: Sequence[int]) -> np.ndarray:
+        """Member counts per age group (rows) and intake bin (columns) for a day
+
+        Bins are [edges[i], edges[i + 1]) with a last open-ended bin.
+        """
+        edges = np.asarray(edges)
+        with self._lock:
+            col = self._column(day)
+            active = self.active.copy()
+            intake = self.intake[:, col][active] if col is not None else np.zeros(int(active.sum()), dtype=np.int64)
+            age = self.age[active]
+        bins = np.clip(np.searchsorted(edges, intake, side='right') - 1, 0, len(edges) - 1)
+        counts = np.bincount(age * len(edges) + bins, minlength=len(self.age_groups) * len(edges))
+        return counts.reshape(len(self.age_groups), len(edges))
+
+
+class GroupRegistry:
+    """All groups in the process and which group each user belongs to"""
+
+    def __init__(self, window_days: int = WINDOW_DAYS, clock: Callable[[], float] = time.monotonic):
+        self.window_days = window_days
+        self.clock = clock
+        self.groups: Dict[str, GroupAnalytics] = {}
+        self.membership: Dict[str, str] = {}
+        self._synced_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def group(self, group_id: str) -> GroupAnalytics:
+        with self._lock:
+            if group_id not in self.groups:
+                self.groups[group_id] = GroupAnalytics(self.window_days)
+            return self.groups[group_id]
+
+    def join(self, user_id: str, group_id: str, age_group: str, goal: int, day: int, intake_today: int = 0):
+        """Put a user in a group, leaving their previous one"""
+        previous = self.membership.get(user_id)
+        if previous is not None and previous != group_id:
+            self.group(previous).leave(user_id)
+        self.membership[user_id] = group_id
+        self.group(group_id).join(user_id, age_group, goal, day, intake_today)
+
+    def leave(self, user_id: str):
+        group_id = self.membership.pop(user_id, None)
+        if group_id is not None:
+            self.group(group_id).leave(user_id)
+
+    def record(self, user_id: str, day: int, amount: int):
+        group_id = self.membership.get(user_id)
+        if group_id is not None:
+            self.group(group_id).record(user_id, day, amount)
+
+    def sync(self, group_id: str, standings: Dict[str, dict]):
+        """Align a group with shared standings, which include other processes' members"""
+        group = self.group(group_id)
+        for user_id in list(group.rows):
+            if user_id not in standings:
+                group.leave(user_id)
+                self.membership.pop(user_id, None)
+        for user_id, entry in standings.items():
+            self.join(user_id, group_id, entry['age_group'], entry['goal'], entry['day'], entry['intake'])
+            group.set_intake(user_id, entry['day'], entry['intake'])
+        self._synced_at[group_id] = self.clock()
+
+    def refresh(self, group_id: str, load: Callable[[], Dict[str, dict]], max_age: float):
+        """sync() a group from load() if it was last synced more than max_age seconds ago"""
+        synced_at = self._synced_at.get(group_id)
+        if synced_at is None or self.clock() - synced_at >= max_age:
+            self.sync(group_id, load())
+        return self.group(group_id)
+
+
+def new_group_code() -> str:
+    """Random, hard-to-guess code for a new group; members join by sharing it"""
+    return secrets.token_urlsafe(6)
+
+
+def standings_namespace(group_id: str) -> str:
+    """Store namespace holding a group's standings"""
+    return f'{LEADERBOARD_NAMESPACE}.{group_id}'
+
+
+def publish_standing(store, group_id: str, user_id: str, entry: Optional[dict]):
+    """Write (or with entry None, remove) a user's row in a group's shared standings"""
+    if entry is None:
+        store.delete(standings_namespace(group_id), user_id)
+    else:
+        store.put(standings_namespace(group_id), user_id, entry)
+
+
+def read_standings(store, group_id: str) -> Dict[str, dict]:
+    """A group's shared standings: {user_id: entry}"""
+    namespace = standings_namespace(group_id)
+    standings = {}
+    for user_id in store.keys(namespace):
+        entry = store.get(namespace, user_id)
+        # A member may leave between listing and reading
+        if entry is not None:
+            standings[user_id] = entry
+    return standings
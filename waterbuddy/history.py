@@ -0,0 +1,355 @@
+"""
+Columnar intake history for WaterBuddy
+Events are kept as parallel NumPy arrays (UTC seconds, ml) so analytics can
+scan years of history without touching per-event Python objects
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from waterbuddy.codec import decode_events, encode_events
+from waterbuddy.timezones import SECONDS_PER_DAY, day_to_date, local_days
+
+# Widest UTC offset in either direction (UTC-12 .. UTC+14), rounded up
+MAX_UTC_OFFSET = 15 * 3600
+
+# Store namespace of each user's durable log of (timestamp, amount, ref) rows
+HISTORY_NAMESPACE = 'history'
+
+
+def day_range(timestamps: np.ndarray, start_day: int, end_day: int) -> slice:
+    """Index range of sorted timestamps that may fall on local days start_day..end_day
+
+    The range is padded by the widest UTC offset; filter by local day to
+    get exact membership.
+    """
+    lo = np.searchsorted(timestamps, start_day * SECONDS_PER_DAY - MAX_UTC_OFFSET, side='left')
+    hi = np.searchsorted(timestamps, (end_day + 1) * SECONDS_PER_DAY + MAX_UTC_OFFSET, side='left')
+    return slice(int(lo), int(hi))
+
+
+class IntakeLog:
+    """Append-only intake history stored column-wise
+
+    Events are appended in time order, so the log is sorted and time ranges
+    can be located with a binary search. `version` increases on every
+    mutation and can be used as a cache key for derived data.
+
+    A drink is never rewritten in place: an edit or undo appends a
+    compensating entry that refers to the drink it amends, and the drink's
+    current amount is kept alongside it. `timestamps` and `amounts` show
+    the drinks as corrected (undone drinks are left out); `entries()` gives
+    the raw log including compensating entries.
+
+    Indices are positions in the full raw log. compact_before() drops the
+    oldest entries (see waterbuddy.retention) and advances `base`, the
+    index of the first entry kept, so later indices never shift.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._timestamps = np.empty(capacity, dtype=np.int64)
+        self._amounts = np.empty(capacity, dtype=np.int32)
+        # -1 for a drink, else the index of the drink a compensating entry amends
+        self._refs = np.empty(capacity, dtype=np.int64)
+        # Current amount of each drink after corrections (0 for compensating entries)
+        self._net = np.empty(capacity, dtype=np.int32)
+        self._size = 0
+        self.base = 0
+        self.corrections = 0
+        self.version = 0
+        self._drinks_version = -1
+        self._drinks: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_entries(cls, rows) -> 'IntakeLog':
+        """Rebuild a log from raw (timestamp, amount, ref) rows in one pass"""
+        if not len(rows):
+            return cls()
+        return cls.from_columns(*(np.asarray(column) for column in zip(*rows)))
+
+    @classmethod
+    def from_columns(cls, timestamps: np.ndarray, amounts: np.ndarray, refs: np.ndarray,
+                     base: int = 0) -> 'IntakeLog':
+        """Rebuild a log from raw columns, as returned by entries(), starting at index base"""
+        log = cls(max(64, len(timestamps)))
+        log.base = base
+        if not len(timestamps):
+            return log
+        # amend() never lets a correction go back in time
+        timestamps = np.maximum.accumulate(timestamps)
+        size = len(timestamps)
+        log._timestamps[:size] = timestamps
+        log._amounts[:size] = amounts
+        log._refs[:size] = refs
+        corrections = refs >= 0
+        log._net[:size] = np.where(corrections, 0, amounts)
+        # Corrections are rare: check each one, in log order, against the drink it amends
+        for entry in np.flatnonzero(corrections).tolist():
+            position = int(refs[entry]) - base
+            delta = int(amounts[entry])
+            if 0 <= position < entry and log._refs[position] < 0 and log._net[position] + delta >= 0:
+                log._net[position] += delta
+            else:
+                # Not a drink, or more than is left of it: keep the entry's place as a void()
+                log._amounts[entry] = 0
+                log._refs[entry] = base + entry
+        log._size = size
+        log.corrections = int(corrections.sum())
+        log.version = 1
+        return log
+
+    @staticmethod
+    def row(timestamp: float, amount: int, ref: int = -1) -> tuple:
+        """The raw row append() or amend() adds, for writing to a durable log"""
+        return (int(timestamp), int(amount), int(ref))
+
+    def encode(self) -> bytes:
+        """The raw log in the compact block format of waterbuddy.codec"""
+        columns = self.entries()
+        return encode_events(columns['timestamps'], columns['amounts'], columns['refs'])
+
+    @classmethod
+    def decode(cls, blob: bytes, base: int = 0) -> 'IntakeLog':
+        columns = decode_events(blob)
+        return cls.from_columns(columns['timestamps'], columns['amounts'], columns['refs'], base)
+
+    def __getstate__(self):
+        # Pickles (snapshots, idle sessions) hold the encoded log, a few bytes per event
+        return {'encoded': self.encode(), 'base': self.base, 'version': self.version}
+
+    def __setstate__(self, state):
+        if 'encoded' in state:
+            self.__dict__.update(IntakeLog.decode(state['encoded'], state.get('base', 0)).__dict__)
+            self.version = state['version']
+            return
+        # Logs pickled before corrections existed hold drinks only
+        self.__dict__.update(state)
+        self.__dict__.setdefault('base', 0)
+        if '_refs' not in state:
+            self._refs = np.full(len(self._timestamps), -1, dtype=np.int64)
+            self._net = self._amounts.copy()
+            self.corrections = 0
+            self._drinks_version = -1
+            self._drinks = None
+
+    def __len__(self) -> int:
+        return len(self._drink_index()) if self.corrections else self._size
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    @property
+    def end(self) -> int:
+        """Index the next raw entry will get (the durable log length it mirrors)"""
+        return self.base + self._size
+
+    def _drink_index(self) -> np.ndarray:
+        """Raw indices of the drinks that still count, cached per version"""
+        if self._drinks_version != self.version:
+            size = self._size
+            self._drinks = np.flatnonzero((self._refs[:size] < 0) & (self._net[:size] != 0))
+            self._drinks_version = self.version
+        return self._drinks
+
+    def _column(self, values: np.ndarray) -> np.ndarray:
+        view = values[:self._size] if not self.corrections else values[self._drink_index()]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """UTC seconds of every drink (read-only)"""
+        return self._column(self._timestamps)
+
+    @property
+    def amounts(self) -> np.ndarray:
+        """Amount in ml of every drink after corrections (read-only)"""
+        return self._column(self._net)
+
+    def entries(self) -> Dict[str, np.ndarray]:
+        """Raw columns including compensating entries (read-only views)"""
+        columns = {'timestamps': self._timestamps, 'amounts': self._amounts, 'refs': self._refs}
+        views = {}
+        for name, values in columns.items():
+            views[name] = values[:self._size]
+            views[name].flags.writeable = False
+        return views
+
+    def _reserve(self, needed: int):
+        if needed > len(self._timestamps):
+            capacity = max(64, needed, 2 * len(self._timestamps))
+            self._timestamps = np.resize(self._timestamps, capacity)
+            self._amounts = np.resize(self._amounts, capacity)
+            self._refs = np.resize(self._refs, capacity)
+            self._net = np.resize(self._net, capacity)
+
+    def append(self, timestamp: float, amount: int) -> int:
+        """Add a drink and return its index"""
+        self._reserve(self._size + 1)
+        index = self._size
+        self._timestamps[index] = int(timestamp)
+        self._amounts[index] = amount
+        self._refs[index] = -1
+        self._net[index] = amount
+        self._size += 1
+        self.version += 1
+        return self.base + index
+
+    def extend(self, timestamps, amounts):
+        """Append many drinks at once (timestamps must not go backwards)"""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        amounts = np.asarray(amounts, dtype=np.int32)
+        needed = self._size + len(timestamps)
+        self._reserve(needed)
+        self._timestamps[self._size:needed] = timestamps
+        self._amounts[self._size:needed] = amounts
+        self._refs[self._size:needed] = -1
+        self._net[self._size:needed] = amounts
+        self._size = needed
+        self.version += 1
+
+    def amount_of(self, index: int) -> int:
+        """Current amount of a drink (0 once undone)"""
+        return int(self._net[self._check_drink(index)])
+
+    def logged_amount(self, index: int) -> int:
+        """Amount a drink was logged with, before any corrections"""
+        return int(self._amounts[self._check_drink(index)])
+
+    def timestamp_of(self, index: int) -> int:
+        """UTC seconds of a drink"""
+        return int(self._timestamps[self._check_drink(index)])
+
+    def _check_drink(self, index: int) -> int:
+        """Array position of a drink's index (IndexError for compacted or compensating entries)"""
+        position = index - self.base
+        if not 0 <= position < self._size or self._refs[position] >= 0:
+            raise IndexError(f"no drink at index {index}")
+        return position
+
+    def amend(self, index: int, delta: int, timestamp: float) -> int:
+        """Change a drink by delta ml with a compensating entry, returning its index
+
+        `timestamp` is when the correction was made; it only orders the raw
+        log; the amended drink keeps its own time. O(1) amortized.
+        """
+        position = self._check_drink(index)
+        if self._net[position] + delta < 0:
+            raise ValueError(f"drink {index} has only {int(self._net[position])}ml")
+        self._reserve(self._size + 1)
+        entry = self._size
+        last = self._timestamps[entry - 1] if entry else 0
+        self._timestamps[entry] = max(int(timestamp), int(last))
+        self._amounts[entry] = delta
+        self._refs[entry] = index
+        self._net[entry] = 0
+        self._net[position] += delta
+        self._size += 1
+        self.corrections += 1
+        self.version += 1
+        return self.base + entry
+
+    def void(self, timestamp: float) -> int:
+        """Add a compensating entry that changes nothing, returning its index
+
+        Stands in for a durable correction that is rejected on replay, so
+        indices stay equal to durable log positions. It refers to itself,
+        which never holds back compact_before().
+        """
+        self._reserve(self._size + 1)
+        entry = self._size
+        last = self._timestamps[entry - 1] if entry else 0
+        self._timestamps[entry] = max(int(timestamp), int(last))
+        self._amounts[entry] = 0
+        self._refs[entry] = self.base + entry
+        self._net[entry] = 0
+        self._size += 1
+        self.corrections += 1
+        self.version += 1
+        return self.base + entry
+
+    def drinks_since(self, index: int) -> Optional[Dict[str, np.ndarray]]:
+        """'timestamps' and corrected 'amounts' of the drinks from index on
+
+        None if the log no longer holds index, or if an entry from there on
+        amends an earlier drink, so the drinks before index have changed.
+        """
+        start = index - self.base
+        if not 0 <= start <= self._size:
+            return None
+        refs = self._refs[start:self._size]
+        if np.any((refs >= 0) & (refs < index)):
+            return None
+        drinks = (refs < 0) & (self._net[start:self._size] != 0)
+        return {'timestamps': self._timestamps[start:self._size][drinks],
+                'amounts': self._net[start:self._size][drinks]}
+
+    def compact_before(self, timestamp: float) -> Dict[str, np.ndarray]:
+        """Drop the entries logged before timestamp, returning the drinks dropped
+
+        Returns 'timestamps' and corrected 'amounts' of the dropped drinks
+        (undone drinks are left out), for rolling up elsewhere. A drink that
+        a kept correction refers to is kept along with everything after it.
+        """
+        size = self._size
+        refs = self._refs[:size]
+        cut = int(np.searchsorted(self._timestamps[:size], int(timestamp), side='left'))
+        while True:
+            kept = refs[cut:]
+            dangling = kept[(kept >= 0) & (kept < self.base + cut)]
+            if not len(dangling):
+                break
+            cut = int(dangling.min()) - self.base
+        drinks = (refs[:cut] < 0) & (self._net[:cut] != 0)
+        dropped = {'timestamps': self._timestamps[:cut][drinks].copy(), 'amounts': self._net[:cut][drinks].copy()}
+        if cut:
+            self.corrections -= int(np.count_nonzero(refs[:cut] >= 0))
+            remaining = size - cut
+            for name in ('_timestamps', '_amounts', '_refs', '_net'):
+                values = getattr(self, name)
+                kept_values = np.empty(max(64, remaining), dtype=values.dtype)
+                kept_values[:remaining] = values[cut:size]
+                setattr(self, name, kept_values)
+            self._size = remaining
+            self.base += cut
+            self.version += 1
+        return dropped
+
+    def day_range(self, start_day: int, end_day: int) -> slice:
+        """Index range of drinks that may fall on local days start_day..end_day"""
+        return day_range(self.timestamps, start_day, end_day)
+
+    def count_on_day(self, day: int, zone_name: str) -> int:
+        """Number of events on one local day"""
+        window = self.day_range(day, day)
+        return int(np.count_nonzero(local_days(self.timestamps[window], zone_name) == day))
+
+    def tail(self, count: int) -> List[Dict]:
+        """The latest drinks, newest first, with the index to amend them by"""
+        if self.corrections:
+            drinks = self._drink_index()
+            indices = drinks[max(0, len(drinks) - count):][::-1]
+        else:
+            indices = np.arange(max(0, self._size - count), self._size)[::-1]
+        return [
+            {
+                'index': self.base + int(index),
+                'timestamp': datetime.fromtimestamp(int(self._timestamps[index]), timezone.utc),
+                'amount': int(self._net[index]),
+            }
+            for index in indices
+        ]
+
+    def records(self, zone_name: str) -> List[Dict]:
+        """Every event as a dict with its local day (for export)"""
+        days = local_days(self.timestamps, zone_name)
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(int(ts), timezone.utc),
+                'amount': int(amount),
+                'date': day_to_date(day),
+            }
+            for ts, amount, day in zip(self.timestamps, self.amounts, days)
+        ]
@@ -0,0 +1,82 @@
+"""
+Idempotent intake logging for WaterBuddy
+Each intake carries an ID derived from what the client clicked on; IDs seen
+within a short window are rejected before they reach history, totals or
+badges, so double-taps and replayed reruns log a drink only once
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+DEDUP_WINDOW_SECONDS = 30
+MAX_TRACKED_IDS = 100_000
+
+
+def intake_event_id(user_id: str, render_id: str, source: str, amount: int) -> str:
+    """Stable ID for one click: the same user, page render, button and amount"""
+    seed = f'{user_id}:{render_id}:{source}:{amount}'.encode('utf-8')
+    return hashlib.blake2b(seed, digest_size=16).hexdigest()
+
+
+def client_event_id(user_id: str, client_id: str) -> str:
+    """Stable ID for a tap the client buffered under its own ID"""
+    seed = f'{user_id}:client:{client_id}'.encode('utf-8')
+    return hashlib.blake2b(seed, digest_size=16).hexdigest()
+
+
+class RecentIds:
+    """Bounded set of IDs seen within the last window_seconds
+
+    IDs are kept in insertion order, so expired entries are always at the
+    front and both expiry and the size bound cost O(1) per insert. Exact
+    membership (unlike a Bloom filter) means a genuine drink is never
+    rejected as a false positive.
+    """
+
+    def __init__(self, window_seconds: float = DEDUP_WINDOW_SECONDS, max_size: int = MAX_TRACKED_IDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.window_seconds = window_seconds
+        self.max_size = max_size
+        self.clock = clock
+        self.rejected = 0
+        self._seen: 'OrderedDict[str, float]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._seen:
+            seen_at = next(iter(self._seen.values()))
+            if seen_at > cutoff and len(self._seen) <= self.max_size:
+                break
+            self._seen.popitem(last=False)
+
+    def add(self, event_id: str) -> bool:
+        """Record an ID; False if it was already seen inside the window"""
+        now = self.clock()
+        with self._lock:
+            self._expire(now)
+            if event_id in self._seen:
+                self.rejected += 1
+                return False
+            self._seen[event_id] = now
+            if len(self._seen) > self.max_size:
+                self._seen.popitem(last=False)
+            return True
+
+    def discard(self, event_id: str):
+        """Forget an ID, e.g. when logging it failed and a retry must go through"""
+        with self._lock:
+            self._seen.pop(event_id, None)
+
+    def __contains__(self, event_id: str) -> bool:
+        with self._lock:
+            self._expire(self.clock())
+            return event_id in self._seen
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(self.clock())
+            return len(self._seen)
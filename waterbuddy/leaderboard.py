@@ -0,0 +1,81 @@
+"""
+Leaderboard ranking for WaterBuddy
+Standings are sorted once on the server with numpy and cut into pages, so
+the screen renders one fixed-size table whatever the size of the group.
+The current user's row is pinned on top of every page they are not on
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZE = 25
+SORT_KEYS = ('intake', 'streak')
+MEDALS = ('🥇', '🥈', '🥉')
+COLUMNS = ('Rank', 'Name', 'Intake (ml)', 'Streak (days)')
+
+
+def rank_order(users: Sequence[Dict], sort_by: str = 'intake') -> np.ndarray:
+    """Indices of users from first to last place
+
+    Highest `sort_by` first; ties go to the other key, then to name order.
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Unknown leaderboard sort key: {sort_by}")
+    if not users:
+        return np.zeros(0, dtype=np.int64)
+    other = SORT_KEYS[1 - SORT_KEYS.index(sort_by)]
+    primary = np.fromiter((user[sort_by] for user in users), dtype=np.int64, count=len(users))
+    secondary = np.fromiter((user[other] for user in users), dtype=np.int64, count=len(users))
+    names = np.array([user['name'] for user in users], dtype=str)
+    # lexsort sorts by the last key first
+    return np.lexsort((names, -secondary, -primary))
+
+
+def rank_places(users: Sequence[Dict], order: np.ndarray) -> Dict[str, int]:
+    """user_id -> 0-based place in `order`, so a user's rank is one lookup"""
+    return {users[index]['user_id']: place for place, index in enumerate(order.tolist())}
+
+
+def page_count(total: int, page_size: int = PAGE_SIZE) -> int:
+    """Number of pages for `total` rows (an empty board still has one page)"""
+    return max(1, -(-total // page_size))
+
+
+def rank_label(position: int) -> str:
+    """Medal for the top three places, else the 1-based place"""
+    return MEDALS[position] if position < len(MEDALS) else f"{position + 1}."
+
+
+def leaderboard_page(users: Sequence[Dict], order: np.ndarray, page: int, page_size: int = PAGE_SIZE,
+                     pinned: Optional[int] = None) -> Tuple[pd.DataFrame, Optional[int]]:
+    """One page of the ranked board, plus the pinned user's row position
+
+    `page` is 0-based and clamped to the last page. `pinned` is the current
+    user's place (from rank_places); when it is outside the page, their row
+    is put first with its real rank. Their name is marked "(you)", and the
+    second value is the frame row holding it, or None if they are not on
+    the board.
+    """
+    last = page_count(len(order), page_size) - 1
+    page = min(max(page, 0), last)
+    positions = list(range(page * page_size, min((page + 1) * page_size, len(order))))
+
+    pinned_row = None
+    if pinned is not None:
+        if pinned not in positions:
+            positions.insert(0, pinned)
+        pinned_row = positions.index(pinned)
+
+    rows = [users[order[i]] for i in positions]
+    names = [user['name'] for user in rows]
+    if pinned_row is not None:
+        names[pinned_row] += ' (you)'
+    frame = pd.DataFrame({
+        'Rank': [rank_label(i) for i in positions],
+        'Name': names,
+        'Intake (ml)': np.array([user['intake'] for user in rows], dtype=np.int32),
+        'Streak (days)': np.array([user['streak'] for user in rows], dtype=np.int32),
+    }, columns=list(COLUMNS))
+    return frame, pinned_row
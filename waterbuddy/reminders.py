@@ -0,0 +1,124 @@
+"""
+Adaptive reminder planning for WaterBuddy
+Each user's typical drinking times are learned as an exponentially decayed
+hourly histogram. Reminders are placed inside the learned active window and
+skipped when the user is already ahead of their usual pace
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from waterbuddy.timezones import bucket_events
+
+HALF_LIFE_DAYS = 14
+DEFAULT_WINDOW = (7, 22)
+# Decayed ml needed before the learned window replaces the default
+MIN_PROFILE_ML = 1500
+# Share of daily intake that falls before / after the active window
+WINDOW_TAIL = 0.05
+
+
+def decay_weights(weights: np.ndarray, elapsed_days, half_life: float = HALF_LIFE_DAYS) -> np.ndarray:
+    """Age hourly histograms by elapsed_days (scalar or one value per row)"""
+    factor = np.power(0.5, np.asarray(elapsed_days, dtype=float) / half_life)
+    return weights * (factor[..., None] if np.ndim(factor) else factor)
+
+
+def active_windows(weights: np.ndarray, tail: float = WINDOW_TAIL) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end hour of the active window for each row of a (n, 24) matrix
+
+    The window spans the hours holding the middle 1 - 2 * tail of intake;
+    rows without enough history get DEFAULT_WINDOW.
+    """
+    weights = np.atleast_2d(weights)
+    totals = weights.sum(axis=1)
+    cumulative = np.cumsum(weights, axis=1) / np.maximum(totals, 1e-9)[:, None]
+    start = np.argmax(cumulative > tail, axis=1)
+    end = np.argmax(cumulative >= 1 - tail, axis=1) + 1
+    learned = totals >= MIN_PROFILE_ML
+    return np.where(learned, start, DEFAULT_WINDOW[0]), np.where(learned, end, DEFAULT_WINDOW[1])
+
+
+class DrinkingProfile:
+    """Decayed ml per local hour of day for one user"""
+
+    def __init__(self, half_life: float = HALF_LIFE_DAYS):
+        self.half_life = half_life
+        self.weights = np.zeros(24)
+        self.last_day: Optional[int] = None
+
+    @classmethod
+    def from_log(cls, log, zone_name: str, today: int, half_life: float = HALF_LIFE_DAYS) -> 'DrinkingProfile':
+        """Learn a profile from existing history in one vectorized pass"""
+        days, hours = bucket_events(log.timestamps, zone_name)
+        return cls.from_events(days, hours, log.amounts, today, half_life)
+
+    @classmethod
+    def from_events(cls, days, hours, amounts, today: int, half_life: float = HALF_LIFE_DAYS) -> 'DrinkingProfile':
+        """Learn a profile from (local day, local hour, ml) columns"""
+        profile = cls(half_life)
+        if len(days):
+            age = np.maximum(today - np.asarray(days), 0)
+            decayed = np.asarray(amounts) * np.power(0.5, age / half_life)
+            profile.weights = np.bincount(hours, weights=decayed, minlength=24).astype(float)
+            profile.last_day = int(today)
+        return profile
+
+    def decay_to(self, day: int):
+        """Age the histogram to a local day number"""
+        if self.last_day is not None and day > self.last_day:
+            self.weights = decay_weights(self.weights, day - self.last_day, self.half_life)
+        if self.last_day is None or day > self.last_day:
+            self.last_day = int(day)
+
+    def observe(self, day: int, hour: int, amount: int):
+        """Learn from one intake event"""
+        self.decay_to(day)
+        self.weights[int(hour)] += amount
+
+    def adjust(self, day: int, hour: int, amount: int):
+        """Correct an intake from any day by amount ml, decayed by its age"""
+        self.decay_to(day)
+        age = self.last_day - day
+        hour = int(hour)
+        self.weights[hour] = max(self.weights[hour] + amount * 0.5 ** (age / self.half_life), 0.0)
+
+    @property
+    def learned(self) -> bool:
+        return self.weights.sum() >= MIN_PROFILE_ML
+
+    def window(self) -> Tuple[int, int]:
+        start, end = active_windows(self.weights)
+        return int(start[0]), int(end[0])
+
+    def expected_share(self, minutes: np.ndarray) -> np.ndarray:
+        """Typical share of the day's intake drunk by each minute of the day"""
+        if self.learned:
+            hourly = self.weights / self.weights.sum()
+        else:
+            start, end = DEFAULT_WINDOW
+            hourly = np.zeros(24)
+            hourly[start:end] = 1 / (end - start)
+        cumulative = np.r_[0, np.cumsum(hourly)]
+        return np.interp(np.asarray(minutes) / 60, np.arange(25), cumulative)
+
+
+def plan_reminders(profile: DrinkingProfile, frequency_minutes: int, current_intake: int,
+                   daily_goal: int, now_minutes: int) -> List[Dict]:
+    """Today's reminder slots with a status each
+
+    status is 'passed' for slots before now, 'skip' when the user is already
+    at or ahead of the intake they usually have by then, and 'due' otherwise.
+    """
+    start, end = profile.window()
+    minutes = np.arange(start * 60, end * 60, max(int(frequency_minutes), 1))
+    expected = profile.expected_share(minutes) * daily_goal
+    status = np.where(
+        minutes < now_minutes, 'passed',
+        np.where((current_intake >= daily_goal) | (current_intake >= expected), 'skip', 'due')
+    )
+    return [
+        {'time': f"{m // 60:02d}:{m % 60:02d}", 'minute': int(m), 'expected': int(e), 'status': str(s)}
+        for m, e, s in zip(minutes, expected, status)
+    ]
@@ -0,0 +1,96 @@
+"""
+Minimal Redis protocol (RESP2) client for WaterBuddy
+Just enough of the wire protocol for the shared-state backend: commands are
+sent as arrays of bulk strings and replies are decoded into Python values,
+so any Redis-compatible server works without a client library
+"""
+
+import socket
+from typing import Any, List, Optional, Union
+from urllib.parse import unquote, urlparse
+
+
+class RespError(Exception):
+    """Error reply from the server"""
+
+
+def encode_command(*args) -> bytes:
+    """Encode a command as a RESP array of bulk strings"""
+    parts = [b'*%d\r\n' % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode('utf-8')
+        elif isinstance(arg, int):
+            arg = str(arg).encode('ascii')
+        parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+    return b''.join(parts)
+
+
+def read_reply(stream) -> Any:
+    """Decode one reply from a binary file-like stream
+
+    Simple strings are returned as str, bulk strings as bytes (None for
+    nil), integers as int and arrays as lists. Error replies are returned
+    as RespError instances so a transaction's results can hold them.
+    """
+    line = stream.readline()
+    if not line:
+        raise ConnectionError('connection closed by server')
+    kind, payload = line[:1], line[1:-2]
+    if kind == b'+':
+        return payload.decode('utf-8')
+    if kind == b'-':
+        return RespError(payload.decode('utf-8'))
+    if kind == b':':
+        return int(payload)
+    if kind == b'$':
+        size = int(payload)
+        if size < 0:
+            return None
+        data = stream.read(size + 2)
+        return data[:-2]
+    if kind == b'*':
+        count = int(payload)
+        if count < 0:
+            return None
+        return [read_reply(stream) for _ in range(count)]
+    raise RespError(f'unexpected reply type {kind!r}')
+
+
+class RespClient:
+    """One connection to a Redis-compatible server (not thread-safe)"""
+
+    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, timeout: float = 5.0):
+        self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._stream = self._socket.makefile('rb')
+        if password:
+            self.execute('AUTH', password)
+        if db:
+            self.execute('SELECT', db)
+
+    @classmethod
+    def from_url(cls, url: str, timeout: float = 5.0) -> 'RespClient':
+        """Connect using a redis://[:password@]host[:port][/db] URL"""
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip('/') or 0)
+        password = unquote(parsed.password) if parsed.password else None
+        return cls(parsed.hostname or 'localhost', parsed.port or 6379, db, password, timeout)
+
+    def execute(self, *args) -> Any:
+        """Send one command and return its reply, raising RespError on errors"""
+        self._socket.sendall(encode_command(*args))
+        reply = read_reply(self._stream)
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    def pipeline(self, commands: List[tuple]) -> List[Union[Any, RespError]]:
+        """Send several commands in one round trip and return every reply"""
+        self._socket.sendall(b''.join(encode_command(*command) for command in commands))
+        return [read_reply(self._stream) for _ in commands]
+
+    def close(self):
+        self._stream.close()
+        self._socket.close()
@@ -0,0 +1,126 @@
+"""
+Tiered retention for WaterBuddy intake history
+Raw drink events are kept for a configurable number of days. Older drinks
+are rolled up into per-hour totals, and old hours into per-day totals, when
+a user's log is snapshotted. Every tier keeps ml and glass counts, so
+lifetime totals and daily totals stay exact while the raw history a user
+stores (and every scan of it) stops growing
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+from waterbuddy.timezones import SECONDS_PER_DAY, SECONDS_PER_HOUR, local_seconds
+
+RAW_RETENTION_DAYS = 90
+HOURLY_RETENTION_DAYS = 365
+
+# Drinks stop being editable this many days before they may be archived; the
+# margin covers timezone offsets and workers whose day has already rolled over
+EDIT_MARGIN_DAYS = 2
+
+
+class RetentionPolicy:
+    """How long raw events and hourly rollups are kept before rolling up further"""
+
+    def __init__(self, raw_days: int = RAW_RETENTION_DAYS, hourly_days: int = HOURLY_RETENTION_DAYS):
+        if hourly_days < raw_days:
+            raise ValueError('hourly rollups must be kept at least as long as raw events')
+        if raw_days <= EDIT_MARGIN_DAYS:
+            raise ValueError(f'raw events must be kept for more than {EDIT_MARGIN_DAYS} days')
+        self.raw_days = raw_days
+        self.hourly_days = hourly_days
+
+    def editable_since(self, today: int) -> int:
+        """UTC seconds of the oldest drink that can still be edited on local day today
+
+        Only drinks this recent are corrected, so every correction reaches
+        its drink while the drink is still raw: a snapshot can archive older
+        ones at any time, after which a correction has nothing to amend.
+        """
+        return (today - self.raw_days + EDIT_MARGIN_DAYS) * SECONDS_PER_DAY
+
+
+def _merge(keys: np.ndarray, ml: np.ndarray, glasses: np.ndarray, new_keys, new_ml, new_glasses):
+    """Sorted union of two (key, ml, glasses) tables, summing rows with equal keys"""
+    all_keys = np.concatenate([keys, np.asarray(new_keys, dtype=np.int64)])
+    merged, slots = np.unique(all_keys, return_inverse=True)
+    ml = np.bincount(slots, weights=np.concatenate([ml, new_ml]), minlength=len(merged)).astype(np.int64)
+    glasses = np.bincount(slots, weights=np.concatenate([glasses, new_glasses]), minlength=len(merged))
+    return merged, ml, glasses.astype(np.int64)
+
+
+class IntakeArchive:
+    """Per-hour and per-day totals of drinks compacted out of a user's raw log
+
+    Hours and days are local to `zone_name`, the user's timezone when the
+    first drinks were archived, so each archived drink stays on the local
+    day it was logged on even if the user moves later.
+    """
+
+    def __init__(self, zone_name: str = 'UTC'):
+        self.zone_name = zone_name
+        self.hours = np.zeros(0, dtype=np.int64)
+        self.hour_ml = np.zeros(0, dtype=np.int64)
+        self.hour_glasses = np.zeros(0, dtype=np.int64)
+        self.days = np.zeros(0, dtype=np.int64)
+        self.day_ml = np.zeros(0, dtype=np.int64)
+        self.day_glasses = np.zeros(0, dtype=np.int64)
+        self.version = 0
+
+    def __len__(self) -> int:
+        """Number of rollup rows"""
+        return len(self.hours) + len(self.days)
+
+    @property
+    def total_ml(self) -> int:
+        return int(self.hour_ml.sum() + self.day_ml.sum())
+
+    @property
+    def total_glasses(self) -> int:
+        return int(self.hour_glasses.sum() + self.day_glasses.sum())
+
+    def add_drinks(self, timestamps, amounts):
+        """Roll drinks up into the hourly tier"""
+        if not len(timestamps):
+            return
+        hours = local_seconds(timestamps, self.zone_name) // SECONDS_PER_HOUR
+        self.hours, self.hour_ml, self.hour_glasses = _merge(
+            self.hours, self.hour_ml, self.hour_glasses, hours, amounts, np.ones(len(hours))
+        )
+        self.version += 1
+
+    def roll_hours(self, before_day: int):
+        """Move hourly rows of local days before before_day into the daily tier"""
+        old = self.hours < before_day * 24
+        if not old.any():
+            return
+        self.days, self.day_ml, self.day_glasses = _merge(
+            self.days, self.day_ml, self.day_glasses,
+            self.hours[old] // 24, self.hour_ml[old], self.hour_glasses[old]
+        )
+        self.hours, self.hour_ml, self.hour_glasses = self.hours[~old], self.hour_ml[~old], self.hour_glasses[~old]
+        self.version += 1
+
+    def daily(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Local day and ml of every archived day (hourly rows summed per day)"""
+        return (np.concatenate([self.days, self.hours // 24]),
+                np.concatenate([self.day_ml, self.hour_ml]))
+
+    def hourly(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Local day, local hour and ml of the hourly tier"""
+        return self.hours // 24, self.hours % 24, self.hour_ml
+
+
+def apply_retention(log, archive: IntakeArchive, policy: RetentionPolicy, today: int) -> Dict[str, int]:
+    """Compact a log's raw events older than the policy allows into archive
+
+    Returns how many drinks were archived and how many hourly rows were
+    rolled into days.
+    """
+    dropped = log.compact_before((today - policy.raw_days) * SECONDS_PER_DAY)
+    archive.add_drinks(dropped['timestamps'], dropped['amounts'])
+    hours_before = len(archive.hours)
+    archive.roll_hours(today - policy.hourly_days)
+    return {'drinks': len(dropped['timestamps']), 'hours': hours_before - len(archive.hours)}
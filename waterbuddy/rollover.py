@@ -0,0 +1,356 @@
+"""
+Day rollover batch job for WaterBuddy
+At each user's local midnight the day's intake is finalized into a daily
+rollup, streaks are updated and streak badges awarded - for all users in
+vectorized batches instead of lazily on their next dashboard visit
+"""
+
+import threading
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from waterbuddy.reminders import decay_weights
+from waterbuddy.timezones import (
+    EPOCH_ORDINAL,
+    SECONDS_PER_DAY,
+    get_zone,
+    local_seconds_multi,
+    local_today,
+)
+
+USERS_NAMESPACE = 'users'
+ROLLUPS_NAMESPACE = 'rollups'
+INDEX_NAMESPACE = 'index'
+USER_ZONES_KEY = 'user_zones'
+
+# Badge key -> streak length that earns it
+STREAK_BADGES = (('week-streak', 7), ('consistent', 10), ('month-streak', 30))
+
+BATCH_SIZE = 4096
+
+
+def next_local_midnight(zone_name: str, now: Optional[datetime] = None) -> datetime:
+    """UTC instant of the next midnight in a timezone"""
+    zone = get_zone(zone_name)
+    now = now or datetime.now(timezone.utc)
+    tomorrow = now.astimezone(zone).date() + timedelta(days=1)
+    return datetime.combine(tomorrow, dt_time(0), tzinfo=zone).astimezone(timezone.utc)
+
+
+def local_today_ordinals(zone_names: Sequence[str], now: Optional[datetime] = None) -> np.ndarray:
+    """Local date ordinal for every user from the cached zone offset tables"""
+    now = now or datetime.now(timezone.utc)
+    timestamps = np.full(len(zone_names), int(now.timestamp()), dtype=np.int64)
+    return local_seconds_multi(timestamps, zone_names) // SECONDS_PER_DAY + EPOCH_ORDINAL
+
+
+def roll_batch(
+    today: np.ndarray,
+    last_day: np.ndarray,
+    intake: np.ndarray,
+    goal: np.ndarray,
+    streak: np.ndarray,
+    best_streak: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """Vectorized day close for a batch of users
+
+    A user is due when their local date has moved past the day their intake
+    belongs to. The closing day extends the streak if its goal was met; any
+    fully missed day in between breaks it.
+    """
+    due = today > last_day
+    met = intake >= goal
+    closed = np.where(met, streak + 1, 0)
+    new_streak = np.where(due, np.where(today - last_day == 1, closed, 0), streak)
+    new_best = np.where(due, np.maximum(best_streak, closed), best_streak)
+    result = {'due': due, 'met': met, 'streak': new_streak, 'best_streak': new_best}
+    for badge, length in STREAK_BADGES:
+        result[badge] = due & (closed >= length)
+    return result
+
+
+def rollover_users(store, user_ids: Sequence[str], now: Optional[datetime] = None,
+                   batch_size: int = BATCH_SIZE) -> List[str]:
+    """Close the day for every due user among user_ids, returning those rolled"""
+    now = now or datetime.now(timezone.utc)
+    rolled = []
+    for start in range(0, len(user_ids), batch_size):
+        chunk = user_ids[start:start + batch_size]
+        records = [(uid, store.get(USERS_NAMESPACE, uid)) for uid in chunk]
+        records = [(uid, rec) for uid, rec in records if rec and rec.get('today_date')]
+        if not records:
+            continue
+
+        today = local_today_ordinals([rec.get('timezone', 'UTC') for _, rec in records], now)
+        result = roll_batch(
+            today=today,
+            last_day=np.array([rec['today_date'].toordinal() for _, rec in records], dtype=np.int64),
+            intake=np.array([rec.get('current_intake', 0) for _, rec in records], dtype=np.int64),
+            goal=np.array([rec.get('daily_goal', 2000) for _, rec in records], dtype=np.int64),
+            streak=np.array([rec.get('streak', 0) for _, rec in records], dtype=np.int64),
+            best_streak=np.array([rec.get('best_streak', 0) for _, rec in records], dtype=np.int64),
+        )
+
+        profiles = _decay_profiles(records, today - EPOCH_ORDINAL, result['due'])
+
+        for i in np.flatnonzero(result['due']):
+            uid, snapshot = records[i]
+            earned = [badge for badge, _ in STREAK_BADGES if result[badge][i]]
+            outcome = (int(result['streak'][i]), int(result['best_streak'][i]), bool(result['met'][i]), earned)
+            if _close_day(store, uid, now, snapshot, outcome, profiles.get(i)):
+                rolled.append(uid)
+    return rolled
+
+
+def _decay_profiles(records, today_days: np.ndarray, due: np.ndarray) -> Dict[int, object]:
+    """Age the drinking profiles of all due users in one matrix operation"""
+    rows = [i for i in np.flatnonzero(due)
+            if records[i][1].get('drinking_profile') is not None
+            and records[i][1]['drinking_profile'].last_day is not None]
+    if not rows:
+        return {}
+    profiles = [records[i][1]['drinking_profile'] for i in rows]
+    weights = np.stack([profile.weights for profile in profiles])
+    elapsed = np.maximum(today_days[rows] - np.array([profile.last_day for profile in profiles]), 0)
+    decayed = decay_weights(weights, elapsed, profiles[0].half_life)
+    for row, profile, new_weights in zip(rows, profiles, decayed):
+        profile.weights = new_weights
+        profile.last_day = int(today_days[row])
+    return dict(zip(rows, profiles))
+
+
+def _roll_record(record: dict, today: date):
+    """Scalar fallback used when a record changed after its batch was read"""
+    result = roll_batch(
+        today=np.array([today.toordinal()]),
+        last_day=np.array([record['today_date'].toordinal()]),
+        intake=np.array([record.get('current_intake', 0)]),
+        goal=np.array([record.get('daily_goal', 2000)]),
+        streak=np.array([record.get('streak', 0)]),
+        best_streak=np.array([record.get('best_streak', 0)]),
+    )
+    earned = [badge for badge, _ in STREAK_BADGES if result[badge][0]]
+    return int(result['streak'][0]), int(result['best_streak'][0]), bool(result['met'][0]), earned
+
+
+def _close_day(store, user_id: str, now: datetime, snapshot: dict, outcome, profile=None) -> bool:
+    """Apply one user's rollover result under the store's update lock"""
+    closed = {}
+
+    def apply(record):
+        if not record:
+            return record
+        today = local_today(record.get('timezone', 'UTC'), now)
+        if today <= record['today_date']:
+            # Another worker already rolled this user
+            return record
+        streak, best_streak, met, earned = outcome
+        if any(record.get(key) != snapshot.get(key) for key in ('today_date', 'current_intake', 'daily_goal', 'streak')):
+            streak, best_streak, met, earned = _roll_record(record, today)
+            if record.get('drinking_profile') is not None:
+                record['drinking_profile'].decay_to(today.toordinal() - EPOCH_ORDINAL)
+        elif profile is not None:
+            record['drinking_profile'] = profile
+        closed.update({
+            'date': record['today_date'],
+            'intake': record.get('current_intake', 0),
+            'goal': record.get('daily_goal', 2000),
+            'met': met,
+        })
+        badges = list(record.get('badges', []))
+        badges.extend(badge for badge in earned if badge not in badges)
+        record.update({
+            'current_intake': 0,
+            'today_date': today,
+            'streak': streak,
+            'best_streak': best_streak,
+            'badges': badges,
+        })
+        return record
+
+    store.update(USERS_NAMESPACE, user_id, apply)
+    if not closed:
+        return False
+
+    def append_rollup(rollups):
+        rollups = rollups or {}
+        rollups[closed['date']] = closed
+        return rollups
+
+    store.update(ROLLUPS_NAMESPACE, user_id, append_rollup)
+    return True
+
+
+def _run_length(rollups: Dict[date, dict], day: date, step: int) -> int:
+    """Number of consecutive goal-met days next to day, walking step days at a time"""
+    length = 0
+    current = day + timedelta(days=step)
+    while rollups.get(current, {}).get('met'):
+        length += 1
+        current += timedelta(days=step)
+    return length
+
+
+def _longest_run(rollups: Dict[date, dict]) -> int:
+    longest = run = 0
+    previous = None
+    for day in sorted(rollups):
+        met = rollups[day].get('met')
+        run = run + 1 if met and previous is not None and day - previous == timedelta(days=1) else int(bool(met))
+        longest = max(longest, run)
+        previous = day
+    return longest
+
+
+def restreak(rollups: Dict[date, dict], day: date, today: date, streak: int, best_streak: int):
+    """Streak and best streak after the goal status of a closed day flipped
+
+    Only the run through `day` is walked. All rollups are rescanned just
+    when a broken run may have been the best one.
+    """
+    left = _run_length(rollups, day, -1)
+    right = _run_length(rollups, day, 1)
+    reaches_today = day + timedelta(days=right + 1) == today
+    if rollups[day]['met']:
+        run = left + 1 + right
+        return (run if reaches_today else streak), max(best_streak, run)
+    if reaches_today:
+        streak = right
+    if left + 1 + right >= best_streak:
+        best_streak = max(_longest_run(rollups), streak)
+    return streak, best_streak
+
+
+def correct_closed_day(store, user_id: str, day: date, delta: int, today: date,
+                       streak: int, best_streak: int, badges: Sequence[str], goal: int = 2000):
+    """Apply an intake correction to a day the rollover job has already closed
+
+    The day's rollup total changes by delta. If that flips whether its goal
+    was met, streak and best streak are adjusted, and streak badges follow
+    the best streak. Returns (streak, best_streak, badges).
+    """
+    result = {}
+
+    def apply(rollups):
+        rollups = rollups or {}
+        closed = dict(rollups.get(day) or {'date': day, 'intake': 0, 'goal': goal, 'met': False})
+        was_met = closed['met']
+        closed['intake'] += delta
+        closed['met'] = bool(closed['intake'] >= closed['goal'])
+        rollups[day] = closed
+        if closed['met'] != was_met:
+            result['streaks'] = restreak(rollups, day, today, streak, best_streak)
+        return rollups
+
+    store.update(ROLLUPS_NAMESPACE, user_id, apply)
+    streak, best_streak = result.get('streaks', (streak, best_streak))
+    badges = [badge for badge in badges if dict(STREAK_BADGES).get(badge, 0) <= best_streak]
+    badges.extend(badge for badge, length in STREAK_BADGES if length <= best_streak and badge not in badges)
+    return streak, best_streak, badges
+
+
+def register_user_zone(store, user_id: str, zone_name: str):
+    """Record which timezone a user's midnight follows"""
+    def apply(index):
+        index = index or {}
+        index[user_id] = zone_name
+        return index
+
+    store.update(INDEX_NAMESPACE, USER_ZONES_KEY, apply)
+
+
+def unregister_user(store, user_id: str):
+    """Remove a user from the rollover index"""
+    def apply(index):
+        index = index or {}
+        index.pop(user_id, None)
+        return index
+
+    store.update(INDEX_NAMESPACE, USER_ZONES_KEY, apply)
+
+
+class RolloverJob:
+    """Background thread that rolls users over at their local midnight
+
+    The thread sleeps until the earliest upcoming midnight among the known
+    timezones, then processes only the users in zones whose date changed.
+    `generation` increases whenever users were rolled so sessions can tell
+    cheaply whether to reload their record. `before_run` is called before
+    records are read, e.g. to flush user records still being written.
+    """
+
+    def __init__(self, store, max_sleep: float = 3600,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+                 before_run: Optional[Callable[[], Any]] = None):
+        self.store = store
+        self.max_sleep = max_sleep
+        self.clock = clock
+        self.before_run = before_run
+        self.generation = 0
+        self._zone_days: Dict[str, date] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'RolloverJob':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='waterbuddy-rollover', daemon=True)
+            self._thread.start()
+        return self
+
+    def wake(self):
+        """Re-plan the next run now, e.g. after a user joined a new timezone"""
+        self._wake.set()
+
+    def stop(self):
+        self._thread, thread = None, self._thread
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def run(self, now: Optional[datetime] = None) -> List[str]:
+        """Roll over every user whose timezone has passed midnight since the last run"""
+        now = now or self.clock()
+        if self.before_run is not None:
+            self.before_run()
+        with self._lock:
+            zones_by_user = self.store.get(INDEX_NAMESPACE, USER_ZONES_KEY) or {}
+            zones = set(zones_by_user.values())
+            today = {zone: local_today(zone, now) for zone in zones}
+            changed = {zone for zone in zones if self._zone_days.get(zone) != today[zone]}
+            user_ids = [uid for uid, zone in zones_by_user.items() if zone in changed]
+            rolled = rollover_users(self.store, user_ids, now) if user_ids else []
+            self._zone_days.update({zone: today[zone] for zone in changed})
+            if rolled:
+                self.generation += 1
+            return rolled
+
+    def run_for_user(self, user_id: str, now: Optional[datetime] = None) -> bool:
+        """Roll a single user over immediately (used when a request beats the job)"""
+        if self.before_run is not None:
+            self.before_run()
+        with self._lock:
+            rolled = rollover_users(self.store, [user_id], now or self.clock())
+            if rolled:
+                self.generation += 1
+            return bool(rolled)
+
+    def seconds_until_next_run(self, now: Optional[datetime] = None) -> float:
+        now = now or self.clock()
+        zones = set((self.store.get(INDEX_NAMESPACE, USER_ZONES_KEY) or {}).values())
+        if not zones:
+            return self.max_sleep
+        upcoming = min(next_local_midnight(zone, now) for zone in zones)
+        return max(1.0, min(self.max_sleep, (upcoming - now).total_seconds() + 1))
+
+    def _loop(self):
+        while self._thread is not None:
+            try:
+                self.run()
+                delay = self.seconds_until_next_run()
+            except Exception:  # keep the scheduler alive; retry on the next tick
+                delay = 60
+            self._wake.wait(delay)
+            self._wake.clear()
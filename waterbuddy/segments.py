@@ -0,0 +1,173 @@
+"""
+Memory-mapped history segments for WaterBuddy
+Whenever a user's log is snapshotted, the drinks it holds are also written
+as plain .npy column files. Readers map them with np.load(mmap_mode='r'),
+so analytics scan a user's history as typed NumPy views without
+unpickling or decoding it, and every worker process on the host shares
+the same pages of the OS page cache
+"""
+
+import os
+import tempfile
+from typing import List, Optional
+
+import numpy as np
+
+from waterbuddy.history import IntakeLog, day_range
+from waterbuddy.storage import _safe_name
+
+# Column files of a segment: <end>.<column>.npy
+SEGMENT_COLUMNS = (('timestamps', np.int64), ('amounts', np.int32))
+
+# Name of the file holding the `end` of a user's current segment
+CURRENT = 'current'
+
+
+class TailedColumn:
+    """A mapped column followed by a short in-memory tail
+
+    Slices are joined on access, so the mapped pages are never copied
+    whole. The tail must sort after the column for searchsorted().
+    """
+
+    def __init__(self, head: np.ndarray, tail: np.ndarray):
+        self.head = head
+        self.tail = np.asarray(tail, dtype=head.dtype)
+
+    def __len__(self) -> int:
+        return len(self.head) + len(self.tail)
+
+    def __getitem__(self, window: slice) -> np.ndarray:
+        start, stop, _ = window.indices(len(self))
+        split = len(self.head)
+        return np.concatenate([self.head[start:min(stop, split)],
+                               self.tail[max(start - split, 0):max(stop - split, 0)]])
+
+    def searchsorted(self, value, side: str = 'left', sorter=None) -> int:
+        # np.searchsorted() defers to this method
+        return int(np.searchsorted(self.head, value, side)) + int(np.searchsorted(self.tail, value, side))
+
+
+class MappedHistory:
+    """Read-only view of a user's drinks as of a snapshot
+
+    Offers the parts of IntakeLog that analytics read (`timestamps`,
+    `amounts`, `day_range`), backed by memory-mapped files. `end` is the
+    log's end index when the segment was written: the segment shows the
+    same drinks as any log with that end.
+    """
+
+    def __init__(self, end: int, timestamps: np.ndarray, amounts: np.ndarray):
+        self.end = end
+        self.timestamps = timestamps
+        self.amounts = amounts
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def day_range(self, start_day: int, end_day: int) -> slice:
+        """Index range of drinks that may fall on local days start_day..end_day"""
+        return day_range(self.timestamps, start_day, end_day)
+
+    def with_tail(self, timestamps: np.ndarray, amounts: np.ndarray) -> 'MappedHistory':
+        """The segment's drinks followed by drinks logged after it (IntakeLog.drinks_since)"""
+        if not len(timestamps):
+            return self
+        return MappedHistory(self.end, TailedColumn(self.timestamps, timestamps), TailedColumn(self.amounts, amounts))
+
+
+class SegmentStore:
+    """History segments of every user under one local directory
+
+    Files are written to a temporary name and renamed into place, and the
+    `current` pointer is switched last, so readers always map a complete
+    segment. Superseded files are removed; a reader that already mapped
+    them keeps its pages until it lets go of the arrays.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _directory(self, user_id: str) -> str:
+        return os.path.join(self.root, _safe_name(user_id))
+
+    def _write_atomic(self, directory: str, name: str, write):
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, os.path.join(directory, name))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def current_end(self, user_id: str) -> Optional[int]:
+        """End index of a user's current segment, None if they have none"""
+        try:
+            with open(os.path.join(self._directory(user_id), CURRENT)) as f:
+                return int(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def write(self, user_id: str, log: IntakeLog) -> bool:
+        """Write a log's drinks as the user's segment; False if a newer one is already there"""
+        current = self.current_end(user_id)
+        if current is not None and current >= log.end:
+            return False
+        directory = self._directory(user_id)
+        os.makedirs(directory, exist_ok=True)
+        columns = {'timestamps': log.timestamps, 'amounts': log.amounts}
+        for name, dtype in SEGMENT_COLUMNS:
+            values = np.ascontiguousarray(columns[name], dtype=dtype)
+            self._write_atomic(directory, f'{log.end}.{name}.npy', lambda f: np.save(f, values))
+        self._write_atomic(directory, CURRENT, lambda f: f.write(str(log.end).encode()))
+        self._remove_older(directory, log.end)
+        return True
+
+    def _remove_older(self, directory: str, end: int):
+        for name in os.listdir(directory):
+            generation = name.split('.', 1)[0]
+            if generation.isdigit() and int(generation) < end:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    # Still mapped on a platform that locks mapped files; the next write retries
+                    pass
+
+    def open(self, user_id: str, retries: int = 3) -> Optional[MappedHistory]:
+        """Map a user's current segment, None if they have none"""
+        directory = self._directory(user_id)
+        for attempt in range(retries + 1):
+            end = self.current_end(user_id)
+            if end is None:
+                return None
+            try:
+                timestamps, amounts = (
+                    np.load(os.path.join(directory, f'{end}.{name}.npy'), mmap_mode='r')
+                    for name, _ in SEGMENT_COLUMNS
+                )
+                return MappedHistory(end, timestamps, amounts)
+            except FileNotFoundError:
+                # A newer segment replaced this one between reading the pointer and the files
+                if attempt == retries:
+                    raise
+
+    def delete(self, user_id: str):
+        directory = self._directory(user_id)
+        try:
+            os.remove(os.path.join(directory, CURRENT))
+        except FileNotFoundError:
+            return
+        self._remove_older(directory, float('inf'))
+
+    def users(self) -> List[str]:
+        """Users with a current segment (as stored on disk)"""
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, CURRENT))
+        )
@@ -0,0 +1,181 @@
+"""
+Idle session management for WaterBuddy
+Heavy session fields are spilled to the persistent store once a session has
+been idle for a while and loaded back the next time that session reruns
+"""
+
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Session keys that grow with usage and are worth spilling
+HEAVY_SESSION_KEYS = ('intake_history', 'intake_pyramid', 'weekly_data', 'leaderboard_users')
+
+SPILL_NAMESPACE = 'session_spill'
+
+
+def estimate_size(obj: Any) -> int:
+    """Approximate deep memory footprint of an object in bytes"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        nbytes = getattr(item, 'nbytes', None)
+        total += sys.getsizeof(item) + (nbytes if isinstance(nbytes, int) else 0)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, '__dict__'):
+            stack.append(vars(item))
+    return total
+
+
+class _SessionEntry:
+    """Bookkeeping for one registered session"""
+
+    __slots__ = ('state', 'last_seen', 'spilled', 'closed_at')
+
+    def __init__(self, state: Any, last_seen: float):
+        self.state = state
+        self.last_seen = last_seen
+        self.spilled: Tuple[str, ...] = ()
+        self.closed_at: Optional[float] = None
+
+
+class IdleSessionManager:
+    """Track session activity and move heavy fields of idle sessions to a store
+
+    `state` objects only need mapping-style access (`in`, `[]`, `del`) and
+    must live as long as the session. With Streamlit that is the session's
+    SessionState, not the SafeSessionState wrapper each script run makes.
+    `is_alive(session_id)` tells whether a session is still connected; one
+    that has been gone for idle_seconds is dropped with its spilled fields.
+    """
+
+    def __init__(
+        self,
+        store,
+        idle_seconds: float = 900,
+        heavy_keys: Tuple[str, ...] = HEAVY_SESSION_KEYS,
+        sweep_interval: float = 60,
+        clock: Callable[[], float] = time.time,
+        is_alive: Callable[[str], bool] = lambda session_id: True,
+    ):
+        self.store = store
+        self.idle_seconds = idle_seconds
+        self.heavy_keys = tuple(heavy_keys)
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self.is_alive = is_alive
+        self._sessions: Dict[str, _SessionEntry] = {}
+        self._lock = threading.RLock()
+        self._last_sweep = clock()
+
+    def touch(self, session_id: str, state: Any) -> List[str]:
+        """Mark a session active, restore any spilled fields and sweep idle ones
+
+        Returns the keys that were restored into `state`.
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            is_new = entry is None or entry.state is not state
+            if is_new:
+                entry = _SessionEntry(state, now)
+                self._sessions[session_id] = entry
+            entry.last_seen = now
+            entry.closed_at = None
+            restored = []
+            if is_new or entry.spilled:
+                restored = self._rehydrate(session_id, entry, state)
+        if now - self._last_sweep >= self.sweep_interval:
+            self.evict_idle(now)
+        return restored
+
+    def _rehydrate(self, session_id: str, entry: _SessionEntry, state: Any) -> List[str]:
+        payload = self.store.get(SPILL_NAMESPACE, session_id)
+        entry.spilled = ()
+        if not payload:
+            return []
+        restored = []
+        for key, value in payload.items():
+            if key not in state:
+                state[key] = value
+                restored.append(key)
+        self.store.delete(SPILL_NAMESPACE, session_id)
+        return restored
+
+    def spill(self, session_id: str) -> int:
+        """Move a session's heavy fields to the store, returning bytes released"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return 0
+            state = entry.state
+            payload = {key: state[key] for key in self.heavy_keys if key in state}
+            if not payload:
+                return 0
+            self.store.put(SPILL_NAMESPACE, session_id, payload)
+            for key in payload:
+                del state[key]
+            entry.spilled = tuple(payload)
+            return estimate_size(payload)
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        """Spill every session idle for longer than idle_seconds"""
+        now = self.clock() if now is None else now
+        evicted = []
+        with self._lock:
+            self._last_sweep = now
+            for session_id, entry in list(self._sessions.items()):
+                if not self.is_alive(session_id):
+                    # Keep a disconnected session's fields until it can no longer reconnect
+                    if entry.closed_at is None:
+                        entry.closed_at = now
+                    elif now - entry.closed_at >= self.idle_seconds:
+                        del self._sessions[session_id]
+                        self.store.delete(SPILL_NAMESPACE, session_id)
+                    continue
+                if entry.spilled or now - entry.last_seen < self.idle_seconds:
+                    continue
+                if self.spill(session_id):
+                    evicted.append(session_id)
+        return evicted
+
+    def forget(self, session_id: str):
+        """Drop a session and any data it has spilled"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self.store.delete(SPILL_NAMESPACE, session_id)
+
+    def _usage(self, session_id: str, entry: _SessionEntry, now: float) -> Dict[str, Any]:
+        state = entry.state
+        sizes = {key: estimate_size(state[key]) for key in self.heavy_keys if key in state}
+        return {
+            'session_id': session_id,
+            'idle_seconds': int(now - entry.last_seen),
+            'spilled': bool(entry.spilled),
+            'bytes': sum(sizes.values()),
+            **{f'{key}_bytes': size for key, size in sizes.items()},
+        }
+
+    def usage(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Memory usage of one session's heavy fields, or None if it is not tracked"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            return self._usage(session_id, entry, self.clock()) if entry else None
+
+    def memory_report(self) -> List[Dict[str, Any]]:
+        """Per-session memory usage of the heavy fields, largest first (operators only)"""
+        now = self.clock()
+        with self._lock:
+            report = [self._usage(session_id, entry, now) for session_id, entry in self._sessions.items()]
+        report.sort(key=lambda row: row['bytes'], reverse=True)
+        return report
@@ -0,0 +1,244 @@
+"""
+Snapshots and log compaction for WaterBuddy
+Every so often a user's durable intake log is folded into a snapshot of the
+state derived from it: the columnar history, the daily rollup pyramid, the
+learned drinking profile, lifetime totals, streaks and badges. The log
+entries the snapshot covers are then trimmed, so restoring a user costs one
+snapshot plus a short tail of events, however long they have been tracking.
+Snapshots are also where a retention policy rolls old raw events up into
+the snapshot's archive, and where memory-mapped history segments are written
+"""
+
+import threading
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from waterbuddy.history import HISTORY_NAMESPACE, IntakeLog
+from waterbuddy.reminders import DrinkingProfile
+from waterbuddy.retention import IntakeArchive, RetentionPolicy, apply_retention
+from waterbuddy.rollover import USERS_NAMESPACE
+from waterbuddy.storage import LogTrimmedError
+from waterbuddy.timeseries import IntakePyramid
+from waterbuddy.timezones import bucket_events, local_days
+
+SNAPSHOTS_NAMESPACE = 'snapshots'
+SNAPSHOT_EVERY = 500
+
+# Fields copied from the user record into each snapshot
+SNAPSHOT_RECORD_KEYS = ('streak', 'best_streak', 'badges')
+
+
+def amendable(log: IntakeLog, index: int, delta: int) -> bool:
+    """Whether `index` is a drink in the log with at least -delta ml left"""
+    try:
+        return log.amount_of(index) + delta >= 0
+    except IndexError:
+        return False
+
+
+def replay(rows: Sequence[tuple], log: IntakeLog, zone_name: str, pyramid: IntakePyramid,
+           profile: DrinkingProfile):
+    """Apply raw (timestamp, amount, ref) log rows to a history and its models"""
+    for timestamp, amount, ref in rows:
+        if 0 <= ref < log.base:
+            # Only logs from before drinks stopped being editable ahead of
+            # archiving (RetentionPolicy.editable_since) can get here; the
+            # rollup keeps the drink's old amount
+            log.void(timestamp)
+            continue
+        if ref >= 0 and not amendable(log, ref, amount):
+            # Not a drink, or more than is left of it
+            log.void(timestamp)
+            continue
+        # A correction counts on the day of the drink it amends
+        day, hour = bucket_events([timestamp if ref < 0 else log.timestamp_of(ref)], zone_name)
+        if ref < 0:
+            log.append(timestamp, amount)
+        else:
+            log.amend(ref, amount, timestamp)
+        pyramid.add(int(day[0]), amount)
+        # adjust() rather than observe(): the profile may already be dated after the event
+        profile.adjust(int(day[0]), int(hour[0]), amount)
+
+
+def rebuild_models(log: IntakeLog, archive: IntakeArchive, zone_name: str, today: int):
+    """Daily rollup pyramid and drinking profile from raw history plus its archive"""
+    archived_days, archived_ml = archive.daily()
+    pyramid = IntakePyramid.from_days(
+        np.concatenate([archived_days, local_days(log.timestamps, zone_name)]),
+        np.concatenate([archived_ml, log.amounts])
+    )
+    days, hours = bucket_events(log.timestamps, zone_name)
+    archived_days, archived_hours, archived_ml = archive.hourly()
+    profile = DrinkingProfile.from_events(
+        np.concatenate([archived_days, days]), np.concatenate([archived_hours, hours]),
+        np.concatenate([archived_ml, log.amounts]), today
+    )
+    return pyramid, profile
+
+
+def with_totals(state: Dict) -> Dict:
+    """Set a restored state's lifetime totals from its history plus archive"""
+    log, archive = state['history'], state['archive']
+    state['total_intake'] = int(log.amounts.sum()) + archive.total_ml
+    state['total_glasses'] = len(log) + archive.total_glasses
+    return state
+
+
+def restore_history(store, user_id: str, zone_name: str, today: int, retries: int = 3) -> Dict:
+    """A user's history, rollups and drinking profile from the latest snapshot plus the log tail
+
+    Returns a dict with 'history', 'archive', 'pyramid', 'profile',
+    'position' (log entries covered), lifetime 'total_intake' and
+    'total_glasses' as of the last replayed entry, and the snapshot's
+    streaks and badges, if any. A snapshot taken in another timezone keeps
+    its history but rebuilds the zone-dependent models from it.
+    """
+    for attempt in range(retries + 1):
+        snapshot = store.get(SNAPSHOTS_NAMESPACE, user_id)
+        start = snapshot['position'] if snapshot else 0
+        try:
+            tail = store.log_read(HISTORY_NAMESPACE, user_id, start)
+            break
+        except LogTrimmedError:
+            # Another process compacted the log between the two reads
+            if attempt == retries:
+                raise
+
+    if snapshot is None:
+        log = IntakeLog.from_entries(tail)
+        return with_totals({
+            'history': log,
+            'archive': IntakeArchive(zone_name),
+            'pyramid': IntakePyramid.from_log(log, zone_name),
+            'profile': DrinkingProfile.from_log(log, zone_name, today),
+            'position': len(tail),
+        })
+
+    state = dict(snapshot)
+    log = state['history']
+    state.setdefault('archive', IntakeArchive(state['timezone']))
+    if state['timezone'] != zone_name:
+        state['pyramid'], state['profile'] = rebuild_models(log, state['archive'], zone_name, today)
+    replay(tail, log, zone_name, state['pyramid'], state['profile'])
+    state['profile'].decay_to(today)
+    state['position'] = start + len(tail)
+    # The snapshot's totals predate the tail
+    return with_totals(state)
+
+
+def durable_drink(store, user_id: str, index: int, timestamp: int, amount: int, delta: int,
+                  retries: int = 3) -> Optional[int]:
+    """Position in the durable log of a drink a session amends, or None
+
+    A session numbers drinks in its own copy of the log, while every tab of
+    the user appends to the durable log, so the drink is at `index` or
+    later there. It is the first drink from there logged at `timestamp`
+    with `amount` that has at least -delta ml left; None if there is none.
+    """
+    for attempt in range(retries + 1):
+        snapshot = store.get(SNAPSHOTS_NAMESPACE, user_id)
+        start = max(index, snapshot['position'] if snapshot else 0)
+        try:
+            tail = store.log_read(HISTORY_NAMESPACE, user_id, start)
+            break
+        except LogTrimmedError:
+            # Another process compacted the log between the two reads
+            if attempt == retries:
+                raise
+
+    # Drink position -> amount left, in log order
+    left = {}
+    if snapshot and index < snapshot['position']:
+        history = snapshot['history']
+        columns = history.entries()
+        first = max(index - history.base, 0)
+        matches = np.flatnonzero((columns['refs'][first:] < 0) & (columns['timestamps'][first:] == timestamp)
+                                 & (columns['amounts'][first:] == amount)) + first + history.base
+        left = {position: history.amount_of(position) for position in matches.tolist()}
+    for position, (logged_at, logged, ref) in enumerate(tail, start):
+        if ref < 0 and logged_at == timestamp and logged == amount:
+            left[position] = logged
+        elif ref in left and left[ref] + logged >= 0:
+            left[ref] += logged
+    return next((position for position, ml in left.items() if ml + delta >= 0), None)
+
+
+def take_snapshot(store, user_id: str, today: int, policy: Optional[RetentionPolicy] = None) -> Optional[Dict]:
+    """Snapshot a user's derived state and trim the log entries it covers
+
+    With a retention policy, raw events older than it allows are rolled
+    into the snapshot's archive first. Snapshots only move forward: if
+    another process stored a newer one in the meantime, that one is kept.
+    """
+    record = store.get(USERS_NAMESPACE, user_id)
+    if record is None:
+        return None
+    zone_name = record['timezone']
+    state = restore_history(store, user_id, zone_name, today)
+    log, archive = state['history'], state['archive']
+    if policy is not None:
+        apply_retention(log, archive, policy, today)
+    with_totals(state)
+    snapshot = {
+        'position': state['position'],
+        'timezone': zone_name,
+        'day': today,
+        'history': log,
+        'archive': archive,
+        'pyramid': state['pyramid'],
+        'profile': state['profile'],
+        'total_intake': state['total_intake'],
+        'total_glasses': state['total_glasses'],
+    }
+    snapshot.update({key: record[key] for key in SNAPSHOT_RECORD_KEYS if key in record})
+
+    def newest(current):
+        return current if current and current['position'] >= snapshot['position'] else snapshot
+
+    stored = store.update(SNAPSHOTS_NAMESPACE, user_id, newest)
+    store.log_trim(HISTORY_NAMESPACE, user_id, stored['position'])
+    return stored
+
+
+class LogCompactor:
+    """Snapshot a user once `every` log entries have piled up since their last snapshot
+
+    Call appended() with the log length after each append; positions of
+    users not seen yet in this process are read from the store once. With
+    a SegmentStore, each snapshot's history is also written as a segment.
+    """
+
+    def __init__(self, store, every: int = SNAPSHOT_EVERY, policy: Optional[RetentionPolicy] = None,
+                 segments=None):
+        self.store = store
+        self.every = every
+        self.policy = policy
+        self.segments = segments
+        self.snapshots = 0
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def appended(self, user_id: str, length: int, today: int) -> bool:
+        """Note a user's new log length; True if a snapshot was taken"""
+        with self._lock:
+            position = self._positions.get(user_id)
+        if position is None:
+            snapshot = self.store.get(SNAPSHOTS_NAMESPACE, user_id)
+            position = snapshot['position'] if snapshot else 0
+        if length - position < self.every:
+            with self._lock:
+                self._positions.setdefault(user_id, position)
+            return False
+        snapshot = take_snapshot(self.store, user_id, today, self.policy)
+        if snapshot is not None and self.segments is not None:
+            self.segments.write(user_id, snapshot['history'])
+        with self._lock:
+            self._positions[user_id] = snapshot['position'] if snapshot else length
+            self.snapshots += snapshot is not None
+        return snapshot is not None
+
+    def forget(self, user_id: str):
+        with self._lock:
+            self._positions.pop(user_id, None)
@@ -0,0 +1,438 @@
+"""
+Persistent key/value storage for WaterBuddy
+Values are pickled so session data (datetimes, dicts, lists) round-trips unchanged.
+Every backend offers the same key/value and append-only log operations and is
+safe to share between worker processes: files (with OS file locks), SQLite,
+or any Redis-protocol server
+"""
+
+import contextlib
+import os
+import pickle
+import re
+import sqlite3
+import tempfile
+import threading
+from typing import Any, Callable, List, Sequence
+from urllib.parse import urlparse
+
+from waterbuddy.resp import RespClient
+
+try:
+    import fcntl
+except ImportError:  # Windows: file locks only cover this process
+    fcntl = None
+
+_UNSAFE_CHARS = re.compile(r'[^A-Za-z0-9_.-]')
+
+
+class LogTrimmedError(LookupError):
+    """The requested log positions were compacted away by log_trim"""
+
+
+class _LogStart(int):
+    """Leading frame of a trimmed log file: the position of its first entry"""
+
+
+def _safe_name(name: str) -> str:
+    """Make a namespace or key usable as a file name"""
+    return _UNSAFE_CHARS.sub('_', str(name)) or '_'
+
+
+class FileStore:
+    """Store each value as a pickle file under <root>/<namespace>/<key>.pkl
+
+    Logs are files of consecutive pickle frames under <key>.log; a trimmed
+    log starts with a frame holding the position of its first entry.
+    Updates, appends and trims take an OS lock per namespace, so several
+    processes can share a root directory.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self._update_lock = threading.RLock()
+        self._held = threading.local()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, namespace: str, key: str, suffix: str = '.pkl') -> str:
+        return os.path.join(self.root, _safe_name(namespace), _safe_name(key) + suffix)
+
+    @contextlib.contextmanager
+    def _namespace_lock(self, namespace: str):
+        """Thread lock plus an exclusive OS lock on the namespace (re-entrant)"""
+        held = self._held.__dict__.setdefault('paths', set())
+        path = os.path.join(self.root, _safe_name(namespace), '.lock')
+        with self._update_lock:
+            if fcntl is None or path in held:
+                yield
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'a+b') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                held.add(path)
+                try:
+                    yield
+                finally:
+                    held.discard(path)
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def put(self, namespace: str, key: str, value: Any):
+        """Write a value atomically (readers never see a half-written file)"""
+        path = self._path(namespace, key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Read a value, returning default if it does not exist"""
+        try:
+            with open(self._path(namespace, key), 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return default
+
+    def update(self, namespace: str, key: str, func: Callable[[Any], Any]) -> Any:
+        """Read-modify-write a value; func receives None when the key is missing
+
+        Returning None from func deletes the key.
+        """
+        with self._namespace_lock(namespace):
+            value = func(self.get(namespace, key))
+            if value is None:
+                self.delete(namespace, key)
+            else:
+                self.put(namespace, key, value)
+            return value
+
+    def delete(self, namespace: str, key: str):
+        """Remove a value if present"""
+        try:
+            with self._lock:
+                os.remove(self._path(namespace, key))
+        except FileNotFoundError:
+            pass
+
+    def keys(self, namespace: str) -> List[str]:
+        """List the keys stored in a namespace"""
+        directory = os.path.join(self.root, _safe_name(namespace))
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith('.pkl'))
+
+    def log_append(self, namespace: str, key: str, entries: Sequence[Any]) -> int:
+        """Append entries to a log, returning its new length"""
+        path = self._path(namespace, key, '.log')
+        with self._namespace_lock(namespace):
+            with open(path, 'ab') as f:
+                for entry in entries:
+                    pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            return self.log_length(namespace, key)
+
+    def _read_log(self, namespace: str, key: str):
+        """Position of the first retained entry, and the retained entries"""
+        first, entries = 0, []
+        try:
+            with open(self._path(namespace, key, '.log'), 'rb') as f:
+                while True:
+                    try:
+                        entries.append(pickle.load(f))
+                    except EOFError:
+                        break
+        except FileNotFoundError:
+            pass
+        if entries and isinstance(entries[0], _LogStart):
+            first = int(entries.pop(0))
+        return first, entries
+
+    def log_read(self, namespace: str, key: str, start: int = 0) -> List[Any]:
+        """Log entries from position start onwards
+
+        Positions never shift: after log_trim(n), reading from n or later
+        works as before and reading from before n raises LogTrimmedError.
+        """
+        first, entries = self._read_log(namespace, key)
+        if start < first:
+            raise LogTrimmedError(f'{namespace}/{key} starts at {first}, not {start}')
+        return entries[start - first:]
+
+    def log_length(self, namespace: str, key: str) -> int:
+        """Position after the last entry (trimmed entries included)"""
+        first, entries = self._read_log(namespace, key)
+        return first + len(entries)
+
+    def log_trim(self, namespace: str, key: str, end: int):
+        """Drop the entries before position end, e.g. once a snapshot covers them"""
+        path = self._path(namespace, key, '.log')
+        with self._namespace_lock(namespace):
+            first, entries = self._read_log(namespace, key)
+            if end <= first:
+                return
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(_LogStart(end), f, protocol=pickle.HIGHEST_PROTOCOL)
+                    for entry in entries[end - first:]:
+                        pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    def log_delete(self, namespace: str, key: str):
+        try:
+            with self._lock:
+                os.remove(self._path(namespace, key, '.log'))
+        except FileNotFoundError:
+            pass
+
+
+class SQLiteStore:
+    """Store values as pickled blobs in one SQLite database file
+
+    Each thread gets its own connection; updates run in an IMMEDIATE
+    transaction, which SQLite serializes across processes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._transaction() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS kv (ns TEXT, key TEXT, value BLOB, PRIMARY KEY (ns, key))')
+            conn.execute('CREATE TABLE IF NOT EXISTS logs (ns TEXT, key TEXT, seq INTEGER, value BLOB, '
+                         'PRIMARY KEY (ns, key, seq))')
+            conn.execute('CREATE TABLE IF NOT EXISTS log_starts (ns TEXT, key TEXT, start INTEGER, '
+                         'PRIMARY KEY (ns, key))')
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def put(self, namespace: str, key: str, value: Any):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._conn().execute('INSERT OR REPLACE INTO kv VALUES (?, ?, ?)', (namespace, key, blob))
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        row = self._conn().execute('SELECT value FROM kv WHERE ns = ? AND key = ?', (namespace, key)).fetchone()
+        return pickle.loads(row[0]) if row else default
+
+    def update(self, namespace: str, key: str, func: Callable[[Any], Any]) -> Any:
+        """Read-modify-write a value; func receives None when the key is missing
+
+        Returning None from func deletes the key.
+        """
+        with self._transaction() as conn:
+            row = conn.execute('SELECT value FROM kv WHERE ns = ? AND key = ?', (namespace, key)).fetchone()
+            value = func(pickle.loads(row[0]) if row else None)
+            if value is None:
+                conn.execute('DELETE FROM kv WHERE ns = ? AND key = ?', (namespace, key))
+            else:
+                blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                conn.execute('INSERT OR REPLACE INTO kv VALUES (?, ?, ?)', (namespace, key, blob))
+            return value
+
+    def delete(self, namespace: str, key: str):
+        self._conn().execute('DELETE FROM kv WHERE ns = ? AND key = ?', (namespace, key))
+
+    def keys(self, namespace: str) -> List[str]:
+        rows = self._conn().execute('SELECT key FROM kv WHERE ns = ? ORDER BY key', (namespace,))
+        return [row[0] for row in rows]
+
+    def log_append(self, namespace: str, key: str, entries: Sequence[Any]) -> int:
+        """Append entries to a log, returning its new length"""
+        with self._transaction() as conn:
+            start = self._log_end(conn, namespace, key)
+            conn.executemany('INSERT INTO logs VALUES (?, ?, ?, ?)', [
+                (namespace, key, start + i, pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+                for i, entry in enumerate(entries)
+            ])
+            return start + len(entries)
+
+    def log_read(self, namespace: str, key: str, start: int = 0) -> List[Any]:
+        with self._transaction() as conn:
+            first = self._log_start(conn, namespace, key)
+            if start < first:
+                raise LogTrimmedError(f'{namespace}/{key} starts at {first}, not {start}')
+            rows = conn.execute(
+                'SELECT value FROM logs WHERE ns = ? AND key = ? AND seq >= ? ORDER BY seq', (namespace, key, start)
+            ).fetchall()
+        return [pickle.loads(row[0]) for row in rows]
+
+    def log_length(self, namespace: str, key: str) -> int:
+        return self._log_end(self._conn(), namespace, key)
+
+    def log_trim(self, namespace: str, key: str, end: int):
+        with self._transaction() as conn:
+            if end <= self._log_start(conn, namespace, key):
+                return
+            conn.execute('DELETE FROM logs WHERE ns = ? AND key = ? AND seq < ?', (namespace, key, end))
+            conn.execute('INSERT OR REPLACE INTO log_starts VALUES (?, ?, ?)', (namespace, key, end))
+
+    @staticmethod
+    def _log_start(conn, namespace: str, key: str) -> int:
+        row = conn.execute('SELECT start FROM log_starts WHERE ns = ? AND key = ?', (namespace, key)).fetchone()
+        return row[0] if row else 0
+
+    @classmethod
+    def _log_end(cls, conn, namespace: str, key: str) -> int:
+        row = conn.execute('SELECT MAX(seq) FROM logs WHERE ns = ? AND key = ?', (namespace, key)).fetchone()
+        return cls._log_start(conn, namespace, key) if row[0] is None else row[0] + 1
+
+    def log_delete(self, namespace: str, key: str):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM logs WHERE ns = ? AND key = ?', (namespace, key))
+            conn.execute('DELETE FROM log_starts WHERE ns = ? AND key = ?', (namespace, key))
+
+
+class RedisStore:
+    """Store values in any Redis-protocol server
+
+    Values live under <prefix>:<namespace>:<key> with a set per namespace
+    for `keys`; logs are Redis lists plus a counter of trimmed entries.
+    Updates use WATCH/MULTI/EXEC and are retried when another client
+    changed the key in between.
+    """
+
+    def __init__(self, url: str, prefix: str = 'waterbuddy'):
+        self.url = url
+        self.prefix = prefix
+        self._local = threading.local()
+
+    def _client(self) -> RespClient:
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = RespClient.from_url(self.url)
+            self._local.client = client
+        return client
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f'{self.prefix}:{namespace}:{key}'
+
+    def _index(self, namespace: str) -> str:
+        return f'{self.prefix}:keys:{namespace}'
+
+    def _log(self, namespace: str, key: str) -> str:
+        return f'{self.prefix}:log:{namespace}:{key}'
+
+    def _log_start(self, namespace: str, key: str) -> str:
+        return f'{self.prefix}:logstart:{namespace}:{key}'
+
+    def _write_commands(self, namespace: str, key: str, value: Any) -> List[tuple]:
+        if value is None:
+            return [('DEL', self._key(namespace, key)), ('SREM', self._index(namespace), key)]
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        return [('SET', self._key(namespace, key), blob), ('SADD', self._index(namespace), key)]
+
+    def _transaction(self, commands: List[tuple]) -> Any:
+        replies = self._client().pipeline([('MULTI',)] + commands + [('EXEC',)])
+        return replies[-1]
+
+    def put(self, namespace: str, key: str, value: Any):
+        self._transaction(self._write_commands(namespace, key, value))
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        blob = self._client().execute('GET', self._key(namespace, key))
+        return default if blob is None else pickle.loads(blob)
+
+    def update(self, namespace: str, key: str, func: Callable[[Any], Any]) -> Any:
+        """Read-modify-write a value; func receives None when the key is missing
+
+        Returning None from func deletes the key.
+        """
+        client = self._client()
+        while True:
+            client.execute('WATCH', self._key(namespace, key))
+            try:
+                value = func(self.get(namespace, key))
+            except BaseException:
+                client.execute('UNWATCH')
+                raise
+            if self._transaction(self._write_commands(namespace, key, value)) is not None:
+                return value
+
+    def delete(self, namespace: str, key: str):
+        self._transaction(self._write_commands(namespace, key, None))
+
+    def keys(self, namespace: str) -> List[str]:
+        return sorted(member.decode('utf-8') for member in self._client().execute('SMEMBERS', self._index(namespace)))
+
+    def log_append(self, namespace: str, key: str, entries: Sequence[Any]) -> int:
+        """Append entries to a log, returning its new length"""
+        if not entries:
+            return self.log_length(namespace, key)
+        blobs = [pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL) for entry in entries]
+        first, length = self._transaction([
+            ('GET', self._log_start(namespace, key)), ('RPUSH', self._log(namespace, key), *blobs)
+        ])
+        return int(first or 0) + length
+
+    def log_read(self, namespace: str, key: str, start: int = 0) -> List[Any]:
+        first, blobs = self._transaction([
+            ('GET', self._log_start(namespace, key)), ('LRANGE', self._log(namespace, key), 0, -1)
+        ])
+        first = int(first or 0)
+        if start < first:
+            raise LogTrimmedError(f'{namespace}/{key} starts at {first}, not {start}')
+        return [pickle.loads(blob) for blob in blobs[start - first:]]
+
+    def log_length(self, namespace: str, key: str) -> int:
+        first, length = self._transaction([
+            ('GET', self._log_start(namespace, key)), ('LLEN', self._log(namespace, key))
+        ])
+        return int(first or 0) + length
+
+    def log_trim(self, namespace: str, key: str, end: int):
+        client = self._client()
+        while True:
+            client.execute('WATCH', self._log_start(namespace, key))
+            first = int(client.execute('GET', self._log_start(namespace, key)) or 0)
+            if end <= first:
+                client.execute('UNWATCH')
+                return
+            if self._transaction([
+                ('LTRIM', self._log(namespace, key), end - first, -1),
+                ('SET', self._log_start(namespace, key), end),
+            ]) is not None:
+                return
+
+    def log_delete(self, namespace: str, key: str):
+        self._client().execute('DEL', self._log(namespace, key), self._log_start(namespace, key))
+
+
+def open_store(url: str):
+    """Store for a URL: redis://host:port/db, sqlite:///relative.db, sqlite:////absolute.db or a directory"""
+    scheme = urlparse(url).scheme
+    if scheme == 'redis':
+        return RedisStore(url)
+    if scheme == 'sqlite':
+        return SQLiteStore(url[len('sqlite:///'):])
+    if scheme == 'file':
+        return FileStore(url[len('file://'):])
+    return FileStore(url)
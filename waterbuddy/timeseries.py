@@ -0,0 +1,201 @@
+"""
+Multi-resolution intake time series for WaterBuddy
+Daily totals plus week and month aggregates (sum/mean/min/max of the daily
+totals) are kept up to date on every log, so long-range charts can send a few
+hundred pre-aggregated points instead of raw history
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from waterbuddy.timezones import local_days
+
+LEVEL_DAYS = {'day': 1, 'week': 7, 'month': 30.44}
+MAX_POINTS = 300
+
+
+def _week_of(days: np.ndarray) -> np.ndarray:
+    # Weeks start on Monday; 1970-01-01 was a Thursday
+    return (days + 3) // 7
+
+
+def _week_start(buckets: np.ndarray) -> np.ndarray:
+    return buckets * 7 - 3
+
+
+def _month_of(days: np.ndarray) -> np.ndarray:
+    return np.asarray(days, dtype='datetime64[D]').astype('datetime64[M]').astype(np.int64)
+
+
+def _month_start(buckets: np.ndarray) -> np.ndarray:
+    return np.asarray(buckets, dtype='datetime64[M]').astype('datetime64[D]').astype(np.int64)
+
+
+BUCKETS = {
+    'week': (_week_of, _week_start),
+    'month': (_month_of, _month_start),
+}
+
+
+class _Level:
+    """Aggregates of daily totals for one bucket size"""
+
+    def __init__(self):
+        self.first_bucket = 0
+        self.sum = np.zeros(0, dtype=np.int64)
+        self.min = np.zeros(0, dtype=np.int64)
+        self.max = np.zeros(0, dtype=np.int64)
+        self.count = np.zeros(0, dtype=np.int64)
+
+    def resize(self, first_bucket: int, size: int):
+        offset = self.first_bucket - first_bucket
+        for name in ('sum', 'min', 'max', 'count'):
+            old = getattr(self, name)
+            new = np.zeros(size, dtype=np.int64)
+            if len(old):
+                new[offset:offset + len(old)] = old
+            setattr(self, name, new)
+        self.first_bucket = first_bucket
+
+
+class IntakePyramid:
+    """Day, week and month levels over one user's intake
+
+    Daily totals are stored densely from the first logged day. A new event
+    only re-aggregates the week and month containing it (at most 31 days),
+    or the buckets spanning a gap when the range is extended.
+    """
+
+    def __init__(self):
+        self.first_day: Optional[int] = None
+        self.days = np.zeros(0, dtype=np.int64)
+        self.levels = {name: _Level() for name in BUCKETS}
+        self.version = 0
+
+    @classmethod
+    def from_log(cls, log, zone_name: str) -> 'IntakePyramid':
+        """Build all levels from an intake log in one vectorized pass"""
+        return cls.from_days(local_days(log.timestamps, zone_name), log.amounts)
+
+    @classmethod
+    def from_days(cls, days, amounts) -> 'IntakePyramid':
+        """Build all levels from (local day, ml) pairs, e.g. events plus rolled-up totals"""
+        pyramid = cls()
+        days = np.asarray(days, dtype=np.int64)
+        if len(days):
+            first = int(days.min())
+            pyramid.first_day = first
+            pyramid.days = np.bincount(days - first, weights=amounts).astype(np.int64)
+            pyramid._rebuild()
+            pyramid.version = 1
+        return pyramid
+
+    @property
+    def last_day(self) -> Optional[int]:
+        return None if self.first_day is None else self.first_day + len(self.days) - 1
+
+    def add(self, day: int, amount: int):
+        """Record an intake on a local day number"""
+        day = int(day)
+        if self.first_day is None:
+            self.first_day = day
+            self.days = np.zeros(1, dtype=np.int64)
+        if day < self.first_day:
+            # Only possible after a timezone change; rare enough to rebuild
+            self.days = np.concatenate([np.zeros(self.first_day - day, dtype=np.int64), self.days])
+            self.first_day = day
+            self.days[0] += amount
+            self._rebuild()
+        else:
+            old_last = self.last_day
+            if day > old_last:
+                self.days = np.concatenate([self.days, np.zeros(day - old_last, dtype=np.int64)])
+            self.days[day - self.first_day] += amount
+            self._refresh(min(old_last, day), day)
+        self.version += 1
+
+    def _rebuild(self):
+        all_days = np.arange(self.first_day, self.first_day + len(self.days))
+        for name, (bucket_of, _) in BUCKETS.items():
+            buckets = bucket_of(all_days)
+            level = self.levels[name]
+            level.resize(int(buckets[0]), int(buckets[-1] - buckets[0] + 1))
+            starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+            level.sum[:] = np.add.reduceat(self.days, starts)
+            level.min[:] = np.minimum.reduceat(self.days, starts)
+            level.max[:] = np.maximum.reduceat(self.days, starts)
+            level.count[:] = np.diff(np.r_[starts, len(self.days)])
+
+    def _refresh(self, lo_day: int, hi_day: int):
+        """Re-aggregate the buckets covering local days lo_day..hi_day"""
+        for name, (bucket_of, bucket_start) in BUCKETS.items():
+            level = self.levels[name]
+            first_b, last_b = bucket_of(np.array([self.first_day, hi_day]))
+            if not len(level.sum) or level.first_bucket != first_b or len(level.sum) < last_b - first_b + 1:
+                level.resize(int(first_b), int(last_b - first_b + 1))
+            lo_b, hi_b = bucket_of(np.array([lo_day, hi_day]))
+            for bucket in range(int(lo_b), int(hi_b) + 1):
+                start, end = bucket_start(np.array([bucket, bucket + 1]))
+                lo = max(start, self.first_day) - self.first_day
+                hi = min(end, self.first_day + len(self.days)) - self.first_day
+                values = self.days[lo:hi]
+                i = bucket - level.first_bucket
+                level.sum[i] = values.sum()
+                level.min[i] = values.min()
+                level.max[i] = values.max()
+                level.count[i] = len(values)
+
+    def daily_totals(self, start_day: int, end_day: int) -> np.ndarray:
+        """ml per local day for start_day..end_day, zero on days with nothing logged"""
+        totals = np.zeros(end_day - start_day + 1, dtype=np.int64)
+        if self.first_day is not None:
+            lo = max(start_day, self.first_day)
+            hi = min(end_day, self.last_day)
+            if lo <= hi:
+                totals[lo - start_day:hi - start_day + 1] = self.days[lo - self.first_day:hi - self.first_day + 1]
+        return totals
+
+    def pick_level(self, start_day: int, end_day: int, max_points: int = MAX_POINTS) -> str:
+        """Finest level that shows start_day..end_day in at most max_points points"""
+        span = end_day - start_day + 1
+        for name in ('day', 'week', 'month'):
+            if span / LEVEL_DAYS[name] <= max_points:
+                return name
+        return 'month'
+
+    def series(self, start_day: int, end_day: int, max_points: int = MAX_POINTS) -> Dict[str, np.ndarray]:
+        """Aggregates for local days start_day..end_day at the best-fitting level
+
+        Returns the level name plus per-point `start` (day number), `sum`,
+        `mean`, `min` and `max` of daily totals.
+        """
+        level_name = self.pick_level(start_day, end_day, max_points)
+        empty = np.zeros(0, dtype=np.int64)
+        result = {'level': level_name, 'start': empty, 'sum': empty, 'mean': empty.astype(float),
+                  'min': empty, 'max': empty}
+        if self.first_day is None:
+            return result
+        lo = max(start_day, self.first_day)
+        hi = min(end_day, self.last_day)
+        if lo > hi:
+            return result
+
+        if level_name == 'day':
+            values = self.days[lo - self.first_day:hi - self.first_day + 1]
+            result.update(start=np.arange(lo, hi + 1), sum=values, mean=values.astype(float),
+                          min=values, max=values)
+            return result
+
+        bucket_of, bucket_start = BUCKETS[level_name]
+        level = self.levels[level_name]
+        lo_b, hi_b = bucket_of(np.array([lo, hi])) - level.first_bucket
+        window = slice(int(lo_b), int(hi_b) + 1)
+        result.update(
+            start=bucket_start(np.arange(lo_b, hi_b + 1) + level.first_bucket),
+            sum=level.sum[window],
+            mean=level.sum[window] / np.maximum(level.count[window], 1),
+            min=level.min[window],
+            max=level.max[window],
+        )
+        return result
@@ -0,0 +1,133 @@
+"""
+Timezone-aware day/hour bucketing for WaterBuddy
+Each zone's UTC-offset history is precomputed once into a transition table,
+so mapping event timestamps to local days and hours is a NumPy searchsorted
+instead of a zoneinfo lookup per event
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+SECONDS_PER_HOUR = 3600
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Range covered by the transition tables; offsets outside it are clamped
+TABLE_START = int(datetime(1970, 1, 1, tzinfo=timezone.utc).timestamp())
+TABLE_END = int(datetime(2100, 1, 1, tzinfo=timezone.utc).timestamp())
+SAMPLE_STEP = SECONDS_PER_DAY
+
+
+def get_zone(name: str):
+    """Resolve a timezone name, falling back to UTC for unknown names"""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        return timezone.utc
+
+
+class OffsetTable:
+    """UTC offsets of one zone as sorted transition instants
+
+    `transitions[i]` is the first UTC second at which `offsets[i]` applies.
+    """
+
+    __slots__ = ('zone_name', 'transitions', 'offsets')
+
+    def __init__(self, zone_name: str, transitions: np.ndarray, offsets: np.ndarray):
+        self.zone_name = zone_name
+        self.transitions = transitions
+        self.offsets = offsets
+
+    def offsets_at(self, timestamps) -> np.ndarray:
+        """UTC offset in seconds at each timestamp"""
+        ts = np.asarray(timestamps, dtype=np.int64)
+        idx = np.searchsorted(self.transitions, ts, side='right') - 1
+        return self.offsets[np.maximum(idx, 0)]
+
+    def to_local(self, timestamps) -> np.ndarray:
+        """Local wall-clock seconds since the epoch for each UTC timestamp"""
+        ts = np.asarray(timestamps, dtype=np.int64)
+        return ts + self.offsets_at(ts)
+
+
+def _offset(zone, ts: int) -> int:
+    return int(datetime.fromtimestamp(ts, zone).utcoffset().total_seconds())
+
+
+@lru_cache(maxsize=None)
+def offset_table(zone_name: str) -> OffsetTable:
+    """Build (once per process) the transition table for a zone"""
+    zone = get_zone(zone_name)
+    current = _offset(zone, TABLE_START)
+    transitions = [np.iinfo(np.int64).min]
+    offsets = [current]
+    for ts in range(TABLE_START + SAMPLE_STEP, TABLE_END, SAMPLE_STEP):
+        offset = _offset(zone, ts)
+        if offset == current:
+            continue
+        # Binary search the exact second the offset changed
+        lo, hi = ts - SAMPLE_STEP, ts
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if _offset(zone, mid) == current:
+                lo = mid
+            else:
+                hi = mid
+        transitions.append(hi)
+        offsets.append(offset)
+        current = offset
+    return OffsetTable(zone_name, np.array(transitions, dtype=np.int64), np.array(offsets, dtype=np.int64))
+
+
+def local_seconds(timestamps, zone_name: str) -> np.ndarray:
+    """Local wall-clock seconds since the epoch"""
+    return offset_table(zone_name).to_local(timestamps)
+
+
+def bucket_events(timestamps, zone_name: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Local day number (days since 1970-01-01) and hour of day for each event"""
+    local = local_seconds(timestamps, zone_name)
+    return local // SECONDS_PER_DAY, (local % SECONDS_PER_DAY) // SECONDS_PER_HOUR
+
+
+def local_days(timestamps, zone_name: str) -> np.ndarray:
+    """Local day number for each event"""
+    return local_seconds(timestamps, zone_name) // SECONDS_PER_DAY
+
+
+def local_seconds_multi(timestamps, zone_names: Sequence[str]) -> np.ndarray:
+    """Local seconds when every row has its own zone (one table lookup per distinct zone)"""
+    ts = np.asarray(timestamps, dtype=np.int64)
+    zones, inverse = np.unique(np.asarray(zone_names, dtype=str), return_inverse=True)
+    offsets = np.empty(len(ts), dtype=np.int64)
+    for i, zone_name in enumerate(zones):
+        rows = inverse == i
+        offsets[rows] = offset_table(str(zone_name)).offsets_at(ts[rows])
+    return ts + offsets
+
+
+def day_to_date(day: int) -> date:
+    """Convert a day number to a date"""
+    return date.fromordinal(int(day) + EPOCH_ORDINAL)
+
+
+def date_to_day(value: date) -> int:
+    """Convert a date to a day number"""
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def local_datetime(timestamp: float, zone_name: str) -> datetime:
+    """Naive local wall-clock datetime for one UTC timestamp"""
+    local = int(local_seconds([int(timestamp)], zone_name)[0])
+    return datetime(1970, 1, 1) + timedelta(seconds=local, microseconds=int((timestamp % 1) * 1e6))
+
+
+def local_today(zone_name: str, now: datetime = None) -> date:
+    """Current calendar date in a timezone"""
+    now = now or datetime.now(timezone.utc)
+    return day_to_date(local_days([int(now.timestamp())], zone_name)[0])